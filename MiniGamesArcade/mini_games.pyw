@@ -1,8 +1,23 @@
 import pygame
+import os
 import sys
+import time
+import argparse
 import random
 import math
 import colorsys
+from collections import OrderedDict
+
+# starfield.py, particles.py and profiler.py live in ../shared, next to this folder; Neon Snake uses them too
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "shared"))
+from particles import PARTICLE_CAPACITY, ParticleEngine, SpriteCache, blit_sprites  # noqa: E402
+from profiler import FrameProfiler  # noqa: E402
+from starfield import Starfield  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # particle emitters fall back to plain lists
+    np = None
 
 # ─── Constants ───────────────────────────────────────────────────────────────
 WIDTH, HEIGHT = 900, 700
@@ -78,92 +93,516 @@ def set_theme(name):
     global theme, theme_name
     theme_name = name
     theme.update(THEMES[name])
+    MENU_SPRITES.clear()
 
 
 # ─── Particle System ────────────────────────────────────────────────────────
-class Particle:
-    def __init__(self, x, y, color, vx=None, vy=None, life=None, size=None, gravity=0, fade=True, glow=False):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vx = vx if vx is not None else random.uniform(-3, 3)
-        self.vy = vy if vy is not None else random.uniform(-5, -1)
-        self.life = life if life is not None else random.randint(20, 50)
-        self.max_life = self.life
-        self.size = size if size is not None else random.randint(2, 5)
-        self.gravity = gravity
-        self.fade = fade
-        self.glow = glow
+def _uniform(lo, hi, k):
+    if np is not None:
+        return np.random.uniform(lo, hi, k)
+    return [random.uniform(lo, hi) for _ in range(k)]
 
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += self.gravity
-        self.life -= 1
 
-    def draw(self, surface):
-        if self.life <= 0:
-            return
-        alpha = self.life / self.max_life if self.fade else 1
-        r = min(255, int(self.color[0] * alpha))
-        g = min(255, int(self.color[1] * alpha))
-        b = min(255, int(self.color[2] * alpha))
-        sz = max(1, int(self.size * alpha))
-        if self.glow and sz > 2:
-            glow_surf = pygame.Surface((sz * 4, sz * 4), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (r, g, b, int(60 * alpha)), (sz * 2, sz * 2), sz * 2)
-            surface.blit(glow_surf, (int(self.x - sz * 2), int(self.y - sz * 2)))
-        pygame.draw.circle(surface, (r, g, b), (int(self.x), int(self.y)), sz)
+def _randint(lo, hi, k):
+    """k random ints in [lo, hi] (inclusive, like random.randint)."""
+    if np is not None:
+        return np.random.randint(lo, hi + 1, k)
+    return [random.randint(lo, hi) for _ in range(k)]
 
-    @property
-    def alive(self):
-        return self.life > 0
 
+def _polar(angles, speeds):
+    if np is not None:
+        return np.cos(angles) * speeds, np.sin(angles) * speeds
+    return ([math.cos(a) * s for a, s in zip(angles, speeds)],
+            [math.sin(a) * s for a, s in zip(angles, speeds)])
 
-class ParticleSystem:
-    def __init__(self):
-        self.particles = []
 
-    def emit(self, x, y, color, count=10, **kwargs):
-        for _ in range(count):
-            self.particles.append(Particle(x, y, color, **kwargs))
+class ParticleSystem(ParticleEngine):
+    """Fading, optionally glowing particle bursts on the shared engine.
+
+    The pool itself (columns, update step, swap-remove) lives in
+    ../shared/particles.py; this adds per-particle fade and glow flags,
+    the emitters and the sprite atlas lookup. Life is counted in ticks.
+    """
+    EXTRA = ("fade", "glow")
+
+    def emit(self, x, y, color, count=10, vx=None, vy=None, life=None, size=None, gravity=0, fade=True, glow=False):
+        life = life if life is not None else _randint(20, 50, count)
+        self.add(count, x=x, y=y,
+                 vx=vx if vx is not None else _uniform(-3, 3, count),
+                 vy=vy if vy is not None else _uniform(-5, -1, count),
+                 life=life,
+                 size=size if size is not None else _randint(2, 5, count),
+                 gravity=gravity, r=color[0], g=color[1], b=color[2],
+                 fade=1.0 if fade else 0.0, glow=1.0 if glow else 0.0)
 
     def explosion(self, x, y, color, count=30):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 6)
-            self.particles.append(Particle(
-                x, y, color,
-                vx=math.cos(angle) * speed,
-                vy=math.sin(angle) * speed,
-                life=random.randint(15, 40),
-                size=random.randint(2, 5),
-                gravity=0.05,
-                glow=True
-            ))
+        vx, vy = _polar(_uniform(0, 2 * math.pi, count), _uniform(1, 6, count))
+        self.emit(x, y, color, count, vx=vx, vy=vy, life=_randint(15, 40, count),
+                  size=_randint(2, 5, count), gravity=0.05, glow=True)
 
     def sparkle(self, x, y, color, count=5):
-        for _ in range(count):
-            self.particles.append(Particle(
-                x + random.randint(-20, 20), y + random.randint(-20, 20),
-                color, vx=random.uniform(-0.5, 0.5), vy=random.uniform(-1, 0),
-                life=random.randint(10, 25), size=random.randint(1, 3), glow=True
-            ))
+        if np is not None:
+            xs = x + _randint(-20, 20, count)
+            ys = y + _randint(-20, 20, count)
+        else:
+            xs = [x + o for o in _randint(-20, 20, count)]
+            ys = [y + o for o in _randint(-20, 20, count)]
+        self.emit(xs, ys, color, count, vx=_uniform(-0.5, 0.5, count), vy=_uniform(-1, 0, count),
+                  life=_randint(10, 25, count), size=_randint(1, 3, count), glow=True)
 
     def update(self):
-        for p in self.particles:
-            p.update()
-        self.particles = [p for p in self.particles if p.alive]
+        t0 = time.perf_counter()
+        self.step()
+        PROFILER.add("particles", time.perf_counter() - t0)
+
+    def _sprite_codes(self, ahead=0.0):
+        """Atlas code and integer position for every live particle, ahead ticks forward."""
+        n = self.n
+        if np is not None:
+            alpha = np.where(self.fade[:n] > 0, self.life[:n] / self.max_life[:n], 1.0)
+            sz = np.clip((self.size[:n] * alpha).astype(np.int64), 1, 15)
+            q = np.clip(np.rint(alpha * ALPHA_LEVELS), 1, ALPHA_LEVELS).astype(np.int64)
+            glow = ((self.glow[:n] > 0) & (sz > 2)).astype(np.int64)
+            rgb = (self.r[:n].astype(np.int64) << 16) | (self.g[:n].astype(np.int64) << 8) | self.b[:n].astype(np.int64)
+            code = (((rgb << 4 | sz) << 5 | q) << 1) | glow
+            if ahead:
+                return code, (self.x[:n] + self.vx[:n] * ahead).astype(int), (self.y[:n] + self.vy[:n] * ahead).astype(int)
+            return code, self.x[:n].astype(int), self.y[:n].astype(int)
+        codes, xs, ys = [], [], []
+        for i in range(n):
+            alpha = self.life[i] / self.max_life[i] if self.fade[i] else 1
+            sz = max(1, min(15, int(self.size[i] * alpha)))
+            q = max(1, min(ALPHA_LEVELS, round(alpha * ALPHA_LEVELS)))
+            rgb = (int(self.r[i]), int(self.g[i]), int(self.b[i]))
+            codes.append(particle_code(rgb, sz, q, bool(self.glow[i]) and sz > 2))
+            xs.append(int(self.x[i] + self.vx[i] * ahead))
+            ys.append(int(self.y[i] + self.vy[i] * ahead))
+        return codes, xs, ys
+
+    def draw(self, surface, alpha=0.0, rects=False):
+        """Blit every particle from the sprite atlas in a single blits() call.
+
+        alpha (0..1, see GameLoop.alpha) extrapolates positions along the
+        velocity so motion stays smooth when frames and ticks don't line up.
+        With rects=True the touched rectangles are returned, for dirty-rect
+        redraws.
+        """
+        if not self.n:
+            return []
+        t0 = time.perf_counter()
+        PROFILER.particles += self.n
+        codes, xs, ys = self._sprite_codes(alpha)
+        touched = blit_sprites(surface, codes, xs, ys, SPRITES.get, _build_particle_sprite, rects)
+        PROFILER.add("particles", time.perf_counter() - t0)
+        return touched
+
+
+# ─── Sprite Atlas ────────────────────────────────────────────────────────────
+ALPHA_LEVELS = 16  # particle fade is quantized to this many brightness steps
+
+SPRITES = SpriteCache()
+MENU_SPRITES = SpriteCache(1500)  # menu tiles, pills and title glyphs; cleared by set_theme
+
+
+def particle_code(rgb, size, level, glow):
+    """Pack a particle sprite key into one int: rgb | size (4 bits) | level (5 bits) | glow."""
+    return ((((rgb[0] << 16 | rgb[1] << 8 | rgb[2]) << 4 | size) << 5 | level) << 1) | int(glow)
+
+
+def _build_particle_sprite(code):
+    """Render a particle (and its glow halo) faded to its quantized level."""
+    glow = code & 1
+    alpha = (code >> 1 & 31) / ALPHA_LEVELS
+    sz = code >> 6 & 15
+    c = tuple(min(255, int((code >> shift & 255) * alpha)) for shift in (26, 18, 10))
+    if not glow:
+        spr = pygame.Surface((sz * 2 + 1, sz * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(spr, c, (sz, sz), sz)
+        return spr, sz, sz
+    spr = pygame.Surface((sz * 4, sz * 4), pygame.SRCALPHA)
+    pygame.draw.circle(spr, (*c, int(60 * alpha)), (sz * 2, sz * 2), sz * 2)
+    pygame.draw.circle(spr, c, (sz * 2, sz * 2), sz)
+    return spr, sz * 2, sz * 2
+
+
+# ─── Text Cache ──────────────────────────────────────────────────────────────
+class TextCache:
+    """Font registry plus an LRU cache of rendered text surfaces.
+
+    SysFont does a system font lookup on every call, so fonts are created once
+    per (name, size, bold). Rendered surfaces are shared between callers: blit
+    them, don't modify them (reset any set_alpha after use).
+    """
+    def __init__(self, max_surfaces=600):
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.max_surfaces = max_surfaces
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size, bold=True):
+        key = (name or "consolas", size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(key[0], size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, font_name=None, bold=True):
+        key = (text, size, tuple(color), font_name, bold)
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = self.font(font_name, size, bold).render(text, True, color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "surfaces": len(self.surfaces),
+            "fonts": len(self.fonts),
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = self.misses = 0
+
+
+TEXT_CACHE = TextCache()
+
+
+# ─── Spatial Hash ────────────────────────────────────────────────────────────
+class SpatialHash:
+    """Uniform grid for broad-phase collision queries.
+
+    Items are normally indices into the caller's entity list: each one is
+    filed under every cell its bounding box touches, and queries return the
+    candidates in ascending order so "first hit in list order" still holds.
+    Callers do the exact circle/rect test and mark dead entries, then sweep
+    the list once per frame instead of calling list.remove.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, item, x0, y0, x1, y1):
+        c = self.cell_size
+        cells = self.cells
+        for cx in range(int(x0 // c), int(x1 // c) + 1):
+            for cy in range(int(y0 // c), int(y1 // c) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [item]
+                else:
+                    bucket.append(item)
+
+    def insert_circle(self, item, x, y, r):
+        self.insert(item, x - r, y - r, x + r, y + r)
+
+    def insert_rect(self, item, rect):
+        self.insert(item, rect.left, rect.top, rect.right - 1, rect.bottom - 1)
+
+    def rebuild(self, boxes):
+        """Refill the grid from (x0, y0, x1, y1) boxes; item i is boxes[i]."""
+        self.cells.clear()
+        for i, box in enumerate(boxes):
+            self.insert(i, *box)
+
+    def query(self, x0, y0, x1, y1):
+        c = self.cell_size
+        cx0, cx1 = int(x0 // c), int(x1 // c)
+        cy0, cy1 = int(y0 // c), int(y1 // c)
+        cells = self.cells
+        if cx0 == cx1 and cy0 == cy1:
+            return cells.get((cx0, cy0), ())
+        found = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def query_circle(self, x, y, r=0):
+        return self.query(x - r, y - r, x + r, y + r)
+
+    def query_rect(self, rect):
+        return self.query(rect.left, rect.top, rect.right - 1, rect.bottom - 1)
+
+
+def _build_glow(key):
+    """Translucent halo behind a bullet: ("circle"|"rect", w, h, rgba)."""
+    shape, w, h, rgba = key
+    spr = pygame.Surface((w, h), pygame.SRCALPHA)
+    if shape == "circle":
+        pygame.draw.circle(spr, rgba, (w // 2, h // 2), w // 2)
+    else:
+        pygame.draw.rect(spr, rgba, (0, 0, w, h), border_radius=4)
+    return spr
+
+
+# ─── Game Loop ───────────────────────────────────────────────────────────────
+RENDER_FPS = FPS  # render cap; 0 = uncapped (the simulation still ticks at FPS)
+TIME_SCALE = 1.0  # simulated seconds per real second; 0 = tick as fast as possible
+MAX_TICKS = 5     # most ticks run before a frame is drawn
+FRAME_HOOK = None  # called as FRAME_HOOK(ticks, sim_seconds, render_seconds) after each frame
+
+
+class GameLoop:
+    """Fixed-timestep driver shared by every game.
+
+    Game state advances in ticks of 1 / FPS, so per-tick speeds, cooldowns
+    and particle lifetimes mean the same thing at any frame rate:
+
+        loop = GameLoop()
+        while True:
+            for _ in loop.ticks():
+                ...input and physics...
+            ...draw (loop.alpha = fraction of the next tick already elapsed)...
+            loop.present()
+
+    A slow frame is caught up by running several ticks before the next draw,
+    up to max_ticks, after which the game slows down rather than spiralling.
+    With TIME_SCALE 0 the clock is ignored and every frame runs max_ticks
+    ticks back to back, for soak tests and benchmarks.
+    """
+    resumed_at = 0.0  # set by run_scene(); a loop that last ticked before it restarts its clock
+
+    def __init__(self, tick_rate=FPS, max_ticks=None):
+        self.dt = 1.0 / tick_rate
+        self.max_ticks = max_ticks or MAX_TICKS
+        self.clock = pygame.time.Clock()
+        self.accum = 0.0
+        self.last = None
+        self.tick_count = 0
+        self.frame_count = 0
+        self.frame_ticks = 0
+        self.sim_start = self.sim_end = time.perf_counter()
 
-    def draw(self, surface):
-        for p in self.particles:
-            p.draw(surface)
+    @property
+    def alpha(self):
+        return min(1.0, self.accum / self.dt)
+
+    def ticks(self):
+        """Yield once per simulation tick due since the previous frame."""
+        now = time.perf_counter()
+        if TIME_SCALE <= 0:
+            n = self.max_ticks
+        elif self.last is None or now - self.last > 0.25 or self.last < GameLoop.resumed_at:
+            # First frame, or back from a blocking screen: don't catch up.
+            n = 1
+            self.accum = 0.0
+        else:
+            self.accum += (now - self.last) * TIME_SCALE
+            self.accum = min(self.accum, self.max_ticks * self.dt)
+            n = int(self.accum / self.dt + 1e-9)
+            self.accum = max(0.0, self.accum - n * self.dt)
+        self.last = self.sim_start = now
+        PROFILER.start()
+        for _ in range(n):
+            self.tick_count += 1
+            yield
+        self.frame_ticks = n
+        self.sim_end = time.perf_counter()
+        PROFILER.lap("update")
+
+    def present(self):
+        if PROFILER.visible:
+            PROFILER.draw(pygame.display.get_surface(), TEXT_CACHE.font(None, 14), (8, HEIGHT - 48), NEON_GREEN)
+        PROFILER.lap("draw")
+        pygame.display.flip()
+        PROFILER.lap("flip")
+        t1 = time.perf_counter()
+        self.frame_count += 1
+        if FRAME_HOOK is not None:
+            FRAME_HOOK(self.frame_ticks, self.sim_end - self.sim_start, t1 - self.sim_end)
+        PROFILER.frame(self.frame_ticks)
+        if RENDER_FPS and TIME_SCALE > 0:
+            self.clock.tick(RENDER_FPS)
+
+
+# ─── Profiler ────────────────────────────────────────────────────────────────
+PROFILER = FrameProfiler(FPS)  # ../shared/profiler.py; F3 toggles its overlay
+PROFILER.watch(TEXT_CACHE, SPRITES, MENU_SPRITES)  # text, sprite and panel builds
+
+
+# ─── Input ───────────────────────────────────────────────────────────────────
+class LiveInput:
+    """Keyboard and mouse straight from pygame (the default INPUT).
+
+    Games read input only through INPUT, so a ScriptedInput or RandomInput
+    can stand in for the player when running headless. F3 is taken here
+    and toggles the profiler overlay in every game.
+    """
+    def __init__(self):
+        self.pending = []
+
+    def events(self):
+        t0 = time.perf_counter()
+        events = []
+        for event in self.poll():
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                PROFILER.toggle()
+            else:
+                events.append(event)
+        PROFILER.add("event", time.perf_counter() - t0)
+        return events
+
+    def poll(self):
+        events, self.pending = self.pending + pygame.event.get(), []
+        return events
+
+    def wait(self, timeout=0):
+        """Sleep until an event arrives (or timeout ms pass); it is kept for the next events()."""
+        if TIME_SCALE <= 0:
+            return
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.pending.append(event)
+
+    def pressed(self):
+        return pygame.key.get_pressed()
+
+    def mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def mouse_pressed(self):
+        return pygame.mouse.get_pressed()
+
+
+class KeyState:
+    """Stand-in for pygame.key.get_pressed(): keys[k] is True while k is held."""
+    def __init__(self):
+        self.down = set()
+
+    def __getitem__(self, key):
+        return key in self.down
+
+
+class ScriptedInput(LiveInput):
+    """Synthetic input replayed from (tick, action, *args) steps.
+
+    Every events() call is one tick. Actions: "down KEY" and "up KEY" hold
+    and release a key, "tap KEY" presses and releases it, "move X Y" moves
+    the mouse and "click X Y" clicks there. KEY is a pygame key name such
+    as "space", "a" or "left". Setting quit makes every following tick
+    press ESC, which backs out of any game.
+    """
+    def __init__(self, steps=()):
+        self.steps = sorted(steps, key=lambda step: step[0])
+        self.next_step = 0
+        self.tick = 0
+        self.keys = KeyState()
+        self.mouse = (WIDTH // 2, HEIGHT // 2)
+        self.buttons = (False, False, False)
+        self.quit = False
+
+    @classmethod
+    def load(cls, path):
+        """Read steps from a text file: one "TICK ACTION ARGS..." per line, # comments."""
+        steps = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split("#", 1)[0].split()
+                if parts:
+                    steps.append((int(parts[0]), parts[1], *parts[2:]))
+        return cls(steps)
+
+    def due(self):
+        """Steps to apply on the current tick."""
+        steps = []
+        while self.next_step < len(self.steps) and self.steps[self.next_step][0] <= self.tick:
+            steps.append(self.steps[self.next_step])
+            self.next_step += 1
+        return steps
+
+    def apply(self, action, *args):
+        if action in ("down", "up", "tap"):
+            key = pygame.key.key_code(args[0])
+            kw = {"key": key, "mod": 0, "unicode": "", "scancode": 0}
+            if action == "up":
+                self.keys.down.discard(key)
+                return [pygame.event.Event(pygame.KEYUP, kw)]
+            if action == "down":
+                self.keys.down.add(key)
+                return [pygame.event.Event(pygame.KEYDOWN, kw)]
+            return [pygame.event.Event(pygame.KEYDOWN, kw), pygame.event.Event(pygame.KEYUP, kw)]
+        if action in ("move", "click"):
+            self.mouse = (int(args[0]), int(args[1]))
+            if action == "click":
+                kw = {"pos": self.mouse, "button": 1}
+                return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, kw),
+                        pygame.event.Event(pygame.MOUSEBUTTONUP, kw)]
+            return [pygame.event.Event(pygame.MOUSEMOTION, {"pos": self.mouse, "rel": (0, 0), "buttons": self.buttons})]
+        raise ValueError(f"unknown input action {action!r}")
+
+    def poll(self):
+        pygame.event.pump()
+        out = []
+        if self.quit:
+            out.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE, mod=0, unicode="", scancode=0))
+        for step in self.due():
+            out.extend(self.apply(*step[1:]))
+        self.tick += 1
+        return out
+
+    def wait(self, timeout=0):
+        pass  # scripted ticks never block
+
+    def pressed(self):
+        return self.keys
+
+    def mouse_pos(self):
+        return self.mouse
+
+    def mouse_pressed(self):
+        return self.buttons
+
+
+class RandomInput(ScriptedInput):
+    """Seeded random key holds, taps and clicks covering every game's controls."""
+    HOLD_KEYS = ("a", "d", "w", "s", "left", "right", "up", "down", "space")
+    TAP_KEYS = ("space", "d", "f", "j", "k", "return")
+
+    def __init__(self, seed=0):
+        super().__init__()
+        self.rng = random.Random(seed)
+
+    def due(self):
+        rng = self.rng
+        steps = []
+        if rng.random() < 0.06:
+            name = rng.choice(self.HOLD_KEYS)
+            held = pygame.key.key_code(name) in self.keys.down
+            steps.append((self.tick, "up" if held else "down", name))
+        if rng.random() < 0.05:
+            steps.append((self.tick, "tap", rng.choice(self.TAP_KEYS)))
+        if rng.random() < 0.03:
+            steps.append((self.tick, "click", rng.randint(0, WIDTH - 1), rng.randint(0, HEIGHT - 1)))
+        elif rng.random() < 0.1:
+            steps.append((self.tick, "move", rng.randint(0, WIDTH - 1), rng.randint(0, HEIGHT - 1)))
+        return steps
+
+
+INPUT = LiveInput()
 
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 def draw_text(surface, text, size, color, x, y, center=True, font_name=None):
-    font = pygame.font.SysFont(font_name or "consolas", size, bold=True)
-    rendered = font.render(text, True, color)
+    rendered = TEXT_CACHE.render(text, size, color, font_name)
     rect = rendered.get_rect()
     if center:
         rect.center = (x, y)
@@ -188,59 +627,149 @@ def draw_rounded_bar(surface, x, y, w, h, fill_ratio, bg_color, fill_color, bord
         pygame.draw.rect(surface, border_color, (x, y, w, h), 2, border_radius=h // 2)
 
 
-def draw_panel(surface, rect, bg_color=(20, 20, 35), border_color=None, alpha=200, radius=18):
-    """Draw a semi-transparent rounded panel."""
-    panel = pygame.Surface((rect[2], rect[3]), pygame.SRCALPHA)
-    pygame.draw.rect(panel, (*bg_color, alpha), (0, 0, rect[2], rect[3]), border_radius=radius)
+def _build_panel(key):
+    w, h, bg_color, border_color, alpha, radius = key
+    panel = pygame.Surface((w, h), pygame.SRCALPHA)
+    pygame.draw.rect(panel, (*bg_color, alpha), (0, 0, w, h), border_radius=radius)
     if border_color:
-        pygame.draw.rect(panel, (*border_color, 180), (0, 0, rect[2], rect[3]), 2, border_radius=radius)
-    surface.blit(panel, (rect[0], rect[1]))
+        pygame.draw.rect(panel, (*border_color, 180), (0, 0, w, h), 2, border_radius=radius)
+    return panel
+
+
+def draw_panel(surface, rect, bg_color=(20, 20, 35), border_color=None, alpha=200, radius=18):
+    """Draw a semi-transparent rounded panel (rendered once per size and style)."""
+    key = (rect[2], rect[3], tuple(bg_color), tuple(border_color) if border_color else None, alpha, radius)
+    surface.blit(SPRITES.get(key, _build_panel), (rect[0], rect[1]))
+
+
+# ─── Scenes ──────────────────────────────────────────────────────────────────
+class Scene:
+    """A full-screen state (fade, game over...) stepped by run_scene().
 
+    handle(event) sees every input event and update() runs once per tick;
+    draw(surface) renders a frame. Setting done ends the scene and
+    run_scene() returns result. While settled() is true nothing on screen
+    moves, so the driver sleeps in INPUT.wait() until input arrives.
+    """
+    done = False
+    result = None
 
-def wait_for_key():
+    def handle(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self, surface):
+        pass
+
+    def settled(self):
+        return False
+
+
+def run_scene(screen, scene):
+    """Drive a Scene on its own GameLoop until it is done and return its result."""
+    loop = GameLoop()
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return False
-                return True
-        pygame.time.wait(50)
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if not scene.done:
+                    scene.handle(event)
+            if not scene.done:
+                scene.update()
+        if scene.done:
+            GameLoop.resumed_at = time.perf_counter()
+            return scene.result
+        scene.draw(screen)
+        loop.present()
+        if scene.settled():
+            INPUT.wait()
+
+
+def _build_fade(key):
+    _, color = key
+    overlay = pygame.Surface((WIDTH, HEIGHT)).convert()
+    overlay.fill(color)
+    return overlay
+
+
+class Fade(Scene):
+    """Fade out to a solid color, or in from it, over `frames` ticks.
+
+    With a backdrop (a snapshot of the screen) every frame is two blits and
+    fades never stack up; without one the overlay is drawn over whatever the
+    caller just rendered.
+    """
+    def __init__(self, direction="out", color=BLACK, frames=13, backdrop=None):
+        self.direction = direction
+        self.frames = max(1, frames)
+        self.backdrop = backdrop
+        self.overlay = SPRITES.get(("fade", tuple(color)), _build_fade)
+        self.step = 0
+
+    def update(self):
+        self.step += 1
+        self.done = self.step > self.frames
+
+    def draw(self, surface):
+        if self.backdrop is not None:
+            surface.blit(self.backdrop, (0, 0))
+        level = min(self.step, self.frames) / self.frames
+        if self.direction == "in":
+            level = 1.0 - level
+        self.overlay.set_alpha(int(255 * level))
+        surface.blit(self.overlay, (0, 0))
 
 
 def screen_transition(screen, direction="in", color=BLACK, speed=15):
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill(color)
-    if direction == "in":
-        for alpha in range(255, -1, -speed):
-            overlay.set_alpha(max(0, alpha))
-            screen.blit(overlay, (0, 0))
-            pygame.display.flip()
-            pygame.time.wait(10)
-    else:
-        for alpha in range(0, 256, speed):
-            overlay.set_alpha(min(255, alpha))
-            screen.blit(overlay, (0, 0))
-            pygame.display.flip()
-            pygame.time.wait(10)
+    """Fade the current screen contents out to (or in from) color, 256 / speed frames."""
+    run_scene(screen, Fade(direction, color, -(-256 // speed), screen.copy()))
+
+
+class EndScreen(Scene):
+    """Game over / win panel over the game's particles.
+
+    Any key continues (result True) and ESC goes back to the menu (False),
+    from the very first frame. The panel and its text are rendered once;
+    when the intro frames are over and the particles are gone the screen is
+    static and run_scene() sleeps until a key arrives.
+    """
+    def __init__(self, msg, score, particles, color, panel_bg, panel_w, intro=30):
+        self.particles = particles
+        self.intro = intro
+        self.frame = 0
+        self.panel = pygame.Surface((panel_w, 200), pygame.SRCALPHA)
+        draw_panel(self.panel, (0, 0, panel_w, 200), panel_bg, color)
+        draw_text_shadow(self.panel, msg, 60, color, panel_w // 2, 50)
+        draw_text_shadow(self.panel, f"Score: {score}", 36, GOLD, panel_w // 2, 110)
+        draw_text(self.panel, "Press any key (ESC = menu)", 20, LIGHT_GRAY, panel_w // 2, 160)
+        self.pos = (WIDTH // 2 - panel_w // 2, HEIGHT // 2 - 100)
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.done = True
+            self.result = event.key != pygame.K_ESCAPE
+
+    def update(self):
+        self.frame += 1
+        self.particles.update()
+
+    def draw(self, surface):
+        surface.fill(theme["bg"])
+        self.particles.draw(surface)
+        surface.blit(self.panel, self.pos)
+
+    def settled(self):
+        return self.frame >= self.intro and not self.particles.n
 
 
 def game_over_screen(screen, score, particles):
-    """Animated game over with rounded overlay panel."""
+    """Animated game over with rounded overlay panel; False means back to the menu."""
     particles.explosion(WIDTH // 2, HEIGHT // 2 - 60, RED, 40)
-    for _ in range(30):
-        particles.update()
-        screen.fill(theme["bg"])
-        particles.draw(screen)
-        draw_panel(screen, (WIDTH // 2 - 200, HEIGHT // 2 - 100, 400, 200), (40, 10, 10), RED)
-        draw_text_shadow(screen, "GAME OVER", 60, RED, WIDTH // 2, HEIGHT // 2 - 50)
-        draw_text_shadow(screen, f"Score: {score}", 36, GOLD, WIDTH // 2, HEIGHT // 2 + 10)
-        draw_text(screen, "Press any key (ESC = menu)", 20, LIGHT_GRAY, WIDTH // 2, HEIGHT // 2 + 60)
-        pygame.display.flip()
-        pygame.time.wait(16)
-    return wait_for_key()
+    return run_scene(screen, EndScreen("GAME OVER", score, particles, RED, (40, 10, 10), 400))
 
 
 def win_screen(screen, msg, score, particles):
@@ -251,24 +780,12 @@ def win_screen(screen, msg, score, particles):
             random.choice([GOLD, NEON_GREEN, CYAN, NEON_PINK]),
             20
         )
-    for _ in range(40):
-        particles.update()
-        screen.fill(theme["bg"])
-        particles.draw(screen)
-        draw_panel(screen, (WIDTH // 2 - 220, HEIGHT // 2 - 100, 440, 200), (10, 30, 10), NEON_GREEN)
-        draw_text_shadow(screen, msg, 60, NEON_GREEN, WIDTH // 2, HEIGHT // 2 - 50)
-        draw_text_shadow(screen, f"Score: {score}", 36, GOLD, WIDTH // 2, HEIGHT // 2 + 10)
-        draw_text(screen, "Press any key (ESC = menu)", 20, LIGHT_GRAY, WIDTH // 2, HEIGHT // 2 + 60)
-        pygame.display.flip()
-        pygame.time.wait(16)
-    return wait_for_key()
+    return run_scene(screen, EndScreen(msg, score, particles, NEON_GREEN, (10, 30, 10), 440, intro=40))
 
 
 def draw_stars(surface, stars, scroll=0):
-    for sx, sy, sz in stars:
-        brightness = int(100 + sz * 50)
-        y = (sy + scroll * sz * 0.5) % HEIGHT
-        pygame.draw.circle(surface, (brightness, brightness, brightness + 20), (int(sx), int(y)), max(1, int(sz)))
+    """Blit a Starfield: one pre-rendered texture per parallax layer."""
+    stars.draw(surface, scroll)
 
 
 def rainbow_color(offset=0):
@@ -279,8 +796,7 @@ def rainbow_color(offset=0):
 
 def draw_hud(surface, text, y=22):
     """Draw HUD text with rounded background bar."""
-    font = pygame.font.SysFont("consolas", 22, bold=True)
-    rendered = font.render(text, True, theme["text"])
+    rendered = TEXT_CACHE.render(text, 22, theme["text"])
     tw = rendered.get_width()
     draw_panel(surface, (WIDTH // 2 - tw // 2 - 16, y - 14, tw + 32, 28), theme["panel"], None, 160, 14)
     rect = rendered.get_rect(center=(WIDTH // 2, y))
@@ -292,8 +808,7 @@ def draw_controls_hint(surface, text, timer):
     if timer <= 0:
         return
     alpha = min(200, timer * 3)
-    font = pygame.font.SysFont("consolas", 15, bold=True)
-    txt = font.render(text, True, theme["text"])
+    txt = TEXT_CACHE.render(text, 15, theme["text"])
     tw = txt.get_width()
     px, py = WIDTH - tw - 36, HEIGHT - 38
     panel = pygame.Surface((tw + 24, 26), pygame.SRCALPHA)
@@ -301,17 +816,25 @@ def draw_controls_hint(surface, text, timer):
     surface.blit(panel, (px, py))
     txt.set_alpha(alpha)
     surface.blit(txt, (px + 12, py + 4))
+    txt.set_alpha(None)
 
 
 # ─── Background stars (shared) ──────────────────────────────────────────────
-BG_STARS = [(random.randint(0, WIDTH), random.randint(0, HEIGHT), random.uniform(0.5, 2.5)) for _ in range(120)]
+def _star(sz):
+    brightness = int(100 + sz * 50)
+    return (random.randint(0, WIDTH), random.randint(0, HEIGHT), sz * 0.5, max(1, int(sz)),
+            (brightness, brightness, brightness + 20))
+
+
+# Bigger stars scroll faster; 4 layers stand in for the old per-star speeds.
+BG_STARS = Starfield((WIDTH, HEIGHT), [_star(random.uniform(0.5, 2.5)) for _ in range(120)], layers=4)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  1. PONG
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_pong(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     pw, ph = 14, 90
     player_y = HEIGHT // 2 - ph // 2
@@ -326,94 +849,95 @@ def run_pong(screen):
     ctrl_timer = 3 * FPS
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            player_y = max(0, player_y - 7)
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            player_y = min(HEIGHT - ph, player_y + 7)
-
-        ai_center = ai_y + ph // 2
-        if ball_y < ai_center - 15:
-            ai_y = max(0, ai_y - ai_speed)
-        elif ball_y > ai_center + 15:
-            ai_y = min(HEIGHT - ph, ai_y + ai_speed)
-
-        trail.append((int(ball_x), int(ball_y)))
-        if len(trail) > 15:
-            trail.pop(0)
-
-        ball_x += bvx
-        ball_y += bvy
-
-        if ball_y <= 5 or ball_y >= HEIGHT - 5:
-            bvy = -bvy
-            ps.sparkle(ball_x, ball_y, CYAN, 3)
-
-        if ball_x <= 35 + pw and player_y <= ball_y <= player_y + ph and bvx < 0:
-            bvx = -bvx * 1.02
-            offset = (ball_y - (player_y + ph / 2)) / (ph / 2)
-            bvy = offset * 6
-            ps.explosion(ball_x, ball_y, NEON_BLUE, 15)
-        if ball_x >= WIDTH - 35 - pw and ai_y <= ball_y <= ai_y + ph and bvx > 0:
-            bvx = -bvx * 1.02
-            offset = (ball_y - (ai_y + ph / 2)) / (ph / 2)
-            bvy = offset * 6
-            ps.explosion(ball_x, ball_y, NEON_PINK, 15)
-
-        if ball_x < 0:
-            a_score += 1
-            total = p_score + a_score
-            base_speed = 5.0 + total * 0.3
-            ai_speed = 4.5 + total * 0.15
-            ps.explosion(30, ball_y, RED, 25)
-            ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
-            bvx = base_speed
-            bvy = random.choice([-3.0, 3.0])
-            trail.clear()
-        elif ball_x > WIDTH:
-            p_score += 1
-            total = p_score + a_score
-            base_speed = 5.0 + total * 0.3
-            ai_speed = 4.5 + total * 0.15
-            ps.explosion(WIDTH - 30, ball_y, NEON_GREEN, 25)
-            ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
-            bvx = -base_speed
-            bvy = random.choice([-3.0, 3.0])
-            trail.clear()
-
-        # Score limit
-        if p_score >= max_score:
-            if not win_screen(screen, "YOU WIN!", p_score, ps):
-                return
-            p_score = a_score = 0
-            base_speed = 5.0
-            ai_speed = 4.5
-            ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
-            bvx, bvy = base_speed, 3.0
-            trail.clear()
-            continue
-        if a_score >= max_score:
-            if not game_over_screen(screen, p_score, ps):
-                return
-            p_score = a_score = 0
-            base_speed = 5.0
-            ai_speed = 4.5
-            ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
-            bvx, bvy = base_speed, 3.0
-            trail.clear()
-            continue
+            keys = INPUT.pressed()
+            if keys[pygame.K_UP] or keys[pygame.K_w]:
+                player_y = max(0, player_y - 7)
+            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+                player_y = min(HEIGHT - ph, player_y + 7)
 
-        bvx = max(-15, min(15, bvx))
-        ctrl_timer = max(0, ctrl_timer - 1)
+            ai_center = ai_y + ph // 2
+            if ball_y < ai_center - 15:
+                ai_y = max(0, ai_y - ai_speed)
+            elif ball_y > ai_center + 15:
+                ai_y = min(HEIGHT - ph, ai_y + ai_speed)
+
+            trail.append((int(ball_x), int(ball_y)))
+            if len(trail) > 15:
+                trail.pop(0)
+
+            ball_x += bvx
+            ball_y += bvy
+
+            if ball_y <= 5 or ball_y >= HEIGHT - 5:
+                bvy = -bvy
+                ps.sparkle(ball_x, ball_y, CYAN, 3)
+
+            if ball_x <= 35 + pw and player_y <= ball_y <= player_y + ph and bvx < 0:
+                bvx = -bvx * 1.02
+                offset = (ball_y - (player_y + ph / 2)) / (ph / 2)
+                bvy = offset * 6
+                ps.explosion(ball_x, ball_y, NEON_BLUE, 15)
+            if ball_x >= WIDTH - 35 - pw and ai_y <= ball_y <= ai_y + ph and bvx > 0:
+                bvx = -bvx * 1.02
+                offset = (ball_y - (ai_y + ph / 2)) / (ph / 2)
+                bvy = offset * 6
+                ps.explosion(ball_x, ball_y, NEON_PINK, 15)
+
+            if ball_x < 0:
+                a_score += 1
+                total = p_score + a_score
+                base_speed = 5.0 + total * 0.3
+                ai_speed = 4.5 + total * 0.15
+                ps.explosion(30, ball_y, RED, 25)
+                ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
+                bvx = base_speed
+                bvy = random.choice([-3.0, 3.0])
+                trail.clear()
+            elif ball_x > WIDTH:
+                p_score += 1
+                total = p_score + a_score
+                base_speed = 5.0 + total * 0.3
+                ai_speed = 4.5 + total * 0.15
+                ps.explosion(WIDTH - 30, ball_y, NEON_GREEN, 25)
+                ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
+                bvx = -base_speed
+                bvy = random.choice([-3.0, 3.0])
+                trail.clear()
+
+            # Score limit
+            if p_score >= max_score:
+                if not win_screen(screen, "YOU WIN!", p_score, ps):
+                    return
+                p_score = a_score = 0
+                base_speed = 5.0
+                ai_speed = 4.5
+                ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
+                bvx, bvy = base_speed, 3.0
+                trail.clear()
+                continue
+            if a_score >= max_score:
+                if not game_over_screen(screen, p_score, ps):
+                    return
+                p_score = a_score = 0
+                base_speed = 5.0
+                ai_speed = 4.5
+                ball_x, ball_y = float(WIDTH // 2), float(HEIGHT // 2)
+                bvx, bvy = base_speed, 3.0
+                trail.clear()
+                continue
+
+            bvx = max(-15, min(15, bvx))
+            ctrl_timer = max(0, ctrl_timer - 1)
+            ps.update()
 
-        ps.update()
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
 
@@ -442,21 +966,20 @@ def run_pong(screen):
         screen.blit(glow_b, (int(ball_x) - 15, int(ball_y) - 15))
         pygame.draw.circle(screen, WHITE, (int(ball_x), int(ball_y)), 8)
 
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_text_shadow(screen, str(p_score), 56, NEON_BLUE, WIDTH // 2 - 70, 45)
         draw_text_shadow(screen, str(a_score), 56, NEON_PINK, WIDTH // 2 + 70, 45)
         draw_text(screen, f"First to {max_score}", 16, LIGHT_GRAY, WIDTH // 2, 80)
         draw_hud(screen, "PONG", HEIGHT - 22)
         draw_controls_hint(screen, "W/S or Up/Down", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  2. FLAPPY BIRD  (FIX: replaced per-pixel pipe gradient with solid rects)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_flappy(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
     bird_x = 140
@@ -482,54 +1005,63 @@ def run_flappy(screen):
     spawn_pipe()
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                if event.key == pygame.K_SPACE:
-                    bird_vel = flap_power
-                    game_started = True
-                    ps.emit(bird_x - 10, bird_y + 10, YELLOW, 5,
-                            vx=random.uniform(-2, 0), vy=random.uniform(1, 3),
-                            life=15, size=2, gravity=0.1)
-
-        if game_started:
-            bird_vel += gravity
-            bird_y += bird_vel
-
-            for p in pipes:
-                p[0] -= pipe_speed
-
-            if pipes and pipes[0][0] + pipe_w < 0:
-                pipes.pop(0)
-                score += 1
-                ps.sparkle(bird_x, bird_y, GOLD, 8)
-
-            frame += 1
-            if frame % 85 == 0:
-                spawn_pipe()
-
-            dead = bird_y - bird_r < 0 or bird_y + bird_r > HEIGHT
-            for px, ptop in pipes:
-                if bird_x + bird_r > px and bird_x - bird_r < px + pipe_w:
-                    if bird_y - bird_r < ptop or bird_y + bird_r > ptop + gap:
-                        dead = True
-
-            if dead:
-                ps.explosion(bird_x, bird_y, ORANGE, 40)
-                if not game_over_screen(screen, score, ps):
-                    return
-                bird_y = float(HEIGHT // 2)
-                bird_vel = 0.0
-                pipes.clear()
-                spawn_pipe()
-                score = 0
-                frame = 0
-                game_started = False
-                continue
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return
+                    if event.key == pygame.K_SPACE:
+                        bird_vel = flap_power
+                        game_started = True
+                        ps.emit(bird_x - 10, bird_y + 10, YELLOW, 5,
+                                vx=random.uniform(-2, 0), vy=random.uniform(1, 3),
+                                life=15, size=2, gravity=0.1)
+
+            if game_started:
+                bird_vel += gravity
+                bird_y += bird_vel
+
+                for p in pipes:
+                    p[0] -= pipe_speed
+
+                if pipes and pipes[0][0] + pipe_w < 0:
+                    pipes.pop(0)
+                    score += 1
+                    ps.sparkle(bird_x, bird_y, GOLD, 8)
+
+                frame += 1
+                if frame % 85 == 0:
+                    spawn_pipe()
+
+                dead = bird_y - bird_r < 0 or bird_y + bird_r > HEIGHT
+                for px, ptop in pipes:
+                    if bird_x + bird_r > px and bird_x - bird_r < px + pipe_w:
+                        if bird_y - bird_r < ptop or bird_y + bird_r > ptop + gap:
+                            dead = True
+
+                if dead:
+                    ps.explosion(bird_x, bird_y, ORANGE, 40)
+                    if not game_over_screen(screen, score, ps):
+                        return
+                    bird_y = float(HEIGHT // 2)
+                    bird_vel = 0.0
+                    pipes.clear()
+                    spawn_pipe()
+                    score = 0
+                    frame = 0
+                    game_started = False
+                    continue
+
+            for i in range(len(cloud_x)):
+                cloud_x[i] -= 0.3
+                if cloud_x[i] < -80:
+                    cloud_x[i] = WIDTH + 40
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         # Draw sky gradient (horizontal lines are fine, one per row)
         for y_line in range(0, HEIGHT, 3):
@@ -545,9 +1077,6 @@ def run_flappy(screen):
 
         # Clouds
         for i in range(len(cloud_x)):
-            cloud_x[i] -= 0.3
-            if cloud_x[i] < -80:
-                cloud_x[i] = WIDTH + 40
             cx, cy = int(cloud_x[i]), cloud_y[i]
             s = pygame.Surface((80, 30), pygame.SRCALPHA)
             pygame.draw.ellipse(s, (255, 255, 255, 25), (0, 8, 80, 22))
@@ -587,24 +1116,21 @@ def run_flappy(screen):
             (bird_x + bird_r + 12, bird_y + 5),
         ])
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
 
         draw_text_shadow(screen, str(score), 56, WHITE, WIDTH // 2, 55)
         if not game_started:
             draw_panel(screen, (WIDTH // 2 - 180, HEIGHT // 2 + 75, 360, 45), (20, 20, 40), None, 180, 12)
             draw_text_shadow(screen, "Press SPACE to flap!", 28, WHITE, WIDTH // 2, HEIGHT // 2 + 97)
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "SPACE to flap", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  3. BREAKOUT  (FIX: minimum horizontal velocity so ball doesn't go straight up)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_breakout(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
     paddle_w, paddle_h = 110, 14
@@ -641,59 +1167,63 @@ def run_breakout(screen):
         bricks = make_bricks()
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
+
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                paddle_x = max(0, paddle_x - 8)
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                paddle_x = min(WIDTH - paddle_w, paddle_x + 8)
+
+            ball_x += bvx
+            ball_y += bvy
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            paddle_x = max(0, paddle_x - 8)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            paddle_x = min(WIDTH - paddle_w, paddle_x + 8)
-
-        ball_x += bvx
-        ball_y += bvy
-
-        if ball_x - ball_r <= 0 or ball_x + ball_r >= WIDTH:
-            bvx = -bvx
-        if ball_y - ball_r <= 0:
-            bvy = -bvy
-
-        paddle_rect = pygame.Rect(paddle_x, paddle_y, paddle_w, paddle_h)
-        if bvy > 0 and paddle_rect.collidepoint(ball_x, ball_y + ball_r):
-            bvy = -abs(bvy)
-            offset = (ball_x - (paddle_x + paddle_w / 2)) / (paddle_w / 2)
-            bvx = offset * 5.5
-            # FIX: ensure minimum horizontal velocity
-            if abs(bvx) < 1.5:
-                bvx = 1.5 if bvx >= 0 else -1.5
-            ps.sparkle(ball_x, paddle_y, CYAN, 6)
-
-        ball_rect = pygame.Rect(ball_x - ball_r, ball_y - ball_r, ball_r * 2, ball_r * 2)
-        for brick_data in bricks[:]:
-            brick, row = brick_data
-            if ball_rect.colliderect(brick):
-                bricks.remove(brick_data)
+            if ball_x - ball_r <= 0 or ball_x + ball_r >= WIDTH:
+                bvx = -bvx
+            if ball_y - ball_r <= 0:
                 bvy = -bvy
-                score += (brick_rows - row) * 10
-                c = row_colors[row % len(row_colors)]
-                ps.explosion(brick.centerx, brick.centery, c, 12)
-                break
 
-        if ball_y > HEIGHT + 20:
-            if not game_over_screen(screen, score, ps):
-                return
-            reset()
-            continue
+            paddle_rect = pygame.Rect(paddle_x, paddle_y, paddle_w, paddle_h)
+            if bvy > 0 and paddle_rect.collidepoint(ball_x, ball_y + ball_r):
+                bvy = -abs(bvy)
+                offset = (ball_x - (paddle_x + paddle_w / 2)) / (paddle_w / 2)
+                bvx = offset * 5.5
+                # FIX: ensure minimum horizontal velocity
+                if abs(bvx) < 1.5:
+                    bvx = 1.5 if bvx >= 0 else -1.5
+                ps.sparkle(ball_x, paddle_y, CYAN, 6)
+
+            ball_rect = pygame.Rect(ball_x - ball_r, ball_y - ball_r, ball_r * 2, ball_r * 2)
+            for brick_data in bricks[:]:
+                brick, row = brick_data
+                if ball_rect.colliderect(brick):
+                    bricks.remove(brick_data)
+                    bvy = -bvy
+                    score += (brick_rows - row) * 10
+                    c = row_colors[row % len(row_colors)]
+                    ps.explosion(brick.centerx, brick.centery, c, 12)
+                    break
 
-        if not bricks:
-            if not win_screen(screen, "YOU WIN!", score, ps):
-                return
-            reset()
-            continue
+            if ball_y > HEIGHT + 20:
+                if not game_over_screen(screen, score, ps):
+                    return
+                reset()
+                continue
+
+            if not bricks:
+                if not win_screen(screen, "YOU WIN!", score, ps):
+                    return
+                reset()
+                continue
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
@@ -717,20 +1247,17 @@ def run_breakout(screen):
         screen.blit(gb, (int(ball_x) - 12, int(ball_y) - 12))
         pygame.draw.circle(screen, NEON_PINK, (int(ball_x), int(ball_y)), ball_r)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"BREAKOUT  Score: {score}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "A/D or Left/Right", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  4. SPACE INVADERS  (FIX: store row color per enemy instead of using index)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_invaders(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -762,86 +1289,97 @@ def run_invaders(screen):
     score = 0
     shoot_cd = 0
     star_scroll = 0
+    grid = SpatialHash(64)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            player_x = max(25, player_x - player_speed)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            player_x = min(WIDTH - 25, player_x + player_speed)
-        if keys[pygame.K_SPACE] and shoot_cd <= 0:
-            bullets.append([player_x, float(player_y - 18)])
-            shoot_cd = 12
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                player_x = max(25, player_x - player_speed)
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                player_x = min(WIDTH - 25, player_x + player_speed)
+            if keys[pygame.K_SPACE] and shoot_cd <= 0:
+                bullets.append([player_x, float(player_y - 18)])
+                shoot_cd = 12
 
-        shoot_cd -= 1
-        star_scroll += 0.5
+            shoot_cd -= 1
+            star_scroll += 0.5
 
-        bullets = [[bx, by - bullet_speed] for bx, by in bullets if by > 0]
-        enemy_bullets = [[bx, by + 5] for bx, by in enemy_bullets if by < HEIGHT]
+            bullets = [[bx, by - bullet_speed] for bx, by in bullets if by > 0]
+            enemy_bullets = [[bx, by + 5] for bx, by in enemy_bullets if by < HEIGHT]
 
-        move_down = False
-        for e in enemies:
-            er = e["rect"]
-            if er.x + enemy_dx < 5 or er.x + er.width + enemy_dx > WIDTH - 5:
-                move_down = True
-                break
-        if move_down:
-            enemy_dx = -enemy_dx
+            move_down = False
             for e in enemies:
-                e["rect"].y += 18
-        for e in enemies:
-            e["rect"].x += enemy_dx
-
-        if enemies and random.random() < 0.025:
-            shooter = random.choice(enemies)
-            enemy_bullets.append([float(shooter["rect"].centerx), float(shooter["rect"].bottom)])
-
-        for bullet in bullets[:]:
-            br = pygame.Rect(bullet[0] - 3, bullet[1] - 8, 6, 16)
-            for enemy in enemies[:]:
-                if br.colliderect(enemy["rect"]):
-                    ps.explosion(enemy["rect"].centerx, enemy["rect"].centery, NEON_GREEN, 20)
-                    enemies.remove(enemy)
-                    bullets.remove(bullet)
-                    score += 25
+                er = e["rect"]
+                if er.x + enemy_dx < 5 or er.x + er.width + enemy_dx > WIDTH - 5:
+                    move_down = True
                     break
+            if move_down:
+                enemy_dx = -enemy_dx
+                for e in enemies:
+                    e["rect"].y += 18
+            for e in enemies:
+                e["rect"].x += enemy_dx
+
+            if enemies and random.random() < 0.025:
+                shooter = random.choice(enemies)
+                enemy_bullets.append([float(shooter["rect"].centerx), float(shooter["rect"].bottom)])
+
+            grid.clear()
+            for i, e in enumerate(enemies):
+                grid.insert_rect(i, e["rect"])
+            dead = [False] * len(enemies)
+            live_bullets = []
+            for bullet in bullets:
+                br = pygame.Rect(bullet[0] - 3, bullet[1] - 8, 6, 16)
+                for i in grid.query_rect(br):
+                    er = enemies[i]["rect"]
+                    if not dead[i] and br.colliderect(er):
+                        ps.explosion(er.centerx, er.centery, NEON_GREEN, 20)
+                        dead[i] = True
+                        score += 25
+                        break
+                else:
+                    live_bullets.append(bullet)
+            if len(live_bullets) < len(bullets):
+                bullets = live_bullets
+                enemies = [e for e, d in zip(enemies, dead) if not d]
 
-        player_rect = pygame.Rect(player_x - 20, player_y - 14, 40, 28)
-        hit = False
-        for eb in enemy_bullets:
-            if player_rect.collidepoint(eb[0], eb[1]):
-                hit = True
-        for e in enemies:
-            if e["rect"].bottom >= player_y - 10:
-                hit = True
+            player_rect = pygame.Rect(player_x - 20, player_y - 14, 40, 28)
+            hit = any(player_rect.collidepoint(eb[0], eb[1]) for eb in enemy_bullets)
+            if not hit:
+                hit = any(e["rect"].bottom >= player_y - 10 for e in enemies)
 
-        if hit:
-            ps.explosion(player_x, player_y, CYAN, 50)
-            if not game_over_screen(screen, score, ps):
-                return
-            player_x = float(WIDTH // 2)
-            bullets.clear()
-            enemy_bullets.clear()
-            enemies = make_enemies()
-            enemy_dx = 2
-            score = 0
-            continue
-
-        if not enemies:
-            if not win_screen(screen, "WAVE CLEARED!", score, ps):
-                return
-            enemies = make_enemies()
-            enemy_dx = 2
-            bullets.clear()
-            enemy_bullets.clear()
-            continue
+            if hit:
+                ps.explosion(player_x, player_y, CYAN, 50)
+                if not game_over_screen(screen, score, ps):
+                    return
+                player_x = float(WIDTH // 2)
+                bullets.clear()
+                enemy_bullets.clear()
+                enemies = make_enemies()
+                enemy_dx = 2
+                score = 0
+                continue
+
+            if not enemies:
+                if not win_screen(screen, "WAVE CLEARED!", score, ps):
+                    return
+                enemies = make_enemies()
+                enemy_dx = 2
+                bullets.clear()
+                enemy_bullets.clear()
+                continue
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS, star_scroll)
@@ -872,28 +1410,24 @@ def run_invaders(screen):
             pygame.draw.circle(screen, BLACK, (draw_r.x + 11, int(eye_y)), 2)
             pygame.draw.circle(screen, BLACK, (draw_r.x + draw_r.width - 9, int(eye_y)), 2)
 
+        glow_s = SPRITES.get(("rect", 10, 20, (*YELLOW, 80)), _build_glow)
         for bx, by in bullets:
-            glow_s = pygame.Surface((10, 20), pygame.SRCALPHA)
-            pygame.draw.rect(glow_s, (*YELLOW, 80), (0, 0, 10, 20), border_radius=4)
             screen.blit(glow_s, (int(bx) - 5, int(by) - 10))
             pygame.draw.rect(screen, YELLOW, (int(bx) - 2, int(by) - 8, 4, 16), border_radius=2)
         for bx, by in enemy_bullets:
             pygame.draw.rect(screen, RED, (int(bx) - 2, int(by) - 5, 4, 10), border_radius=2)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"SPACE INVADERS  Score: {score}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "A/D + SPACE shoot", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  5. ASTEROIDS
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_asteroids(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -929,89 +1463,105 @@ def run_asteroids(screen):
         asteroids_list.append(spawn_asteroid())
 
     rot_accum = 0.0
+    grid = SpatialHash(64)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            ship_angle += 4.5
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            ship_angle -= 4.5
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            rad = math.radians(ship_angle)
-            ship_vx += math.sin(rad) * -0.18
-            ship_vy += math.cos(rad) * -0.18
-            ta = math.radians(ship_angle + 180)
-            ttx = ship_x + math.sin(ta) * -16
-            tty = ship_y + math.cos(ta) * -16
-            ps.emit(ttx, tty, ORANGE, 2, vx=math.sin(ta) * -2 + random.uniform(-1, 1),
-                    vy=math.cos(ta) * -2 + random.uniform(-1, 1), life=12, size=3, gravity=0)
-        if keys[pygame.K_SPACE] and shoot_cd <= 0:
-            rad = math.radians(ship_angle)
-            bullets.append([ship_x, ship_y, math.sin(rad) * -9, math.cos(rad) * -9, 55])
-            shoot_cd = 8
-
-        shoot_cd -= 1
-        ship_x = (ship_x + ship_vx) % WIDTH
-        ship_y = (ship_y + ship_vy) % HEIGHT
-        ship_vx *= 0.99
-        ship_vy *= 0.99
-
-        new_bullets = []
-        for b in bullets:
-            b[0] += b[2]
-            b[1] += b[3]
-            b[4] -= 1
-            if b[4] > 0 and -10 <= b[0] <= WIDTH + 10 and -10 <= b[1] <= HEIGHT + 10:
-                new_bullets.append(b)
-        bullets = new_bullets
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                ship_angle += 4.5
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                ship_angle -= 4.5
+            if keys[pygame.K_UP] or keys[pygame.K_w]:
+                rad = math.radians(ship_angle)
+                ship_vx += math.sin(rad) * -0.18
+                ship_vy += math.cos(rad) * -0.18
+                ta = math.radians(ship_angle + 180)
+                ttx = ship_x + math.sin(ta) * -16
+                tty = ship_y + math.cos(ta) * -16
+                ps.emit(ttx, tty, ORANGE, 2, vx=math.sin(ta) * -2 + random.uniform(-1, 1),
+                        vy=math.cos(ta) * -2 + random.uniform(-1, 1), life=12, size=3, gravity=0)
+            if keys[pygame.K_SPACE] and shoot_cd <= 0:
+                rad = math.radians(ship_angle)
+                bullets.append([ship_x, ship_y, math.sin(rad) * -9, math.cos(rad) * -9, 55])
+                shoot_cd = 8
+
+            shoot_cd -= 1
+            ship_x = (ship_x + ship_vx) % WIDTH
+            ship_y = (ship_y + ship_vy) % HEIGHT
+            ship_vx *= 0.99
+            ship_vy *= 0.99
+
+            new_bullets = []
+            for b in bullets:
+                b[0] += b[2]
+                b[1] += b[3]
+                b[4] -= 1
+                if b[4] > 0 and -10 <= b[0] <= WIDTH + 10 and -10 <= b[1] <= HEIGHT + 10:
+                    new_bullets.append(b)
+            bullets = new_bullets
+
+            for a in asteroids_list:
+                a["x"] = (a["x"] + a["vx"]) % WIDTH
+                a["y"] = (a["y"] + a["vy"]) % HEIGHT
+
+            grid.rebuild([(a["x"] - a["r"], a["y"] - a["r"], a["x"] + a["r"], a["y"] + a["r"])
+                          for a in asteroids_list])
+            dead = [False] * len(asteroids_list)
+            fragments = []
+            live_bullets = []
+            for b in bullets:
+                for i in grid.query_circle(b[0], b[1]):
+                    a = asteroids_list[i]
+                    if not dead[i] and math.hypot(b[0] - a["x"], b[1] - a["y"]) < a["r"]:
+                        dead[i] = True
+                        score += (4 - a["size"]) * 50
+                        ps.explosion(a["x"], a["y"], LIGHT_GRAY, 20)
+                        if a["size"] > 1:
+                            for _ in range(2):
+                                fragments.append(spawn_asteroid(a["size"] - 1, a["x"], a["y"]))
+                        break
+                else:
+                    live_bullets.append(b)
 
-        for a in asteroids_list:
-            a["x"] = (a["x"] + a["vx"]) % WIDTH
-            a["y"] = (a["y"] + a["vy"]) % HEIGHT
-
-        for b in bullets[:]:
-            for a in asteroids_list[:]:
-                dist = math.hypot(b[0] - a["x"], b[1] - a["y"])
-                if dist < a["r"]:
-                    if b in bullets:
-                        bullets.remove(b)
-                    asteroids_list.remove(a)
-                    score += (4 - a["size"]) * 50
-                    ps.explosion(a["x"], a["y"], LIGHT_GRAY, 20)
-                    if a["size"] > 1:
-                        for _ in range(2):
-                            asteroids_list.append(spawn_asteroid(a["size"] - 1, a["x"], a["y"]))
+            hit = any(math.hypot(ship_x - a["x"], ship_y - a["y"]) < a["r"] + 14
+                      for a in fragments)
+            for i in grid.query_circle(ship_x, ship_y, 14):
+                a = asteroids_list[i]
+                if not dead[i] and math.hypot(ship_x - a["x"], ship_y - a["y"]) < a["r"] + 14:
+                    hit = True
                     break
+            if len(live_bullets) < len(bullets):
+                bullets = live_bullets
+                asteroids_list = [a for a, d in zip(asteroids_list, dead) if not d] + fragments
 
-        hit = False
-        for a in asteroids_list:
-            if math.hypot(ship_x - a["x"], ship_y - a["y"]) < a["r"] + 14:
-                hit = True
+            if hit:
+                ps.explosion(ship_x, ship_y, CYAN, 50)
+                if not game_over_screen(screen, score, ps):
+                    return
+                ship_x, ship_y = float(WIDTH // 2), float(HEIGHT // 2)
+                ship_vx = ship_vy = 0.0
+                ship_angle = 0.0
+                bullets.clear()
+                asteroids_list.clear()
+                for _ in range(5):
+                    asteroids_list.append(spawn_asteroid())
+                score = 0
+                continue
 
-        if hit:
-            ps.explosion(ship_x, ship_y, CYAN, 50)
-            if not game_over_screen(screen, score, ps):
-                return
-            ship_x, ship_y = float(WIDTH // 2), float(HEIGHT // 2)
-            ship_vx = ship_vy = 0.0
-            ship_angle = 0.0
-            bullets.clear()
-            asteroids_list.clear()
-            for _ in range(5):
-                asteroids_list.append(spawn_asteroid())
-            score = 0
-            continue
-
-        if not asteroids_list:
-            for _ in range(5 + score // 400):
-                asteroids_list.append(spawn_asteroid())
+            if not asteroids_list:
+                for _ in range(5 + score // 400):
+                    asteroids_list.append(spawn_asteroid())
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
@@ -1034,26 +1584,22 @@ def run_asteroids(screen):
                 pts.append((apx, apy))
             pygame.draw.polygon(screen, (160, 160, 170), pts, 2)
 
+        gbul = SPRITES.get(("circle", 10, 10, (*YELLOW, 60)), _build_glow)
         for b in bullets:
             pygame.draw.circle(screen, YELLOW, (int(b[0]), int(b[1])), 3)
-            gbul = pygame.Surface((10, 10), pygame.SRCALPHA)
-            pygame.draw.circle(gbul, (*YELLOW, 60), (5, 5), 5)
             screen.blit(gbul, (int(b[0]) - 5, int(b[1]) - 5))
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"ASTEROIDS  Score: {score}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "A/D turn  W gas  SPACE shoot", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  6. MEMORY MATCH  (FIX: smaller cards so they fit on screen)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_memory(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
     rows, cols = 4, 6
@@ -1107,51 +1653,68 @@ def run_memory(screen):
             pygame.draw.polygon(surf, c, pts)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and wait_timer <= 0 and preview_timer <= 0:
-                mx, my = event.pos
-                for i in range(total):
-                    row = i // cols
-                    col = i % cols
-                    cx = offset_x + col * (card_w + pad)
-                    cy = offset_y + row * (card_h + pad)
-                    if cx <= mx <= cx + card_w and cy <= my <= cy + card_h:
-                        if not revealed[i] and not matched[i] and len(selected) < 2:
-                            revealed[i] = True
-                            selected.append(i)
-                            if len(selected) == 2:
-                                moves += 1
-                                if symbols[selected[0]] == symbols[selected[1]]:
-                                    matched[selected[0]] = True
-                                    matched[selected[1]] = True
-                                    pairs_found += 1
-                                    for s_idx in selected:
-                                        sr = s_idx // cols
-                                        sc = s_idx % cols
-                                        spx = offset_x + sc * (card_w + pad) + card_w // 2
-                                        spy = offset_y + sr * (card_h + pad) + card_h // 2
-                                        ps.sparkle(spx, spy, GOLD, 10)
-                                    selected = []
-                                else:
-                                    wait_timer = 45
-
-        # Preview countdown
-        if preview_timer > 0:
-            preview_timer -= 1
-            if preview_timer == 0:
-                revealed = [False] * total
-
-        if wait_timer > 0:
-            wait_timer -= 1
-            if wait_timer == 0:
-                for idx in selected:
-                    revealed[idx] = False
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and wait_timer <= 0 and preview_timer <= 0:
+                    mx, my = event.pos
+                    for i in range(total):
+                        row = i // cols
+                        col = i % cols
+                        cx = offset_x + col * (card_w + pad)
+                        cy = offset_y + row * (card_h + pad)
+                        if cx <= mx <= cx + card_w and cy <= my <= cy + card_h:
+                            if not revealed[i] and not matched[i] and len(selected) < 2:
+                                revealed[i] = True
+                                selected.append(i)
+                                if len(selected) == 2:
+                                    moves += 1
+                                    if symbols[selected[0]] == symbols[selected[1]]:
+                                        matched[selected[0]] = True
+                                        matched[selected[1]] = True
+                                        pairs_found += 1
+                                        for s_idx in selected:
+                                            sr = s_idx // cols
+                                            sc = s_idx % cols
+                                            spx = offset_x + sc * (card_w + pad) + card_w // 2
+                                            spy = offset_y + sr * (card_h + pad) + card_h // 2
+                                            ps.sparkle(spx, spy, GOLD, 10)
+                                        selected = []
+                                    else:
+                                        wait_timer = 45
+
+            # Preview countdown
+            if preview_timer > 0:
+                preview_timer -= 1
+                if preview_timer == 0:
+                    revealed = [False] * total
+
+            if wait_timer > 0:
+                wait_timer -= 1
+                if wait_timer == 0:
+                    for idx in selected:
+                        revealed[idx] = False
+                    selected = []
+
+            if pairs_found == total // 2:
+                if not win_screen(screen, "YOU WIN!", moves, ps):
+                    return
+                random.shuffle(symbols)
+                revealed = [True] * total
+                matched = [False] * total
                 selected = []
+                moves = 0
+                pairs_found = 0
+                wait_timer = 0
+                preview_timer = 10 * FPS
+                continue
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
@@ -1182,8 +1745,7 @@ def run_memory(screen):
                 ])
                 draw_text(screen, "?", 34, (80, 120, 220), ccx, ccy)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
 
         if preview_timer > 0:
             secs_left = preview_timer // FPS + 1
@@ -1194,31 +1756,16 @@ def run_memory(screen):
             draw_rounded_bar(screen, WIDTH // 2 - bar_w // 2, HEIGHT // 2 + 22, bar_w, 10, bar_ratio, (30, 30, 50), NEON_BLUE)
 
         draw_hud(screen, f"MEMORY MATCH   Moves: {moves}   Pairs: {pairs_found}/{total // 2}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "Mouse click", ctrl_timer)
 
-        if pairs_found == total // 2:
-            if not win_screen(screen, "YOU WIN!", moves, ps):
-                return
-            random.shuffle(symbols)
-            revealed = [True] * total
-            matched = [False] * total
-            selected = []
-            moves = 0
-            pairs_found = 0
-            wait_timer = 0
-            preview_timer = 10 * FPS
-            continue
-
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  7. DODGE MASTER  (FIX: gentler difficulty curve)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_dodge(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -1231,75 +1778,79 @@ def run_dodge(screen):
     trail = []
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            px = max(15, px - speed)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            px = min(WIDTH - 15, px + speed)
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            py = max(15, py - speed)
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            py = min(HEIGHT - 15, py + speed)
-
-        trail.append((int(px), int(py)))
-        if len(trail) > 20:
-            trail.pop(0)
-
-        score += 1
-        # FIX: gentler difficulty curve
-        difficulty = 1.0 + score / 1500
-
-        spawn_timer += 1
-        if spawn_timer >= max(18, int(40 / difficulty)):
-            spawn_timer = 0
-            side = random.randint(0, 3)
-            if side == 0:
-                ex, ey = random.randint(0, WIDTH), -20
-                evx, evy = random.uniform(-1, 1), random.uniform(2, 3.5) * difficulty
-            elif side == 1:
-                ex, ey = WIDTH + 20, random.randint(0, HEIGHT)
-                evx, evy = random.uniform(-3.5, -2) * difficulty, random.uniform(-1, 1)
-            elif side == 2:
-                ex, ey = random.randint(0, WIDTH), HEIGHT + 20
-                evx, evy = random.uniform(-1, 1), random.uniform(-3.5, -2) * difficulty
-            else:
-                ex, ey = -20, random.randint(0, HEIGHT)
-                evx, evy = random.uniform(2, 3.5) * difficulty, random.uniform(-1, 1)
-            size = random.randint(8, 18)
-            c = random.choice([RED, ORANGE, NEON_PINK, PURPLE])
-            enemies.append([float(ex), float(ey), evx, evy, size, c])
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                px = max(15, px - speed)
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                px = min(WIDTH - 15, px + speed)
+            if keys[pygame.K_UP] or keys[pygame.K_w]:
+                py = max(15, py - speed)
+            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+                py = min(HEIGHT - 15, py + speed)
+
+            trail.append((int(px), int(py)))
+            if len(trail) > 20:
+                trail.pop(0)
+
+            score += 1
+            # FIX: gentler difficulty curve
+            difficulty = 1.0 + score / 1500
+
+            spawn_timer += 1
+            if spawn_timer >= max(18, int(40 / difficulty)):
+                spawn_timer = 0
+                side = random.randint(0, 3)
+                if side == 0:
+                    ex, ey = random.randint(0, WIDTH), -20
+                    evx, evy = random.uniform(-1, 1), random.uniform(2, 3.5) * difficulty
+                elif side == 1:
+                    ex, ey = WIDTH + 20, random.randint(0, HEIGHT)
+                    evx, evy = random.uniform(-3.5, -2) * difficulty, random.uniform(-1, 1)
+                elif side == 2:
+                    ex, ey = random.randint(0, WIDTH), HEIGHT + 20
+                    evx, evy = random.uniform(-1, 1), random.uniform(-3.5, -2) * difficulty
+                else:
+                    ex, ey = -20, random.randint(0, HEIGHT)
+                    evx, evy = random.uniform(2, 3.5) * difficulty, random.uniform(-1, 1)
+                size = random.randint(8, 18)
+                c = random.choice([RED, ORANGE, NEON_PINK, PURPLE])
+                enemies.append([float(ex), float(ey), evx, evy, size, c])
 
-        new_enemies = []
-        for e in enemies:
-            e[0] += e[2]
-            e[1] += e[3]
-            if -50 < e[0] < WIDTH + 50 and -50 < e[1] < HEIGHT + 50:
-                new_enemies.append(e)
-        enemies = new_enemies
+            new_enemies = []
+            for e in enemies:
+                e[0] += e[2]
+                e[1] += e[3]
+                if -50 < e[0] < WIDTH + 50 and -50 < e[1] < HEIGHT + 50:
+                    new_enemies.append(e)
+            enemies = new_enemies
 
-        hit = False
-        for e in enemies:
-            if math.hypot(px - e[0], py - e[1]) < 12 + e[4]:
-                hit = True
+            hit = False
+            for e in enemies:
+                if math.hypot(px - e[0], py - e[1]) < 12 + e[4]:
+                    hit = True
 
-        if hit:
-            ps.explosion(px, py, NEON_GREEN, 60)
-            if not game_over_screen(screen, score, ps):
-                return
-            px, py = float(WIDTH // 2), float(HEIGHT - 80)
-            enemies.clear()
-            score = 0
-            difficulty = 1.0
-            spawn_timer = 0
-            trail.clear()
-            continue
+            if hit:
+                ps.explosion(px, py, NEON_GREEN, 60)
+                if not game_over_screen(screen, score, ps):
+                    return
+                px, py = float(WIDTH // 2), float(HEIGHT - 80)
+                enemies.clear()
+                score = 0
+                difficulty = 1.0
+                spawn_timer = 0
+                trail.clear()
+                continue
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
@@ -1323,20 +1874,17 @@ def run_dodge(screen):
             screen.blit(glow_e, (int(e[0]) - e[4] * 3 // 2, int(e[1]) - e[4] * 3 // 2))
             pygame.draw.circle(screen, e[5], (int(e[0]), int(e[1])), e[4])
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"DODGE MASTER  Score: {score}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "WASD or Arrows", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  8. COLOR CATCH  (FIX: larger target indicator + colored basket border)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_color_catch(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -1354,55 +1902,59 @@ def run_color_catch(screen):
     all_colors = [RED, GREEN, BLUE, YELLOW, PURPLE, CYAN, ORANGE, NEON_PINK]
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            basket_x = max(basket_w // 2, basket_x - speed)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            basket_x = min(WIDTH - basket_w // 2, basket_x + speed)
-
-        spawn_cd += 1
-        if spawn_cd >= 25:
-            spawn_cd = 0
-            c = random.choice(all_colors)
-            ox = random.randint(30, WIDTH - 30)
-            orbs.append([float(ox), -15.0, random.uniform(2, 4), c, random.randint(10, 16)])
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        new_orbs = []
-        for o in orbs:
-            o[1] += o[2]
-            if o[1] >= basket_y - 10 and abs(o[0] - basket_x) < basket_w // 2 + o[4]:
-                if o[3] == target_color:
-                    score += 50
-                    ps.sparkle(o[0], basket_y, GOLD, 10)
-                    if score % 200 == 0:
-                        target_color = random.choice(all_colors)
-                else:
-                    lives -= 1
-                    ps.explosion(o[0], basket_y, RED, 10)
-                continue
-            if o[1] > HEIGHT + 20:
-                if o[3] == target_color:
-                    lives -= 1
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                basket_x = max(basket_w // 2, basket_x - speed)
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                basket_x = min(WIDTH - basket_w // 2, basket_x + speed)
+
+            spawn_cd += 1
+            if spawn_cd >= 25:
+                spawn_cd = 0
+                c = random.choice(all_colors)
+                ox = random.randint(30, WIDTH - 30)
+                orbs.append([float(ox), -15.0, random.uniform(2, 4), c, random.randint(10, 16)])
+
+            new_orbs = []
+            for o in orbs:
+                o[1] += o[2]
+                if o[1] >= basket_y - 10 and abs(o[0] - basket_x) < basket_w // 2 + o[4]:
+                    if o[3] == target_color:
+                        score += 50
+                        ps.sparkle(o[0], basket_y, GOLD, 10)
+                        if score % 200 == 0:
+                            target_color = random.choice(all_colors)
+                    else:
+                        lives -= 1
+                        ps.explosion(o[0], basket_y, RED, 10)
+                    continue
+                if o[1] > HEIGHT + 20:
+                    if o[3] == target_color:
+                        lives -= 1
+                    continue
+                new_orbs.append(o)
+            orbs = new_orbs
+
+            if lives <= 0:
+                if not game_over_screen(screen, score, ps):
+                    return
+                basket_x = float(WIDTH // 2)
+                score = 0
+                lives = 5
+                orbs.clear()
+                target_color = random.choice(all_colors)
                 continue
-            new_orbs.append(o)
-        orbs = new_orbs
 
-        if lives <= 0:
-            if not game_over_screen(screen, score, ps):
-                return
-            basket_x = float(WIDTH // 2)
-            score = 0
-            lives = 5
-            orbs.clear()
-            target_color = random.choice(all_colors)
-            continue
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill(theme["bg"])
         draw_stars(screen, BG_STARS)
@@ -1433,20 +1985,17 @@ def run_color_catch(screen):
         pygame.draw.line(screen, LIGHT_GRAY, (bx - basket_w // 2, basket_y), (bx - basket_w // 2 + 5, basket_y - 15), 2)
         pygame.draw.line(screen, LIGHT_GRAY, (bx + basket_w // 2, basket_y), (bx + basket_w // 2 - 5, basket_y - 15), 2)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_text_shadow(screen, f"Score: {score}", 28, GOLD, WIDTH // 2, HEIGHT - 20)
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "A/D or Left/Right", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  9. METEOR STORM
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_meteor(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -1460,94 +2009,108 @@ def run_meteor(screen):
     powerups = []
     rapid_fire = 0
     star_scroll = 0
+    grid = SpatialHash(64)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            ship_x = max(20, ship_x - speed)
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            ship_x = min(WIDTH - 20, ship_x + speed)
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            ship_y = max(HEIGHT // 2, ship_y - speed)
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            ship_y = min(HEIGHT - 30, ship_y + speed)
-
-        fire_rate = 4 if rapid_fire > 0 else 10
-        if keys[pygame.K_SPACE] and shoot_cd <= 0:
-            bullets.append([ship_x, ship_y - 20, 0, -10])
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                ship_x = max(20, ship_x - speed)
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                ship_x = min(WIDTH - 20, ship_x + speed)
+            if keys[pygame.K_UP] or keys[pygame.K_w]:
+                ship_y = max(HEIGHT // 2, ship_y - speed)
+            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+                ship_y = min(HEIGHT - 30, ship_y + speed)
+
+            fire_rate = 4 if rapid_fire > 0 else 10
+            if keys[pygame.K_SPACE] and shoot_cd <= 0:
+                bullets.append([ship_x, ship_y - 20, 0, -10])
+                if rapid_fire > 0:
+                    bullets.append([ship_x - 10, ship_y - 15, -1, -9])
+                    bullets.append([ship_x + 10, ship_y - 15, 1, -9])
+                shoot_cd = fire_rate
+
+            shoot_cd -= 1
             if rapid_fire > 0:
-                bullets.append([ship_x - 10, ship_y - 15, -1, -9])
-                bullets.append([ship_x + 10, ship_y - 15, 1, -9])
-            shoot_cd = fire_rate
-
-        shoot_cd -= 1
-        if rapid_fire > 0:
-            rapid_fire -= 1
-        star_scroll += 2
-
-        if random.random() < 0.04 + score / 5000:
-            mx = random.randint(20, WIDTH - 20)
-            sz = random.randint(12, 30)
-            mvy = random.uniform(2, 5 + score / 1000)
-            mvx = random.uniform(-1, 1)
-            meteors.append([float(mx), -30.0, mvx, mvy, sz, random.uniform(-3, 3)])
-
-        if random.random() < 0.003:
-            powerups.append([float(random.randint(50, WIDTH - 50)), -20.0, 2.0])
-
-        bullets = [[b[0] + b[2], b[1] + b[3], b[2], b[3]] for b in bullets if b[1] > -10]
-        meteors_new = []
-        for m in meteors:
-            m[0] += m[2]
-            m[1] += m[3]
-            if m[1] < HEIGHT + 40:
-                meteors_new.append(m)
-        meteors = meteors_new
-
-        pups_new = []
-        for p in powerups:
-            p[1] += p[2]
-            if p[1] < HEIGHT + 20:
-                if math.hypot(ship_x - p[0], ship_y - p[1]) < 25:
-                    rapid_fire = 300
-                    ps.explosion(p[0], p[1], GOLD, 15)
+                rapid_fire -= 1
+            star_scroll += 2
+
+            if random.random() < 0.04 + score / 5000:
+                mx = random.randint(20, WIDTH - 20)
+                sz = random.randint(12, 30)
+                mvy = random.uniform(2, 5 + score / 1000)
+                mvx = random.uniform(-1, 1)
+                meteors.append([float(mx), -30.0, mvx, mvy, sz, random.uniform(-3, 3)])
+
+            if random.random() < 0.003:
+                powerups.append([float(random.randint(50, WIDTH - 50)), -20.0, 2.0])
+
+            bullets = [[b[0] + b[2], b[1] + b[3], b[2], b[3]] for b in bullets if b[1] > -10]
+            meteors_new = []
+            for m in meteors:
+                m[0] += m[2]
+                m[1] += m[3]
+                if m[1] < HEIGHT + 40:
+                    meteors_new.append(m)
+            meteors = meteors_new
+
+            pups_new = []
+            for p in powerups:
+                p[1] += p[2]
+                if p[1] < HEIGHT + 20:
+                    if math.hypot(ship_x - p[0], ship_y - p[1]) < 25:
+                        rapid_fire = 300
+                        ps.explosion(p[0], p[1], GOLD, 15)
+                    else:
+                        pups_new.append(p)
+            powerups = pups_new
+
+            grid.rebuild([(m[0] - m[4], m[1] - m[4], m[0] + m[4], m[1] + m[4]) for m in meteors])
+            dead = [False] * len(meteors)
+            live_bullets = []
+            for b in bullets:
+                for i in grid.query_circle(b[0], b[1], 4):
+                    m = meteors[i]
+                    if not dead[i] and math.hypot(b[0] - m[0], b[1] - m[1]) < m[4] + 4:
+                        ps.explosion(m[0], m[1], ORANGE, 15)
+                        dead[i] = True
+                        score += 30
+                        break
                 else:
-                    pups_new.append(p)
-        powerups = pups_new
-
-        for b in bullets[:]:
-            for m in meteors[:]:
-                if math.hypot(b[0] - m[0], b[1] - m[1]) < m[4] + 4:
-                    ps.explosion(m[0], m[1], ORANGE, 15)
-                    if b in bullets:
-                        bullets.remove(b)
-                    meteors.remove(m)
-                    score += 30
+                    live_bullets.append(b)
+
+            hit = False
+            for i in grid.query_circle(ship_x, ship_y, 15):
+                m = meteors[i]
+                if not dead[i] and math.hypot(ship_x - m[0], ship_y - m[1]) < m[4] + 15:
+                    hit = True
                     break
+            if len(live_bullets) < len(bullets):
+                bullets = live_bullets
+                meteors = [m for m, d in zip(meteors, dead) if not d]
 
-        hit = False
-        for m in meteors:
-            if math.hypot(ship_x - m[0], ship_y - m[1]) < m[4] + 15:
-                hit = True
+            if hit:
+                ps.explosion(ship_x, ship_y, CYAN, 60)
+                if not game_over_screen(screen, score, ps):
+                    return
+                ship_x, ship_y = float(WIDTH // 2), float(HEIGHT - 70)
+                bullets.clear()
+                meteors.clear()
+                powerups.clear()
+                score = 0
+                rapid_fire = 0
+                continue
 
-        if hit:
-            ps.explosion(ship_x, ship_y, CYAN, 60)
-            if not game_over_screen(screen, score, ps):
-                return
-            ship_x, ship_y = float(WIDTH // 2), float(HEIGHT - 70)
-            bullets.clear()
-            meteors.clear()
-            powerups.clear()
-            score = 0
-            rapid_fire = 0
-            continue
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill((8, 8, 18))
         draw_stars(screen, BG_STARS, star_scroll)
@@ -1589,22 +2152,19 @@ def run_meteor(screen):
             pygame.draw.circle(screen, GOLD, (int(p[0]), int(p[1])), 8)
             draw_text(screen, "R", 12, BLACK, int(p[0]), int(p[1]))
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"METEOR STORM  Score: {score}")
         if rapid_fire > 0:
             draw_text(screen, f"RAPID FIRE: {rapid_fire // 60 + 1}s", 18, GOLD, WIDTH // 2, 50)
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "WASD + SPACE shoot", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  10. PLATFORM JUMPER  (FIX: world-space coords, camera only for drawing)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_platformer(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -1636,82 +2196,86 @@ def run_platformer(screen):
             coins.append([plat[0] + plat[2] // 2, plat[1] - 25, False])
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return
+                    if (event.key == pygame.K_SPACE or event.key == pygame.K_w or event.key == pygame.K_UP) and jumps_left > 0:
+                        pvy = jump_power
+                        jumps_left -= 1
+                        on_ground = False
+                        # Different particles for 2nd jump
+                        p_color = CYAN if jumps_left == 0 else WHITE
+                        ps.emit(px, py_w + camera_y + player_h, p_color, 5,
+                                vx=random.uniform(-2, 2), vy=random.uniform(1, 3),
+                                life=10, size=2, gravity=0.1)
+
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                pvx = max(-6, pvx - 0.8)
+            elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                pvx = min(6, pvx + 0.8)
+            else:
+                pvx *= 0.85
+
+            pvy += gravity
+            px += pvx
+            py_w += pvy
+
+            if px < 0:
+                px = 0
+            if px > WIDTH - player_w:
+                px = WIDTH - player_w
+
+            # Collision in world space
+            on_ground = False
+            for plat in platforms:
+                plat_x, plat_y, plat_w, plat_h = plat
+                if (pvy >= 0 and
+                    px + player_w > plat_x and px < plat_x + plat_w and
+                    py_w + player_h >= plat_y and py_w + player_h <= plat_y + plat_h + 8):
+                    py_w = plat_y - player_h
+                    pvy = 0
+                    on_ground = True
+                    jumps_left = max_jumps  # reset double jump
+
+            if py_w < highest_y:
+                highest_y = py_w
+                score = max(score, int((HEIGHT - 100 - highest_y) // 10))
+
+            # Camera follows player (smooth)
+            target_cam = -(py_w - HEIGHT // 3)
+            camera_y += (target_cam - camera_y) * 0.1
+
+            # Collect coins (world space)
+            for coin in coins:
+                if not coin[2]:
+                    if math.hypot(px + player_w // 2 - coin[0], py_w + player_h // 2 - coin[1]) < 25:
+                        coin[2] = True
+                        score += 50
+                        ps.sparkle(coin[0], coin[1] + camera_y, GOLD, 10)
+
+            # Death check — forgiving threshold
+            if py_w > highest_y + HEIGHT + 400:
+                if not game_over_screen(screen, score, ps):
                     return
-                if (event.key == pygame.K_SPACE or event.key == pygame.K_w or event.key == pygame.K_UP) and jumps_left > 0:
-                    pvy = jump_power
-                    jumps_left -= 1
-                    on_ground = False
-                    # Different particles for 2nd jump
-                    p_color = CYAN if jumps_left == 0 else WHITE
-                    ps.emit(px, py_w + camera_y + player_h, p_color, 5,
-                            vx=random.uniform(-2, 2), vy=random.uniform(1, 3),
-                            life=10, size=2, gravity=0.1)
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            pvx = max(-6, pvx - 0.8)
-        elif keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            pvx = min(6, pvx + 0.8)
-        else:
-            pvx *= 0.85
-
-        pvy += gravity
-        px += pvx
-        py_w += pvy
-
-        if px < 0:
-            px = 0
-        if px > WIDTH - player_w:
-            px = WIDTH - player_w
+                px = float(WIDTH // 2)
+                py_w = float(HEIGHT - 100)
+                pvx, pvy = 0.0, 0.0
+                camera_y = 0.0
+                highest_y = py_w
+                score = 0
+                jumps_left = max_jumps
+                for c in coins:
+                    c[2] = False
+                continue
 
-        # Collision in world space
-        on_ground = False
-        for plat in platforms:
-            plat_x, plat_y, plat_w, plat_h = plat
-            if (pvy >= 0 and
-                px + player_w > plat_x and px < plat_x + plat_w and
-                py_w + player_h >= plat_y and py_w + player_h <= plat_y + plat_h + 8):
-                py_w = plat_y - player_h
-                pvy = 0
-                on_ground = True
-                jumps_left = max_jumps  # reset double jump
-
-        if py_w < highest_y:
-            highest_y = py_w
-            score = max(score, int((HEIGHT - 100 - highest_y) // 10))
-
-        # Camera follows player (smooth)
-        target_cam = -(py_w - HEIGHT // 3)
-        camera_y += (target_cam - camera_y) * 0.1
-
-        # Collect coins (world space)
-        for coin in coins:
-            if not coin[2]:
-                if math.hypot(px + player_w // 2 - coin[0], py_w + player_h // 2 - coin[1]) < 25:
-                    coin[2] = True
-                    score += 50
-                    ps.sparkle(coin[0], coin[1] + camera_y, GOLD, 10)
-
-        # Death check — forgiving threshold
-        if py_w > highest_y + HEIGHT + 400:
-            if not game_over_screen(screen, score, ps):
-                return
-            px = float(WIDTH // 2)
-            py_w = float(HEIGHT - 100)
-            pvx, pvy = 0.0, 0.0
-            camera_y = 0.0
-            highest_y = py_w
-            score = 0
-            jumps_left = max_jumps
-            for c in coins:
-                c[2] = False
-            continue
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill((15, 15, 30))
 
@@ -1746,24 +2310,21 @@ def run_platformer(screen):
         pygame.draw.circle(screen, BLACK, (int(px) + 19 + eye_dir, int(draw_py) + 10), 2)
         pygame.draw.arc(screen, BLACK, (int(px) + 7, int(draw_py) + 16, 12, 8), 3.14, 6.28, 2)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"PLATFORM JUMPER  Score: {score}")
         # Double jump indicator
         for ji in range(max_jumps):
             jc = NEON_GREEN if ji < jumps_left else (50, 50, 60)
             pygame.draw.circle(screen, jc, (30 + ji * 20, 50), 6)
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "A/D + SPACE (x2 jump)", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  11. TANK BATTLE  (FIX: enemy bullet direction matches facing)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_tank(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -1778,6 +2339,7 @@ def run_tank(screen):
     max_hp = 5
     player_hp = max_hp
     invincible = 0  # frames of invincibility after taking damage
+    grid = SpatialHash(64)
 
     def spawn_enemies(count):
         for _ in range(count):
@@ -1790,128 +2352,137 @@ def run_tank(screen):
     spawn_enemies(5)
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                return
-
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            t_angle += 3
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            t_angle -= 3
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            t_speed = min(3, t_speed + 0.2)
-        elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            t_speed = max(-2, t_speed - 0.2)
-        else:
-            t_speed *= 0.95
-
-        mx, my = pygame.mouse.get_pos()
-        turret_angle = math.degrees(math.atan2(mx - tx, -(my - ty)))
-
-        if (keys[pygame.K_SPACE] or pygame.mouse.get_pressed()[0]) and shoot_cd <= 0:
-            rad = math.radians(turret_angle)
-            bvx = math.sin(rad) * 8
-            bvy = -math.cos(rad) * 8
-            bullets.append([tx, ty, bvx, bvy, 80])
-            shoot_cd = 15
-
-        shoot_cd -= 1
-        rad = math.radians(t_angle)
-        tx += math.sin(rad) * -t_speed
-        ty += math.cos(rad) * -t_speed
-        tx = max(20, min(WIDTH - 20, tx))
-        ty = max(20, min(HEIGHT - 20, ty))
-
-        new_b = []
-        for b in bullets:
-            b[0] += b[2]
-            b[1] += b[3]
-            b[4] -= 1
-            if b[4] > 0 and 0 <= b[0] <= WIDTH and 0 <= b[1] <= HEIGHT:
-                new_b.append(b)
-        bullets = new_b
-
-        for e in enemies:
-            a_to_player = math.degrees(math.atan2(tx - e["x"], -(ty - e["y"])))
-            diff = (a_to_player - e["angle"] + 180) % 360 - 180
-            e["angle"] += max(-2, min(2, diff))
-            rad_e = math.radians(e["angle"])
-            e["x"] += math.sin(rad_e) * -e["speed"]
-            e["y"] += math.cos(rad_e) * -e["speed"]
-            e["x"] = max(20, min(WIDTH - 20, e["x"]))
-            e["y"] = max(20, min(HEIGHT - 20, e["y"]))
-
-            e["cd"] -= 1
-            if e["cd"] <= 0:
-                e["cd"] = random.randint(60, 120)
-                # FIX: shoot toward player, not in facing direction
-                aim_rad = math.atan2(tx - e["x"], -(ty - e["y"]))
-                ebvx = math.sin(aim_rad) * 5
-                ebvy = -math.cos(aim_rad) * 5
-                e["bullets"].append([e["x"], e["y"], ebvx, ebvy, 60])
-
-            new_eb = []
-            for eb in e["bullets"]:
-                eb[0] += eb[2]
-                eb[1] += eb[3]
-                eb[4] -= 1
-                if eb[4] > 0:
-                    new_eb.append(eb)
-            e["bullets"] = new_eb
-
-        for b in bullets[:]:
-            for e in enemies[:]:
-                if math.hypot(b[0] - e["x"], b[1] - e["y"]) < 22:
-                    e["hp"] -= 1
-                    ps.sparkle(b[0], b[1], YELLOW, 5)
-                    if b in bullets:
-                        bullets.remove(b)
-                    if e["hp"] <= 0:
-                        ps.explosion(e["x"], e["y"], ORANGE, 30)
-                        enemies.remove(e)
-                        score += 100
-                    break
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    return
 
-        if invincible > 0:
-            invincible -= 1
+            keys = INPUT.pressed()
+            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                t_angle += 3
+            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                t_angle -= 3
+            if keys[pygame.K_UP] or keys[pygame.K_w]:
+                t_speed = min(3, t_speed + 0.2)
+            elif keys[pygame.K_DOWN] or keys[pygame.K_s]:
+                t_speed = max(-2, t_speed - 0.2)
+            else:
+                t_speed *= 0.95
+
+            mx, my = INPUT.mouse_pos()
+            turret_angle = math.degrees(math.atan2(mx - tx, -(my - ty)))
+
+            if (keys[pygame.K_SPACE] or INPUT.mouse_pressed()[0]) and shoot_cd <= 0:
+                rad = math.radians(turret_angle)
+                bvx = math.sin(rad) * 8
+                bvy = -math.cos(rad) * 8
+                bullets.append([tx, ty, bvx, bvy, 80])
+                shoot_cd = 15
+
+            shoot_cd -= 1
+            rad = math.radians(t_angle)
+            tx += math.sin(rad) * -t_speed
+            ty += math.cos(rad) * -t_speed
+            tx = max(20, min(WIDTH - 20, tx))
+            ty = max(20, min(HEIGHT - 20, ty))
+
+            new_b = []
+            for b in bullets:
+                b[0] += b[2]
+                b[1] += b[3]
+                b[4] -= 1
+                if b[4] > 0 and 0 <= b[0] <= WIDTH and 0 <= b[1] <= HEIGHT:
+                    new_b.append(b)
+            bullets = new_b
 
-        if invincible == 0:
-            hit = False
             for e in enemies:
-                for eb in e["bullets"][:]:
-                    if math.hypot(eb[0] - tx, eb[1] - ty) < 18:
-                        hit = True
-                        e["bullets"].remove(eb)
+                a_to_player = math.degrees(math.atan2(tx - e["x"], -(ty - e["y"])))
+                diff = (a_to_player - e["angle"] + 180) % 360 - 180
+                e["angle"] += max(-2, min(2, diff))
+                rad_e = math.radians(e["angle"])
+                e["x"] += math.sin(rad_e) * -e["speed"]
+                e["y"] += math.cos(rad_e) * -e["speed"]
+                e["x"] = max(20, min(WIDTH - 20, e["x"]))
+                e["y"] = max(20, min(HEIGHT - 20, e["y"]))
+
+                e["cd"] -= 1
+                if e["cd"] <= 0:
+                    e["cd"] = random.randint(60, 120)
+                    # FIX: shoot toward player, not in facing direction
+                    aim_rad = math.atan2(tx - e["x"], -(ty - e["y"]))
+                    ebvx = math.sin(aim_rad) * 5
+                    ebvy = -math.cos(aim_rad) * 5
+                    e["bullets"].append([e["x"], e["y"], ebvx, ebvy, 60])
+
+                new_eb = []
+                for eb in e["bullets"]:
+                    eb[0] += eb[2]
+                    eb[1] += eb[3]
+                    eb[4] -= 1
+                    if eb[4] > 0:
+                        new_eb.append(eb)
+                e["bullets"] = new_eb
+
+            grid.rebuild([(e["x"] - 22, e["y"] - 22, e["x"] + 22, e["y"] + 22) for e in enemies])
+            live_bullets = []
+            for b in bullets:
+                for i in grid.query_circle(b[0], b[1]):
+                    e = enemies[i]
+                    if e["hp"] > 0 and math.hypot(b[0] - e["x"], b[1] - e["y"]) < 22:
+                        e["hp"] -= 1
+                        ps.sparkle(b[0], b[1], YELLOW, 5)
+                        if e["hp"] <= 0:
+                            ps.explosion(e["x"], e["y"], ORANGE, 30)
+                            score += 100
                         break
-                if math.hypot(e["x"] - tx, e["y"] - ty) < 30:
-                    hit = True
-            if hit:
-                player_hp -= 1
-                ps.explosion(tx, ty, RED, 20)
-                invincible = 60  # 1 second of invincibility
+                else:
+                    live_bullets.append(b)
+            if len(live_bullets) < len(bullets):
+                bullets = live_bullets
+                enemies[:] = [e for e in enemies if e["hp"] > 0]
+
+            if invincible > 0:
+                invincible -= 1
+
+            if invincible == 0:
+                hit = False
+                for e in enemies:
+                    for j, eb in enumerate(e["bullets"]):
+                        if math.hypot(eb[0] - tx, eb[1] - ty) < 18:
+                            hit = True
+                            del e["bullets"][j]
+                            break
+                    if math.hypot(e["x"] - tx, e["y"] - ty) < 30:
+                        hit = True
+                if hit:
+                    player_hp -= 1
+                    ps.explosion(tx, ty, RED, 20)
+                    invincible = 60  # 1 second of invincibility
 
-        if player_hp <= 0:
-            ps.explosion(tx, ty, CYAN, 60)
-            if not game_over_screen(screen, score, ps):
-                return
-            tx, ty = float(WIDTH // 2), float(HEIGHT // 2)
-            t_angle = 0.0
-            t_speed = 0.0
-            bullets.clear()
-            enemies.clear()
-            spawn_enemies(5)
-            score = 0
-            player_hp = max_hp
-            invincible = 0
-            continue
-
-        if not enemies:
-            score += 200
-            spawn_enemies(5 + score // 500)
+            if player_hp <= 0:
+                ps.explosion(tx, ty, CYAN, 60)
+                if not game_over_screen(screen, score, ps):
+                    return
+                tx, ty = float(WIDTH // 2), float(HEIGHT // 2)
+                t_angle = 0.0
+                t_speed = 0.0
+                bullets.clear()
+                enemies.clear()
+                spawn_enemies(5)
+                score = 0
+                player_hp = max_hp
+                invincible = 0
+                continue
+
+            if not enemies:
+                score += 200
+                spawn_enemies(5 + score // 500)
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill((25, 30, 20))
         for gx in range(0, WIDTH, 40):
@@ -1956,16 +2527,13 @@ def run_tank(screen):
             for eb in e["bullets"]:
                 pygame.draw.circle(screen, RED, (int(eb[0]), int(eb[1])), 3)
 
+        gbul = SPRITES.get(("circle", 14, 14, (*NEON_GREEN, 50)), _build_glow)
         for b in bullets:
             pygame.draw.circle(screen, NEON_GREEN, (int(b[0]), int(b[1])), 4)
-            gbul = pygame.Surface((14, 14), pygame.SRCALPHA)
-            pygame.draw.circle(gbul, (*NEON_GREEN, 50), (7, 7), 7)
             screen.blit(gbul, (int(b[0]) - 7, int(b[1]) - 7))
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
         draw_hud(screen, f"TANK BATTLE  Score: {score}")
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "WASD + Mouse aim + Click", ctrl_timer)
         # Player HP bar
         hp_bar_w = 160
@@ -1973,15 +2541,14 @@ def run_tank(screen):
         draw_text(screen, "HP", 16, WHITE, 40, 58)
         hp_color = NEON_GREEN if player_hp > 2 else (YELLOW if player_hp > 1 else RED)
         draw_rounded_bar(screen, 56, 52, hp_bar_w, 12, player_hp / max_hp, (30, 30, 40), hp_color, (60, 60, 70))
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  12. RHYTHM TAP  (FIX: added lives system + game over)
 # ═══════════════════════════════════════════════════════════════════════════════
 def run_rhythm(screen):
-    clock = pygame.time.Clock()
+    loop = GameLoop()
     ps = ParticleSystem()
     ctrl_timer = 3 * FPS
 
@@ -2004,73 +2571,77 @@ def run_rhythm(screen):
     lives = 10  # FIX: added lives
 
     while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    return
-                for i, k in enumerate(lane_keys):
-                    if event.key == k:
-                        closest = None
-                        closest_dist = 999
-                        for n in notes:
-                            if n[0] == i and not n[2]:
-                                dist = abs(n[1] - hit_y)
-                                if dist < closest_dist:
-                                    closest = n
-                                    closest_dist = dist
-                        if closest and closest_dist < 40:
-                            closest[2] = True
-                            if closest_dist < 15:
-                                score += 100
-                                ps.sparkle(start_x + i * lane_w + lane_w // 2, hit_y, GOLD, 8)
-                            elif closest_dist < 30:
-                                score += 50
-                                ps.sparkle(start_x + i * lane_w + lane_w // 2, hit_y, WHITE, 5)
+        for _ in loop.ticks():
+            for event in INPUT.events():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return
+                    for i, k in enumerate(lane_keys):
+                        if event.key == k:
+                            closest = None
+                            closest_dist = 999
+                            for n in notes:
+                                if n[0] == i and not n[2]:
+                                    dist = abs(n[1] - hit_y)
+                                    if dist < closest_dist:
+                                        closest = n
+                                        closest_dist = dist
+                            if closest and closest_dist < 40:
+                                closest[2] = True
+                                if closest_dist < 15:
+                                    score += 100
+                                    ps.sparkle(start_x + i * lane_w + lane_w // 2, hit_y, GOLD, 8)
+                                elif closest_dist < 30:
+                                    score += 50
+                                    ps.sparkle(start_x + i * lane_w + lane_w // 2, hit_y, WHITE, 5)
+                                else:
+                                    score += 25
+                                combo += 1
+                                max_combo = max(max_combo, combo)
                             else:
-                                score += 25
-                            combo += 1
-                            max_combo = max(max_combo, combo)
-                        else:
-                            combo = 0
-                            miss_flash = 10
-                            lives -= 1  # FIX: lose a life on wrong tap
-
-        spawn_timer += 1
-        if spawn_timer >= max(15, 35 - score // 500):
-            spawn_timer = 0
-            lane = random.randint(0, lanes - 1)
-            notes.append([lane, -20.0, False])
-
-        new_notes = []
-        for n in notes:
-            n[1] += note_speed
-            if n[1] > HEIGHT + 20:
-                if not n[2]:
-                    combo = 0
-                    miss_flash = 10
-                    lives -= 1  # FIX: lose a life on missed note
-            elif n[1] <= HEIGHT + 20:
-                new_notes.append(n)
-        notes = new_notes
-
-        # FIX: game over when lives run out
-        if lives <= 0:
-            if not game_over_screen(screen, score, ps):
-                return
-            notes.clear()
-            score = 0
-            combo = 0
-            max_combo = 0
-            spawn_timer = 0
-            lives = 10
-            miss_flash = 0
-            continue
+                                combo = 0
+                                miss_flash = 10
+                                lives -= 1  # FIX: lose a life on wrong tap
+
+            spawn_timer += 1
+            if spawn_timer >= max(15, 35 - score // 500):
+                spawn_timer = 0
+                lane = random.randint(0, lanes - 1)
+                notes.append([lane, -20.0, False])
+
+            new_notes = []
+            for n in notes:
+                n[1] += note_speed
+                if n[1] > HEIGHT + 20:
+                    if not n[2]:
+                        combo = 0
+                        miss_flash = 10
+                        lives -= 1  # FIX: lose a life on missed note
+                elif n[1] <= HEIGHT + 20:
+                    new_notes.append(n)
+            notes = new_notes
+
+            # FIX: game over when lives run out
+            if lives <= 0:
+                if not game_over_screen(screen, score, ps):
+                    return
+                notes.clear()
+                score = 0
+                combo = 0
+                max_combo = 0
+                spawn_timer = 0
+                lives = 10
+                miss_flash = 0
+                continue
 
-        if miss_flash > 0:
-            miss_flash -= 1
+            if miss_flash > 0:
+                miss_flash -= 1
+
+            ps.update()
+            ctrl_timer = max(0, ctrl_timer - 1)
 
         screen.fill((15, 10, 25))
 
@@ -2088,7 +2659,7 @@ def run_rhythm(screen):
 
         for i in range(lanes):
             lx = start_x + i * lane_w + lane_w // 2
-            keys_pressed = pygame.key.get_pressed()
+            keys_pressed = INPUT.pressed()
             if keys_pressed[lane_keys[i]]:
                 glow = pygame.Surface((lane_w, 30), pygame.SRCALPHA)
                 pygame.draw.rect(glow, (*lane_colors[i], 60), (0, 0, lane_w, 30), border_radius=8)
@@ -2105,18 +2676,15 @@ def run_rhythm(screen):
                 screen.blit(glow_n, (start_x + n[0] * lane_w + 5, int(n[1]) - 15))
                 pygame.draw.rect(screen, c, (start_x + n[0] * lane_w + 10, int(n[1]) - 10, lane_w - 20, 20), border_radius=8)
 
-        ps.update()
-        ps.draw(screen)
+        ps.draw(screen, loop.alpha)
 
         draw_hud(screen, f"Score: {score}   Lives: {lives}")
         if combo > 2:
             c = rainbow_color(0)
             draw_text_shadow(screen, f"COMBO x{combo}", 32, c, WIDTH // 2, 60)
         draw_text(screen, f"Best Combo: {max_combo}", 18, LIGHT_GRAY, WIDTH // 2, HEIGHT - 20)
-        ctrl_timer = max(0, ctrl_timer - 1)
         draw_controls_hint(screen, "D F J K", ctrl_timer)
-        pygame.display.flip()
-        clock.tick(FPS)
+        loop.present()
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -2202,6 +2770,11 @@ def intro_screen(screen):
     ps = ParticleSystem()
     start_time = pygame.time.get_ticks()
     duration = 3000
+    # Rendered once and faded with set_alpha instead of re-rendered each frame.
+    title_text = TEXT_CACHE.font("consolas", 72).render("MINI GAMES", True, NEON_BLUE)
+    arcade_text = TEXT_CACHE.font("consolas", 56).render("ARCADE", True, NEON_PINK)
+    by_text = TEXT_CACHE.font("consolas", 28).render(f"by {CREATOR}", True, GOLD)
+    logo_y = HEIGHT // 2 - 150
 
     while pygame.time.get_ticks() - start_time < duration:
         for event in pygame.event.get():
@@ -2221,27 +2794,17 @@ def intro_screen(screen):
         ps.draw(screen)
 
         alpha = min(255, int(t * 3 * 255))
-        logo_surf = pygame.Surface((WIDTH, 200), pygame.SRCALPHA)
-
         if t > 0.15:
-            font_big = pygame.font.SysFont("consolas", 72, bold=True)
-            title_text = font_big.render("MINI GAMES", True, (*NEON_BLUE, alpha))
-            logo_surf.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 20))
+            title_text.set_alpha(alpha)
+            screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, logo_y + 20))
 
         if t > 0.35:
-            font_med = pygame.font.SysFont("consolas", 56, bold=True)
-            arcade_text = font_med.render("ARCADE", True, (*NEON_PINK, alpha))
-            logo_surf.blit(arcade_text, (WIDTH // 2 - arcade_text.get_width() // 2, 95))
-
-        screen.blit(logo_surf, (0, HEIGHT // 2 - 150))
+            arcade_text.set_alpha(alpha)
+            screen.blit(arcade_text, (WIDTH // 2 - arcade_text.get_width() // 2, logo_y + 95))
 
         if t > 0.55:
-            alpha2 = min(255, int((t - 0.55) * 4 * 255))
-            creator_surf = pygame.Surface((400, 50), pygame.SRCALPHA)
-            font_cr = pygame.font.SysFont("consolas", 28, bold=True)
-            by_text = font_cr.render(f"by {CREATOR}", True, (*GOLD, alpha2))
-            creator_surf.blit(by_text, (200 - by_text.get_width() // 2, 10))
-            screen.blit(creator_surf, (WIDTH // 2 - 200, HEIGHT // 2 + 30))
+            by_text.set_alpha(min(255, int((t - 0.55) * 4 * 255)))
+            screen.blit(by_text, (WIDTH // 2 - by_text.get_width() // 2, HEIGHT // 2 + 40))
 
         if t > 0.75:
             pulse = int(abs(math.sin(pygame.time.get_ticks() * 0.005)) * 100) + 100
@@ -2256,6 +2819,78 @@ def intro_screen(screen):
         clock.tick(FPS)
 
 
+TILE_MARGIN = 12     # room around a menu tile for its hover growth and glow
+TITLE_HUES = 48      # rainbow steps the menu title cycles through
+MENU_IDLE_MS = 5000  # menu drops to MENU_IDLE_FPS after this long without input
+MENU_IDLE_FPS = 15
+
+
+def _build_menu_chrome(key):
+    """Everything static on the main menu, for one theme, as one opaque layer."""
+    _, _, theme_y = key
+    layer = pygame.Surface((WIDTH, HEIGHT))
+    layer.fill(theme["bg"])
+    draw_stars(layer, BG_STARS)
+    draw_panel(layer, (WIDTH // 2 - 180, 88, 360, 28), theme["panel"], None, 150, 14)
+    draw_text(layer, "Click a game to play  |  ESC to quit", 16, theme["text"], WIDTH // 2, 102)
+    draw_text(layer, "THEME", 13, (100, 100, 120), WIDTH // 2, theme_y - 12)
+    draw_panel(layer, (WIDTH // 2 - 130, HEIGHT - 48, 260, 32), theme["panel"], None, 140, 12)
+    draw_text(layer, f"Created by {CREATOR}", 18, theme["gold"], WIDTH // 2, HEIGHT - 32)
+    return layer.convert()
+
+
+def _build_title_glyph(key):
+    """One letter of the menu title: key is (char, hue step), hue None for the shadow."""
+    ch, hue = key
+    if hue is None:
+        color = BLACK
+    else:
+        r, g, b = colorsys.hsv_to_rgb(hue / TITLE_HUES, 0.9, 1.0)
+        color = (int(r * 255), int(g * 255), int(b * 255))
+    return TEXT_CACHE.font(None, 48).render(ch, True, color)
+
+
+def _build_menu_tile(key):
+    """A game tile at one hover step (0-10), glow margin included."""
+    name, color, w, h, step = key
+    hs = step / 10
+    tile = pygame.Surface((w + TILE_MARGIN * 2, h + TILE_MARGIN * 2), pygame.SRCALPHA)
+    expand = int(hs * 4)
+    draw_rect = pygame.Rect(TILE_MARGIN, TILE_MARGIN, w, h).inflate(expand * 2, expand * 2)
+
+    bg_alpha = int(40 + hs * 40)
+    pygame.draw.rect(tile, (50, 50, 70, bg_alpha + 50), draw_rect, border_radius=16)
+    border_c = tuple(int(c * (0.4 + hs * 0.6)) for c in color)
+    pygame.draw.rect(tile, border_c, draw_rect, 2, border_radius=16)
+    if hs > 0:
+        glow = pygame.Surface((draw_rect.width + 16, draw_rect.height + 16), pygame.SRCALPHA)
+        pygame.draw.rect(glow, (*color, int(20 * hs)), (0, 0, glow.get_width(), glow.get_height()), border_radius=20)
+        tile.blit(glow, (draw_rect.x - 8, draw_rect.y - 8))
+
+    draw_game_icon(tile, name, draw_rect.centerx, draw_rect.centery - 18, color)
+    text_color = WHITE if hs > 0.3 else LIGHT_GRAY
+    draw_text(tile, name, 16, text_color, draw_rect.centerx, draw_rect.bottom - 22)
+    return tile.convert_alpha()
+
+
+def _build_theme_pill(key):
+    """A theme selector pill with its colour dots underneath, at one hover step."""
+    tn, is_active, w, h, step = key
+    th = step / 10
+    tc = THEMES[tn]
+    pill = pygame.Surface((w, h + 10), pygame.SRCALPHA)
+    if is_active:
+        pygame.draw.rect(pill, (*tc["accent1"], 180), (0, 0, w, h), border_radius=15)
+    else:
+        pygame.draw.rect(pill, (*tc["panel"], int(120 + th * 60)), (0, 0, w, h), border_radius=15)
+        pygame.draw.rect(pill, (*tc["accent1"], int(80 + th * 80)), (0, 0, w, h), 2, border_radius=15)
+    txt_c = WHITE if is_active else tuple(int(c * (0.6 + th * 0.4)) for c in tc["accent1"])
+    draw_text(pill, tn, 14, txt_c, w // 2, h // 2)
+    for di, dk in enumerate(["accent1", "accent2", "gold"]):
+        pygame.draw.circle(pill, tc[dk], (w // 2 - 10 + di * 10, h + 6), 3)
+    return pill
+
+
 def main_menu(screen):
     clock = pygame.time.Clock()
     ps = ParticleSystem()
@@ -2290,9 +2925,24 @@ def main_menu(screen):
         theme_pills.append((pygame.Rect(tx, theme_y, theme_pill_w, theme_pill_h), tn))
     theme_hover = [0.0] * len(theme_pills)
 
+    title = "MINI GAMES ARCADE"
+    title_w = TEXT_CACHE.font("consolas", 48).size(title)[0]
+    char_w = title_w / len(title)
+    title_start_x = WIDTH // 2 - title_w // 2
+
+    title_band = pygame.Rect(title_start_x - 12, 12, title_w + 24, 80)
+
+    base = pygame.Surface((WIDTH, HEIGHT)).convert()
+    base_key = None
+    screen_dirty = True  # next frame redraws and flips the whole window
+    drawn = []           # rects drawn over base last frame
+    fade = None          # Fade in from black after a game, drawn over the menu
+    last_input = pygame.time.get_ticks()
+
     while True:
         mx, my = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in INPUT.events():
+            last_input = pygame.time.get_ticks()
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -2304,106 +2954,83 @@ def main_menu(screen):
                     if rect.collidepoint(mx, my):
                         screen_transition(screen, "out", speed=20)
                         func(screen)
-                        screen_transition(screen, "in", speed=20)
+                        fade = Fade("in", frames=13)
+                        screen_dirty = True
                 for pill_rect, tn in theme_pills:
                     if pill_rect.collidepoint(mx, my):
                         set_theme(tn)
 
-        screen.fill(theme["bg"])
-        draw_stars(screen, BG_STARS)
-
-        if random.random() < 0.1:
-            ps.particles.append(Particle(
-                random.randint(0, WIDTH), HEIGHT + 10,
-                rainbow_color(random.random()),
-                vx=random.uniform(-0.5, 0.5), vy=random.uniform(-2, -0.5),
-                life=random.randint(40, 80), size=random.randint(1, 3), glow=True
-            ))
-
-        ps.update()
-
-        # FIX: title centered using font measurement instead of manual char positioning
-        title = "MINI GAMES ARCADE"
-        t = pygame.time.get_ticks()
-        font_title = pygame.font.SysFont("consolas", 48, bold=True)
-        title_w = font_title.size(title)[0]
-        char_w = title_w / len(title)
-        title_start_x = WIDTH // 2 - title_w // 2
-
-        for i, ch in enumerate(title):
-            wave = math.sin(t * 0.003 + i * 0.35) * 8
-            c = rainbow_color(i * 0.06)
-            cx = int(title_start_x + i * char_w + char_w // 2)
-            draw_text(screen, ch, 48, (0, 0, 0), cx + 2, 52 + wave)
-            draw_text(screen, ch, 48, c, cx, 50 + wave)
-
-        draw_panel(screen, (WIDTH // 2 - 180, 88, 360, 28), theme["panel"], None, 150, 14)
-        draw_text(screen, "Click a game to play  |  ESC to quit", 16, theme["text"], WIDTH // 2, 102)
-
+        # Hover steps pick pre-rendered tiles and pills; the static part of the
+        # menu is composed into `base` only when one of them (or the theme) changes.
         for idx, (rect, name, color, func) in enumerate(buttons):
-            hovered = rect.collidepoint(mx, my)
-            if hovered:
+            if rect.collidepoint(mx, my):
                 hover_scales[idx] = min(1.0, hover_scales[idx] + 0.1)
             else:
                 hover_scales[idx] = max(0.0, hover_scales[idx] - 0.1)
-
-            hs = hover_scales[idx]
-            expand = int(hs * 4)
-            draw_rect = rect.inflate(expand * 2, expand * 2)
-
-            bg_alpha = int(40 + hs * 40)
-            bg_surf = pygame.Surface((draw_rect.width, draw_rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(bg_surf, (50, 50, 70, bg_alpha + 50), (0, 0, draw_rect.width, draw_rect.height), border_radius=16)
-            screen.blit(bg_surf, draw_rect.topleft)
-
-            border_c = tuple(int(c * (0.4 + hs * 0.6)) for c in color)
-            pygame.draw.rect(screen, border_c, draw_rect, 2, border_radius=16)
-
-            if hs > 0:
-                glow = pygame.Surface((draw_rect.width + 16, draw_rect.height + 16), pygame.SRCALPHA)
-                pygame.draw.rect(glow, (*color, int(20 * hs)), (0, 0, glow.get_width(), glow.get_height()), border_radius=20)
-                screen.blit(glow, (draw_rect.x - 8, draw_rect.y - 8))
-
-            draw_game_icon(screen, name, draw_rect.centerx, draw_rect.centery - 18, color)
-            text_color = WHITE if hs > 0.3 else LIGHT_GRAY
-            draw_text(screen, name, 16, text_color, draw_rect.centerx, draw_rect.bottom - 22)
-
-        ps.draw(screen)
-
-        # ── Theme selector ──
-        draw_text(screen, "THEME", 13, (100, 100, 120), WIDTH // 2, theme_y - 12)
         for idx_t, (pill_rect, tn) in enumerate(theme_pills):
-            hovered_t = pill_rect.collidepoint(mx, my)
-            if hovered_t:
+            if pill_rect.collidepoint(mx, my):
                 theme_hover[idx_t] = min(1.0, theme_hover[idx_t] + 0.12)
             else:
                 theme_hover[idx_t] = max(0.0, theme_hover[idx_t] - 0.08)
-            th = theme_hover[idx_t]
-            is_active = (tn == theme_name)
-
-            pill_s = pygame.Surface((pill_rect.width, pill_rect.height), pygame.SRCALPHA)
-            tc = THEMES[tn]
-            if is_active:
-                pygame.draw.rect(pill_s, (*tc["accent1"], 180), (0, 0, pill_rect.width, pill_rect.height), border_radius=15)
-            else:
-                pygame.draw.rect(pill_s, (*tc["panel"], int(120 + th * 60)), (0, 0, pill_rect.width, pill_rect.height), border_radius=15)
-                pygame.draw.rect(pill_s, (*tc["accent1"], int(80 + th * 80)), (0, 0, pill_rect.width, pill_rect.height), 2, border_radius=15)
-            screen.blit(pill_s, pill_rect.topleft)
-
-            txt_c = WHITE if is_active else tuple(int(c * (0.6 + th * 0.4)) for c in tc["accent1"])
-            draw_text(screen, tn, 14, txt_c, pill_rect.centerx, pill_rect.centery)
+        key = (theme_name, tuple(round(h * 10) for h in hover_scales), tuple(round(h * 10) for h in theme_hover))
+        screen_dirty = screen_dirty or fade is not None
+        if key != base_key or screen_dirty:
+            base_key = key
+            screen_dirty = True
+            base.blit(MENU_SPRITES.get(("chrome", theme_name, theme_y), _build_menu_chrome), (0, 0))
+            for (rect, name, color, func), step in zip(buttons, key[1]):
+                tile = MENU_SPRITES.get((name, color, btn_w, btn_h, step), _build_menu_tile)
+                base.blit(tile, (rect.x - TILE_MARGIN, rect.y - TILE_MARGIN))
+            for (pill_rect, tn), step in zip(theme_pills, key[2]):
+                pill_key = (tn, tn == theme_name, pill_rect.width, pill_rect.height, step)
+                base.blit(MENU_SPRITES.get(pill_key, _build_theme_pill), pill_rect.topleft)
+        if screen_dirty:
+            screen.blit(base, (0, 0))
+        else:
+            # Only the title band and last frame's particles need restoring.
+            for r in drawn:
+                screen.blit(base, r, r)
 
-            # small color preview dots
-            dot_y = pill_rect.bottom + 6
-            for di, dk in enumerate(["accent1", "accent2", "gold"]):
-                dx = pill_rect.centerx - 10 + di * 10
-                pygame.draw.circle(screen, tc[dk], (dx, dot_y), 3)
+        if random.random() < 0.1:
+            ps.emit(random.randint(0, WIDTH), HEIGHT + 10, rainbow_color(random.random()), 1,
+                    vx=random.uniform(-0.5, 0.5), vy=random.uniform(-2, -0.5),
+                    life=random.randint(40, 80), size=random.randint(1, 3), glow=True)
 
-        draw_panel(screen, (WIDTH // 2 - 130, HEIGHT - 48, 260, 32), theme["panel"], None, 140, 12)
-        draw_text(screen, f"Created by {CREATOR}", 18, theme["gold"], WIDTH // 2, HEIGHT - 32)
+        ps.update()
 
-        pygame.display.flip()
-        clock.tick(FPS)
+        # FIX: title centered using font measurement instead of manual char positioning
+        t = pygame.time.get_ticks()
+        for i, ch in enumerate(title):
+            if ch == " ":
+                continue
+            wave = math.sin(t * 0.003 + i * 0.35) * 8
+            hue = int((t / 1000 + i * 0.06) % 1.0 * TITLE_HUES)
+            cx = int(title_start_x + i * char_w + char_w // 2)
+            shadow = MENU_SPRITES.get((ch, None), _build_title_glyph)
+            glyph = MENU_SPRITES.get((ch, hue), _build_title_glyph)
+            screen.blit(shadow, shadow.get_rect(center=(cx + 2, 52 + wave)))
+            screen.blit(glyph, glyph.get_rect(center=(cx, 50 + wave)))
+
+        particle_rects = ps.draw(screen, rects=True) or []
+        if fade:
+            fade.update()
+            fade.draw(screen)
+            if fade.done:
+                fade = None
+        if screen_dirty:
+            pygame.display.flip()
+            screen_dirty = False
+        else:
+            pygame.display.update(drawn + particle_rects)
+        drawn = [title_band] + particle_rects
+
+        # Nobody at the cabinet: redraw at MENU_IDLE_FPS, but wake on the first event.
+        settled = all(h in (0.0, 1.0) for h in hover_scales) and all(h in (0.0, 1.0) for h in theme_hover)
+        if settled and pygame.time.get_ticks() - last_input > MENU_IDLE_MS:
+            INPUT.wait(1000 // MENU_IDLE_FPS)
+            clock.tick()
+        else:
+            clock.tick(FPS)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -2434,10 +3061,214 @@ def make_window_icon():
         ico.set_at(pos, (255, 255, 255, 200))
     return ico
 
+def bench_particles(screen, count=10000, frames=600):
+    """Stress test: keep `count` particles alive and time update + draw."""
+    ps = ParticleSystem(max(PARTICLE_CAPACITY, count))
+    colors = [NEON_BLUE, NEON_PINK, GOLD, NEON_GREEN, CYAN]
+    update_t, draw_t = [], []
+    for frame in range(frames):
+        pygame.event.pump()
+        while len(ps) < count:
+            ps.explosion(random.randint(50, WIDTH - 50), random.randint(50, HEIGHT - 50),
+                         random.choice(colors), min(60, count - len(ps)))
+        t0 = time.perf_counter()
+        ps.update()
+        t1 = time.perf_counter()
+        screen.fill(theme["bg"])
+        ps.draw(screen)
+        t2 = time.perf_counter()
+        update_t.append(t1 - t0)
+        draw_t.append(t2 - t1)
+        pygame.display.flip()
+    frame_t = sorted(u + d for u, d in zip(update_t, draw_t))
+    avg = sum(frame_t) / frames
+    p99 = frame_t[int(frames * 0.99) - 1]
+    backend = "numpy" if np is not None else "array"
+    print(f"particles={count} frames={frames} backend={backend}")
+    print(f"update avg {sum(update_t) / frames * 1000:.2f} ms  draw avg {sum(draw_t) / frames * 1000:.2f} ms")
+    print(f"frame avg {avg * 1000:.2f} ms  p99 {p99 * 1000:.2f} ms  (~{1 / avg:.0f} FPS, budget {1000 / FPS:.1f} ms)")
+
+
+class FrameTimer:
+    """FRAME_HOOK for headless runs: records per-frame timings, stops after `frames`."""
+    def __init__(self, source, frames=0):
+        self.source = source
+        self.frames = frames
+        self.ticks = 0
+        self.sim = []
+        self.render = []
+
+    def __call__(self, ticks, sim, render):
+        self.ticks += ticks
+        self.sim.append(sim)
+        self.render.append(render)
+        if self.frames and len(self.sim) >= self.frames:
+            self.source.quit = True
+
+    def summary(self):
+        def ms(values, q=None):
+            if not values:
+                return 0.0
+            if q is None:
+                return sum(values) / len(values) * 1000
+            return sorted(values)[min(len(values) - 1, int(len(values) * q))] * 1000
+        return {"frames": len(self.sim), "ticks": self.ticks,
+                "sim_avg_ms": ms(self.sim), "sim_p99_ms": ms(self.sim, 0.99),
+                "sim_max_ms": max(self.sim, default=0.0) * 1000,
+                "render_avg_ms": ms(self.render), "render_p99_ms": ms(self.render, 0.99)}
+
+
+def find_game(name):
+    """Look up a GAMES entry by 1-based number or part of its name ("tank", "flappy")."""
+    if str(name).isdigit() and 1 <= int(name) <= len(GAMES):
+        return GAMES[int(name) - 1]
+    key = str(name).lower().replace(" ", "")
+    for entry in GAMES:
+        if key in entry[0].lower().replace(" ", ""):
+            return entry
+    raise KeyError(f"no game called {name!r}")
+
+
+def run_headless(screen, name, frames=600, seed=0, script=None, render_every=1):
+    """Play one game with synthetic input as fast as possible and time each frame.
+
+    Input comes from a ScriptedInput file or, without one, a RandomInput with
+    the same seed; random and NumPy RNGs are seeded too, so a run is
+    reproducible. Simulation runs render_every ticks per drawn frame. After
+    `frames` frames (0 = no cap) ESC is pressed to leave the game.
+    """
+    global INPUT, FRAME_HOOK, TIME_SCALE, MAX_TICKS
+    title, _, run = find_game(name)
+    random.seed(seed)
+    if np is not None:
+        np.random.seed(seed)
+    source = ScriptedInput.load(script) if script else RandomInput(seed)
+    timer = FrameTimer(source, frames)
+    saved = INPUT, FRAME_HOOK, TIME_SCALE, MAX_TICKS
+    INPUT, FRAME_HOOK, TIME_SCALE, MAX_TICKS = source, timer, 0, render_every
+    try:
+        run(screen)
+    finally:
+        INPUT, FRAME_HOOK, TIME_SCALE, MAX_TICKS = saved
+    return dict(game=title, **timer.summary())
+
+
+def headless_report(screen, names, frames=600, seed=0, script=None, render_every=1):
+    """Run each game headless and print a timing table (sim max includes end screens)."""
+    print(f"{'game':15} {'frames':>6} {'ticks':>6} {'sim avg':>8} {'sim p99':>8} {'sim max':>8} "
+          f"{'draw avg':>9} {'draw p99':>9}  (ms)")
+    for name in names:
+        r = run_headless(screen, name, frames, seed, script, render_every)
+        print(f"{r['game']:15} {r['frames']:>6} {r['ticks']:>6} {r['sim_avg_ms']:>8.2f} {r['sim_p99_ms']:>8.2f} "
+              f"{r['sim_max_ms']:>8.2f} {r['render_avg_ms']:>9.2f} {r['render_p99_ms']:>9.2f}")
+
+
+def _collide_brute(bullets, rocks):
+    """The original nested-loop pass: first rock hit by each bullet, list.remove both."""
+    bullets, rocks = bullets[:], rocks[:]
+    hits = 0
+    for b in bullets[:]:
+        for r in rocks[:]:
+            if math.hypot(b[0] - r[0], b[1] - r[1]) < r[2]:
+                bullets.remove(b)
+                rocks.remove(r)
+                hits += 1
+                break
+    return hits
+
+
+def _collide_grid(grid, bullets, rocks):
+    """The same pass through a SpatialHash with mark-and-sweep."""
+    grid.rebuild([(x - r, y - r, x + r, y + r) for x, y, r in rocks])
+    dead = [False] * len(rocks)
+    hits = 0
+    for bx, by in bullets:
+        for i in grid.query_circle(bx, by):
+            x, y, r = rocks[i]
+            if not dead[i] and math.hypot(bx - x, by - y) < r:
+                dead[i] = True
+                hits += 1
+                break
+    rocks = [r for r, d in zip(rocks, dead) if not d]  # the sweep, as in the games
+    return hits
+
+
+def bench_collisions(counts=(50, 200, 500, 1000), frames=60):
+    """Time bullet-vs-rock collision passes: brute force vs the spatial hash."""
+    grid = SpatialHash(64)
+    rng = random.Random(1)
+    print(f"{'entities':>8} {'brute ms':>9} {'grid ms':>8} {'speedup':>8}  hits/frame")
+    for n in counts:
+        brute_t = grid_t = 0.0
+        total = 0
+        for _ in range(frames):
+            rocks = [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), rng.choice((14, 28, 42)))
+                     for _ in range(n)]
+            bullets = [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(n // 2)]
+            t0 = time.perf_counter()
+            a = _collide_brute(bullets, rocks)
+            t1 = time.perf_counter()
+            b = _collide_grid(grid, bullets, rocks)
+            t2 = time.perf_counter()
+            if a != b:
+                raise AssertionError(f"hit count mismatch: brute {a}, grid {b}")
+            brute_t += t1 - t0
+            grid_t += t2 - t1
+            total += a
+        print(f"{n:>8} {brute_t / frames * 1000:>9.2f} {grid_t / frames * 1000:>8.2f} "
+              f"{brute_t / grid_t:>7.1f}x  {total / frames:.1f}")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mini Games Arcade")
+    parser.add_argument("--bench-particles", type=int, nargs="?", const=10000, metavar="N",
+                        help="run the particle stress benchmark with N live particles and exit")
+    parser.add_argument("--bench-collisions", action="store_true",
+                        help="compare brute-force and spatial-hash collision passes and exit")
+    parser.add_argument("--fps", type=int, default=FPS, metavar="N",
+                        help=f"render frame cap (default {FPS}, 0 = uncapped); the simulation always ticks at {FPS} Hz")
+    parser.add_argument("--speed", type=float, default=1.0, metavar="X",
+                        help="simulation speed vs real time (default 1, 0 = as fast as possible)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write per-frame phase timings to FILE (.csv or .jsonl); F3 shows them in game")
+    parser.add_argument("--headless", nargs="+", metavar="GAME",
+                        help='run games (number, name prefix or "all") without a window and report frame times')
+    parser.add_argument("--frames", type=int, default=600, metavar="N",
+                        help="headless: frames per game (default 600, 0 = until the script presses ESC)")
+    parser.add_argument("--seed", type=int, default=0, help="headless: RNG and random-input seed")
+    parser.add_argument("--script", metavar="FILE",
+                        help='headless: scripted input, one "TICK ACTION ARGS" per line (down/up/tap KEY, move/click X Y)')
+    parser.add_argument("--render-every", type=int, default=1, metavar="N",
+                        help="headless: simulation ticks per drawn frame")
+    args = parser.parse_args()
+    RENDER_FPS = args.fps
+    TIME_SCALE = args.speed
+    if args.bench_collisions:
+        bench_collisions()
+        sys.exit()
+    if args.headless:
+        names = [g[0] for g in GAMES] if args.headless == ["all"] else args.headless
+        for name in names:
+            try:
+                find_game(name)
+            except KeyError as e:
+                parser.error(e.args[0])
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_icon(make_window_icon())
     pygame.display.set_caption(f"Mini Games Arcade - by {CREATOR}")
+    if args.profile:
+        PROFILER.open(args.profile)
+    if args.headless:
+        headless_report(screen, names, args.frames, args.seed, args.script, args.render_every)
+        pygame.quit()
+        sys.exit()
+    if args.bench_particles:
+        bench_particles(screen, args.bench_particles)
+        pygame.quit()
+        sys.exit()
     intro_screen(screen)
     main_menu(screen)
@@ -4,20 +4,37 @@ import random
 import math
 import json
 import os
-import array
+import time
+import argparse
+import threading
+import atexit
 from collections import deque
+from itertools import islice
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "shared"))  # starfield.py, particles.py, profiler.py
+import snake_sound
+from snake_sound import LazySound
+from starfield import Starfield
+from particles import ParticleEngine, SpriteCache, blit_sprites
+from profiler import FrameProfiler
+from snake_core import (COLS, ROWS, MODES, EAT, LEVEL, BONUS, POWERUP, DIE, SnakeSim,
+                        ReplayWriter, ReplayReader, verify_replay, prune_replays)
+
+try: import numpy as np
+except ImportError: np=None  # particles fall back to plain lists and array('d') columns
 
 pygame.init()
 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
 
 # ── CONSTANTS ─────────────────────────────────────────────────────────────
 CELL = 26
-COLS, ROWS = 28, 23
 SIDEBAR_W = 230
 FIELD_W, FIELD_H = COLS * CELL, ROWS * CELL
 WIDTH, HEIGHT = FIELD_W + SIDEBAR_W, FIELD_H
 FPS = 60
 SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "savedata.json")
+REPLAY_DIR = os.path.join(os.path.dirname(SAVE_FILE), "replays")
+REPLAY_KEEP = 50      # newest recorded runs kept in REPLAY_DIR
+RECORD = True         # --no-record turns this off
 
 # ── 10 THEMES ─────────────────────────────────────────────────────────────
 def T(name, bg, grid, sh, sb, so, food, fs, bonus, wall, sbg, sbrd, txt, acc, dng, gold, silver, parts):
@@ -74,49 +91,84 @@ font_xl    = _pick_font(_body_fonts, 52, bold=True)
 font_title = _pick_font(_body_fonts, 46, bold=True)
 font_score = _pick_font(_mono_fonts, 34, bold=True)
 font_hud   = _pick_font(_mono_fonts, 22)
+font_prof  = _pick_font(_mono_fonts, 13)   # F3 profiler overlay
 
 # ── SOUNDS ────────────────────────────────────────────────────────────────
-def _gen(freq, ms, vol=0.3, wave="square"):
-    sr = 44100; n = int(sr*ms/1000); buf = array.array('h'); amp = int(32767*vol)
-    for i in range(n):
-        t = i/sr
-        if wave == "square": v = amp if math.sin(2*math.pi*freq*t) >= 0 else -amp
-        elif wave == "sine":  v = int(amp*math.sin(2*math.pi*freq*t))
-        elif wave == "saw":   v = int(amp*(2*(freq*t%1)-1))
-        else: v = 0
-        v = int(v * min(1.0, (n-i)/(sr*0.05)))
-        buf.append(v); buf.append(v)
-    return pygame.mixer.Sound(buffer=buf)
-
-snd_eat=_gen(600,80,0.2,"square"); snd_bonus=_gen(880,120,0.25,"sine")
-snd_die=_gen(150,400,0.3,"saw");   snd_levelup=_gen(700,200,0.2,"sine")
-snd_select=_gen(500,60,0.15,"square"); snd_powerup=_gen(1000,150,0.2,"sine")
-snd_theme=_gen(440,100,0.12,"sine")
+# Synthesized on first play and cached on disk; see snake_sound.py.
+snake_sound.CACHE_DIR=os.path.join(os.path.dirname(SAVE_FILE),"sound_cache")
+snd_eat=LazySound(600,80,0.2,"square"); snd_bonus=LazySound(880,120,0.25,"sine")
+snd_die=LazySound(150,400,0.3,"saw");   snd_levelup=LazySound(700,200,0.2,"sine")
+snd_select=LazySound(500,60,0.15,"square"); snd_powerup=LazySound(1000,150,0.2,"sine")
+snd_theme=LazySound(440,100,0.12,"sine")
 
 # ── SAVE / LOAD ───────────────────────────────────────────────────────────
-def load_data():
-    if os.path.exists(SAVE_FILE):
+class SaveStore:
+    """savedata.json kept in memory and written by a background thread.
+
+    set() and add_score() only touch memory and wake the writer, which waits
+    `delay` seconds so bursts (holding T) coalesce into one atomic write
+    (temp file + os.replace). Every score is also appended to a JSON-lines
+    history log; savedata.json keeps only the top `top_n` per mode.
+    """
+    def __init__(self,path,log_path=None,top_n=10,delay=0.5):
+        self.path=path; self.log_path=log_path; self.top_n=top_n; self.delay=delay
+        self.data={"scores":{m:[] for m in MODES},"theme":0}; self.error=None
         try:
-            with open(SAVE_FILE,"r") as f: return json.load(f)
-        except: pass
-    return {"scores":{"classic":[],"walls":[],"speed":[]},"theme":0}
-
-def save_data(d):
-    try:
-        with open(SAVE_FILE,"w") as f: json.dump(d,f)
-    except: pass
-
-def add_score(mode,score):
-    d=load_data()
-    if mode not in d["scores"]: d["scores"][mode]=[]
-    d["scores"][mode].append(score)
-    d["scores"][mode]=sorted(d["scores"][mode],reverse=True)[:10]
-    save_data(d)
-
-def save_theme(idx):
-    d=load_data(); d["theme"]=idx; save_data(d)
-
-_saved=load_data(); set_theme(_saved.get("theme",0))
+            with open(path,"r") as f: self.data.update(json.load(f))
+        except FileNotFoundError: pass
+        except (OSError,ValueError) as e: self._report(e)
+        self.lock=threading.Lock(); self.wake=threading.Event(); self.dirty=False; self.log_lines=[]
+        self.closed=False; self.thread=threading.Thread(target=self._run,name="save-store",daemon=True)
+        self.thread.start()
+
+    def get(self,key,default=None):
+        with self.lock: return self.data.get(key,default)
+
+    def set(self,key,value):
+        with self.lock: self.data[key]=value; self.dirty=True
+        self.wake.set()
+
+    def scores(self,mode):
+        with self.lock: return list(self.data["scores"].get(mode,[]))
+
+    def add_score(self,mode,score,**info):
+        rec={"time":int(time.time()),"mode":mode,"score":score,**info}
+        with self.lock:
+            board=self.data["scores"].setdefault(mode,[])
+            board.append(score); board.sort(reverse=True); del board[self.top_n:]
+            self.dirty=True; self.log_lines.append(json.dumps(rec)+"\n")
+        self.wake.set()
+
+    def _report(self,e):
+        self.error=e; print(f"savedata: {e}",file=sys.stderr)
+
+    def _write(self):
+        with self.lock:
+            snap=json.dumps(self.data) if self.dirty else None; lines=self.log_lines
+            self.dirty=False; self.log_lines=[]
+        try:
+            if snap is not None:
+                tmp=self.path+".tmp"
+                with open(tmp,"w") as f: f.write(snap); f.flush(); os.fsync(f.fileno())
+                os.replace(tmp,self.path)
+            if lines and self.log_path:
+                with open(self.log_path,"a") as f: f.writelines(lines)
+        except OSError as e: self._report(e)
+
+    def _run(self):
+        while not self.closed:
+            self.wake.wait()
+            if not self.closed: time.sleep(self.delay)
+            self.wake.clear(); self._write()
+
+    def close(self):
+        """Stop the writer and flush anything pending (call before exit)."""
+        if self.closed: return
+        self.closed=True; self.wake.set(); self.thread.join(self.delay+2); self._write()
+
+store=SaveStore(SAVE_FILE,os.path.join(os.path.dirname(SAVE_FILE),"scores.log"))
+atexit.register(store.close)
+set_theme(store.get("theme",0))
 
 # ── HELPERS ───────────────────────────────────────────────────────────────
 def clamp(v,lo,hi): return max(lo,min(hi,v))
@@ -146,13 +198,23 @@ def ensure_visible(color, min_brightness=150):
             min(255,int(g + (255 - g)*t2)),
             min(255,int(b + (255 - b)*t2)))
 
+def _build_text(key):
+    font, text, color, shadow = key
+    s = font.render(text, True, (0,0,0) if shadow else color)
+    if shadow: s.set_alpha(shadow)
+    return s
+
+_text_cache = SpriteCache(800)
+def render_text(font, text, color, shadow=0):
+    """font.render with an LRU cache; shadow=alpha gives a translucent black copy instead."""
+    return _text_cache.get((font, text, tuple(color), shadow), _build_text)
+
 def draw_text(surf, font, text, x, y, color, shadow=True, center=False):
     """Draw text with a dark shadow behind for readability."""
-    s = font.render(text, True, color)
+    s = render_text(font, text, color)
     dx = x - s.get_width()//2 if center else x
     if shadow:
-        sh = font.render(text, True, (0,0,0))
-        sh.set_alpha(160)
+        sh = render_text(font, text, color, 160)
         surf.blit(sh, (dx+1, y+1))
         surf.blit(sh, (dx+2, y+2))
     surf.blit(s, (dx, y))
@@ -181,96 +243,191 @@ def ease_out_back(t):
 def ease_out_cubic(t): return 1-(1-t)**3
 def ease_in_out_quad(t): return 2*t*t if t<0.5 else 1-(-2*t+2)**2/2
 
+# ── SPRITE ATLAS ──────────────────────────────────────────────────────────
+sprites=SpriteCache(6000)  # particle shapes, glows, tiles (shared/particles.py)
+
+# ── FRAME PROFILER ────────────────────────────────────────────────────────
+profiler=FrameProfiler(FPS)  # ../shared/profiler.py; main() laps each phase, F3 shows the overlay
+profiler.watch(_text_cache,sprites)  # text and sprite builds; layers is added below
+
 # ── GLOW (cached) ─────────────────────────────────────────────────────────
-_glow_cache={}
+def _build_glow(key):
+    _,radius,color,alpha=key
+    s=pygame.Surface((radius*2,radius*2),pygame.SRCALPHA)
+    for r in range(radius,0,-3):
+        a=int(alpha*(r/radius)**0.5)
+        pygame.draw.circle(s,(*color,a),(radius,radius),r)
+    return s,radius,radius
+
 def draw_glow(surf,cx,cy,radius,color,alpha=40):
-    key=(radius,color[:3],alpha)
-    if key not in _glow_cache:
-        s=pygame.Surface((radius*2,radius*2),pygame.SRCALPHA)
-        for r in range(radius,0,-3):
-            a=int(alpha*(r/radius)**0.5)
-            pygame.draw.circle(s,(*color[:3],a),(radius,radius),r)
-        _glow_cache[key]=s
-    surf.blit(_glow_cache[key],(cx-radius,cy-radius),special_flags=pygame.BLEND_ADD)
+    s,ox,oy=sprites.get(("glow",radius,tuple(color[:3]),alpha),_build_glow)
+    surf.blit(s,(cx-ox,cy-oy),special_flags=pygame.BLEND_ADD)
 
 # ── PARTICLES ─────────────────────────────────────────────────────────────
-class Particle:
-    __slots__=['x','y','vx','vy','life','max_life','color','size','gravity','shape','rot','rotv','acurve']
-    def __init__(self,x,y,color=None,spd=(1,6),life=(0.3,1.0),sz=(2,6),grav=0,shape="circle",acurve="linear"):
-        self.x=x;self.y=y
-        a=random.uniform(0,6.283); s=random.uniform(*spd)
-        self.vx=math.cos(a)*s; self.vy=math.sin(a)*s
-        self.life=random.uniform(*life); self.max_life=self.life
-        self.color=color or random.choice(theme["particles"])
-        self.size=random.uniform(*sz); self.gravity=grav
-        self.shape=shape; self.rot=random.uniform(0,360); self.rotv=random.uniform(-300,300)
-        self.acurve=acurve
+SHAPES=("circle","spark","diamond","square","star")
+
+def _seq(v): return isinstance(v,(list,tuple)) or (np is not None and isinstance(v,np.ndarray))
+
+class ParticlePool(ParticleEngine):
+    """Theme-coloured particle bursts on the shared engine (../shared/particles.py),
+    which owns the columns, the update step and swap-removal. Adds a shape (index
+    into SHAPES) and a fade curve per particle. spawn() takes life in seconds and
+    update() takes dt in seconds; the engine itself counts 1/60 s ticks."""
+    EXTRA=("shape","smooth")
+
+    def spawn(self,x,y,count=12,color=None,spd=(1,6),life=(0.3,1.0),sz=(2,6),grav=0,shape="circle",acurve="linear",jitter=0,vel=None):
+        """Emit a burst. x/y may be scalars or per-particle sequences; color=None and
+        a tuple of shapes pick per particle; vel=(vxs,vys) overrides the random direction."""
+        k=self.room(count)
+        if not k: return
+        pal=theme["particles"] if color is None else [color]
+        shapes=[SHAPES.index(sh) for sh in shape] if isinstance(shape,(list,tuple)) else [SHAPES.index(shape)]
+        smooth=1.0 if acurve=="smooth" else 0.0
+        if np is not None:
+            rnd=np.random
+            if jitter:
+                x=(np.asarray(x,float)[:k] if _seq(x) else x)+rnd.randint(-jitter,jitter+1,k)
+                y=(np.asarray(y,float)[:k] if _seq(y) else y)+rnd.randint(-jitter,jitter+1,k)
+            if vel: vx,vy=vel
+            else: a=rnd.uniform(0,6.283,k); sp=rnd.uniform(spd[0],spd[1],k); vx,vy=np.cos(a)*sp,np.sin(a)*sp
+            cols=np.asarray(pal,float)[rnd.randint(0,len(pal),k)]
+            self.add(k,x=x,y=y,vx=vx,vy=vy,life=rnd.uniform(life[0]*60,life[1]*60,k),size=rnd.uniform(sz[0],sz[1],k),
+                     gravity=grav,rot=rnd.uniform(0,360,k),rotv=rnd.uniform(-5,5,k),r=cols[:,0],g=cols[:,1],b=cols[:,2],
+                     shape=np.asarray(shapes,float)[rnd.randint(0,len(shapes),k)],smooth=smooth)
+            return
+        U=random.uniform; J=lambda: random.randint(-jitter,jitter) if jitter else 0
+        xs=[(x[q] if _seq(x) else x)+J() for q in range(k)]; ys=[(y[q] if _seq(y) else y)+J() for q in range(k)]
+        if vel: vx,vy=list(vel[0]),list(vel[1])
+        else:
+            a=[U(0,6.283) for _ in range(k)]; sp=[U(*spd) for _ in range(k)]
+            vx=[math.cos(t)*v for t,v in zip(a,sp)]; vy=[math.sin(t)*v for t,v in zip(a,sp)]
+        cols=[random.choice(pal)[:3] for _ in range(k)]
+        self.add(k,x=xs,y=ys,vx=vx,vy=vy,life=[U(life[0]*60,life[1]*60) for _ in range(k)],size=[U(*sz) for _ in range(k)],
+                 gravity=grav,rot=[U(0,360) for _ in range(k)],rotv=[U(-5,5) for _ in range(k)],
+                 r=[c[0] for c in cols],g=[c[1] for c in cols],b=[c[2] for c in cols],
+                 shape=[float(random.choice(shapes)) for _ in range(k)],smooth=smooth)
 
     def update(self,dt):
-        self.x+=self.vx*dt*60; self.y+=self.vy*dt*60
-        self.vy+=self.gravity*dt*60; self.vx*=0.97; self.vy*=0.97
-        self.rot+=self.rotv*dt; self.life-=dt
-        return self.life>0
-
-    def draw(self,surf):
-        f=max(0,self.life/self.max_life)
-        alpha=math.sin(f*math.pi) if self.acurve=="smooth" else f
-        r=max(1,int(self.size*alpha))
-        c=tuple(clamp(int(ch*alpha),0,255) for ch in self.color)
-        ix,iy=int(self.x),int(self.y)
-        if self.shape=="circle": pygame.draw.circle(surf,c,(ix,iy),r)
-        elif self.shape=="spark":
-            ex=self.x+self.vx*3; ey=self.y+self.vy*3
-            pygame.draw.line(surf,c,(ix,iy),(int(ex),int(ey)),max(1,r//2))
-        elif self.shape=="diamond":
-            pygame.draw.polygon(surf,c,[(ix,iy-r),(ix+r,iy),(ix,iy+r),(ix-r,iy)])
-        elif self.shape=="square":
-            s=pygame.Surface((r*2,r*2),pygame.SRCALPHA)
-            pygame.draw.rect(s,(*c,int(255*alpha)),(0,0,r*2,r*2))
-            rot=pygame.transform.rotate(s,self.rot)
-            surf.blit(rot,(ix-rot.get_width()//2,iy-rot.get_height()//2))
-        elif self.shape=="star":
-            pts=[]
-            for i in range(8):
-                a=self.rot/57.3+i*math.pi/4; rad=r if i%2==0 else r//2
-                pts.append((ix+int(rad*math.cos(a)),iy+int(rad*math.sin(a))))
-            if len(pts)>=3: pygame.draw.polygon(surf,c,pts)
-
-particles=[]
+        self.step(dt*60,0.97)
+
+    def _sprite_codes(self,bounds):
+        """Atlas code, position and spark end point for every particle inside bounds."""
+        n=self.n
+        if np is not None:
+            x,y=self.x[:n],self.y[:n]
+            keep=np.flatnonzero((x>=0)&(x<bounds[0])&(y>=0)&(y<bounds[1])) if bounds else np.arange(n)
+            f=np.maximum(0,self.life[keep]/self.max_life[keep])
+            alpha=np.where(self.smooth[keep]>0,np.sin(f*math.pi),f)
+            rad=np.clip((self.size[keep]*alpha).astype(np.int64),1,15)
+            q=np.clip(np.rint(alpha*ALPHA_LEVELS),1,ALPHA_LEVELS).astype(np.int64)
+            shape=self.shape[keep].astype(np.int64)
+            ext=np.where(shape>=3,(self.rot[keep]*(ROT_STEPS/90)).astype(np.int64)%ROT_STEPS,0)
+            rgb=(self.r[keep].astype(np.int64)<<16)|(self.g[keep].astype(np.int64)<<8)|self.b[keep].astype(np.int64)
+            code=(((((shape<<24)|rgb)<<4|rad)<<4|q)<<3)|ext
+            xs,ys=x[keep],y[keep]
+            return code,xs.astype(int),ys.astype(int),(xs+self.vx[keep]*3).astype(int),(ys+self.vy[keep]*3).astype(int)
+        out=([],[],[],[],[])
+        for i in range(n):
+            px,py=self.x[i],self.y[i]
+            if bounds and not (0<=px<bounds[0] and 0<=py<bounds[1]): continue
+            f=max(0,self.life[i]/self.max_life[i]); alpha=math.sin(f*math.pi) if self.smooth[i] else f
+            shape=int(self.shape[i]); ext=int(self.rot[i]*ROT_STEPS/90)%ROT_STEPS if shape>=3 else 0
+            code=sprite_code(shape,(int(self.r[i]),int(self.g[i]),int(self.b[i])),clamp(int(self.size[i]*alpha),1,15),
+                             clamp(round(alpha*ALPHA_LEVELS),1,ALPHA_LEVELS),ext)
+            for lst,v in zip(out,(code,int(px),int(py),int(px+self.vx[i]*3),int(py+self.vy[i]*3))): lst.append(v)
+        return out
+
+    def draw(self,surf,bounds=None):
+        """Draw live particles as one blits() batch of atlas sprites; bounds=(w,h) skips
+        particles outside that area. Sparks vary continuously in length and direction,
+        so they stay plain (allocation-free) line draws."""
+        if not self.n: return
+        code,xs,ys,ex,ey=self._sprite_codes(bounds)
+        if np is not None:
+            spark=(code>>35)==1
+            if spark.any():
+                sc=code[spark]; a=((sc>>3)&15)/ALPHA_LEVELS; line=pygame.draw.line
+                rgb=(np.stack(((sc>>27)&255,(sc>>19)&255,(sc>>11)&255),axis=1)*a[:,None]).astype(int)
+                for c,w,ix,iy,jx,jy in zip(map(tuple,rgb.tolist()),np.maximum(1,((sc>>7)&15)//2).tolist(),
+                                            xs[spark].tolist(),ys[spark].tolist(),ex[spark].tolist(),ey[spark].tolist()):
+                    line(surf,c,(ix,iy),(jx,jy),w)
+                rest=~spark; code,xs,ys=code[rest],xs[rest],ys[rest]
+            blit_sprites(surf,code,xs,ys,sprites.get,_build_particle_sprite); return
+        rest=([],[],[])
+        for c,ix,iy,jx,jy in zip(code,xs,ys,ex,ey):
+            if c>>35==1: _draw_spark(surf,c,ix,iy,jx,jy); continue
+            for lst,v in zip(rest,(c,ix,iy)): lst.append(v)
+        blit_sprites(surf,*rest,sprites.get,_build_particle_sprite)
+
+ALPHA_LEVELS=8    # particle fade is quantized to this many brightness steps
+ROT_STEPS=6       # square/star rotation steps; both shapes repeat every 90 degrees
+
+def sprite_code(shape,rgb,r,q,ext=0):
+    """Pack a particle sprite key into one int: shape|rgb|radius(4b)|level(4b)|rotation(3b)."""
+    return ((((shape<<24|rgb[0]<<16|rgb[1]<<8|rgb[2])<<4|r)<<4|q)<<3)|ext
+
+def _decode(code):
+    ext=code&7; q=code>>3&15; r=code>>7&15; b=code>>11&255; g=code>>19&255; r0=code>>27&255
+    a=q/ALPHA_LEVELS
+    return code>>35,r,(clamp(int(r0*a),0,255),clamp(int(g*a),0,255),clamp(int(b*a),0,255)),a,ext
+
+def _draw_spark(surf,code,ix,iy,jx,jy):
+    _,r,c,_,_=_decode(code)
+    pygame.draw.line(surf,c,(ix,iy),(jx,jy),max(1,r//2))
+
+def _build_particle_sprite(code):
+    shape,r,c,a,ext=_decode(code)
+    if shape==3:  # square: rotated, translucent
+        s=pygame.Surface((r*2,r*2),pygame.SRCALPHA); s.fill((*c,int(255*a)))
+        s=pygame.transform.rotate(s,ext*90/ROT_STEPS)
+        return s,s.get_width()//2,s.get_height()//2
+    s=pygame.Surface((r*2+1,r*2+1),pygame.SRCALPHA)
+    if shape==0: pygame.draw.circle(s,c,(r,r),r)
+    elif shape==2: pygame.draw.polygon(s,c,[(r,0),(r*2,r),(r,r*2),(0,r)])
+    else:
+        rot=ext*90/ROT_STEPS; pts=[]
+        for i in range(8):
+            ang=rot/57.3+i*math.pi/4; rad=r if i%2==0 else r//2
+            pts.append((r+int(rad*math.cos(ang)),r+int(rad*math.sin(ang))))
+        pygame.draw.polygon(s,c,pts)
+    return s,r,r
+
+def warm_particle_sprites():
+    """Pre-render the current theme's circle/diamond sprites so the first bursts don't stall."""
+    for col in theme["particles"]:
+        for shape in (0,2):
+            for r in range(1,9):
+                for q in range(1,ALPHA_LEVELS+1):
+                    sprites.get(sprite_code(shape,col,r,q),_build_particle_sprite)
+
+particles=ParticlePool()
 
 def spawn_particles(x,y,count=12,color=None,**kw):
-    for _ in range(count): particles.append(Particle(x,y,color,**kw))
+    particles.spawn(x,y,count,color,**kw)
 
 def spawn_explosion(x,y,count=30,color=None):
-    for _ in range(count):
-        particles.append(Particle(x,y,color,spd=(2,9),life=(0.4,1.2),sz=(2,8),grav=0.15,
-            shape=random.choice(["circle","diamond","spark","star"]),acurve="smooth"))
+    particles.spawn(x,y,count,color,spd=(2,9),life=(0.4,1.2),sz=(2,8),grav=0.15,
+        shape=("circle","diamond","spark","star"),acurve="smooth")
 
 def spawn_firework(x,y,color=None):
     c=color or random.choice(theme["particles"])
-    for _ in range(40):
-        particles.append(Particle(x,y,c,spd=(3,10),life=(0.5,1.5),sz=(2,5),grav=0.2,shape="spark",acurve="smooth"))
-    for _ in range(15):
-        particles.append(Particle(x,y,(255,255,255),spd=(1,4),life=(0.3,0.8),sz=(1,3),shape="circle",acurve="smooth"))
+    particles.spawn(x,y,40,c,spd=(3,10),life=(0.5,1.5),sz=(2,5),grav=0.2,shape="spark",acurve="smooth")
+    particles.spawn(x,y,15,(255,255,255),spd=(1,4),life=(0.3,0.8),sz=(1,3),shape="circle",acurve="smooth")
 
 def spawn_confetti(x,y,count=25):
-    for _ in range(count):
-        particles.append(Particle(x,y,random.choice(theme["particles"]),spd=(2,7),life=(0.8,2.0),
-            sz=(3,7),grav=0.12,shape="square",acurve="smooth"))
+    particles.spawn(x,y,count,None,spd=(2,7),life=(0.8,2.0),sz=(3,7),grav=0.12,shape="square",acurve="smooth")
 
 def spawn_ring(x,y,radius=30,count=20,color=None):
-    c=color or theme["accent"]
-    for i in range(count):
-        a=i*6.283/count; px=x+math.cos(a)*radius; py=y+math.sin(a)*radius
-        p=Particle(px,py,c,spd=(0.5,2),life=(0.3,0.7),sz=(2,4),shape="circle",acurve="smooth")
-        p.vx=math.cos(a)*2; p.vy=math.sin(a)*2; particles.append(p)
+    c=color or theme["accent"]; angs=[i*6.283/count for i in range(count)]
+    particles.spawn([x+math.cos(a)*radius for a in angs],[y+math.sin(a)*radius for a in angs],count,c,
+        life=(0.3,0.7),sz=(2,4),shape="circle",acurve="smooth",
+        vel=([math.cos(a)*2 for a in angs],[math.sin(a)*2 for a in angs]))
 
 def spawn_spiral(x,y,count=30,color=None):
-    c=color or theme["accent"]
-    for i in range(count):
-        a=i*0.5; r=i*0.8
-        p=Particle(x+math.cos(a)*r,y+math.sin(a)*r,c,spd=(1,3),life=(0.4,1.0),sz=(2,5),shape="diamond",acurve="smooth")
-        p.vx=math.cos(a+1.57)*2; p.vy=math.sin(a+1.57)*2; particles.append(p)
+    c=color or theme["accent"]; angs=[i*0.5 for i in range(count)]
+    particles.spawn([x+math.cos(a)*i*0.8 for i,a in enumerate(angs)],[y+math.sin(a)*i*0.8 for i,a in enumerate(angs)],
+        count,c,life=(0.4,1.0),sz=(2,5),shape="diamond",acurve="smooth",
+        vel=([math.cos(a+1.57)*2 for a in angs],[math.sin(a+1.57)*2 for a in angs]))
 
 # ── FLOATING TEXT ─────────────────────────────────────────────────────────
 class FloatingText:
@@ -323,37 +480,12 @@ class Trail:
 trails=[]
 
 # ── BACKGROUND STARS ──────────────────────────────────────────────────────
-class Star:
-    __slots__=['x','y','speed','bright','size','phase']
-    def __init__(self):
-        self.x=random.uniform(0,FIELD_W);self.y=random.uniform(0,FIELD_H)
-        self.speed=random.uniform(3,12);self.bright=random.uniform(0.2,0.7)
-        self.size=random.uniform(0.5,2.0);self.phase=random.uniform(0,6.283)
-    def update(self,dt):
-        self.y+=self.speed*dt
-        if self.y>FIELD_H: self.y=-2; self.x=random.uniform(0,FIELD_W)
-    def draw(self,surf,t):
-        p=self.bright*(0.6+0.4*math.sin(t*2+self.phase))
-        c=tuple(clamp(int(60*p),0,255) for _ in range(3))
-        pygame.draw.circle(surf,c,(int(self.x),int(self.y)),max(1,int(self.size*p)))
-bg_stars=[Star() for _ in range(45)]
-
-# ── GAME MODES ────────────────────────────────────────────────────────────
-MODES={"classic":{"name":"Classic","desc":"No walls, wrap around edges","walls":False},
-       "walls":{"name":"Walls","desc":"Walls kill! Level obstacles","walls":True},
-       "speed":{"name":"Speed","desc":"Starts fast, gets faster!","walls":False}}
-
-def generate_walls(level):
-    w=set()
-    if level>=2:
-        for i in range(5,10): w.add((i,8));w.add((COLS-1-i,ROWS-1-8))
-    if level>=3:
-        for i in range(8,16): w.add((14,i))
-    if level>=4:
-        for i in range(3,7): w.add((i,15));w.add((COLS-1-i,15))
-    if level>=5:
-        for i in range(6,18): w.add((i,5));w.add((i,ROWS-6))
-    return w
+def _star():
+    bright=random.uniform(0.2,0.7); v=int(60*bright)
+    return (random.uniform(0,FIELD_W),random.uniform(0,FIELD_H),random.uniform(3,12),
+            max(1,int(random.uniform(0.5,2.0)*bright)),(v,v,v))
+# drifting backdrop: 3 parallax layers in px/s, twinkle by palette animation
+bg_stars=Starfield((FIELD_W,FIELD_H),[_star() for _ in range(45)],layers=3,twinkle=0.4)
 
 # ── FOOD DRAWING ──────────────────────────────────────────────────────────
 def draw_apple(surf,cx,cy,radius,t,fc,fs):
@@ -426,169 +558,108 @@ def draw_powerup_orb(surf,cx,cy,radius,t,tf):
     pygame.draw.rect(surf,c,(bx,by,int(bw*tf),bh),border_radius=1)
 
 # ── GAME STATE ────────────────────────────────────────────────────────────
-class Game:
-    def __init__(self,mode="classic"):
-        self.mode=mode; self.cfg=MODES[mode]; self.food_type="apple"; self.reset()
-
-    def reset(self):
-        cx2,cy2=COLS//2,ROWS//2
-        self.snake=[(cx2,cy2),(cx2-1,cy2),(cx2-2,cy2)]
-        self.direction=(1,0); self.input_queue=deque(maxlen=3)
-        self.score=0; self.level=1; self.food=None; self.bonus=None; self.bonus_timer=0
-        self.alive=True; self.win=False; self.move_timer=0
-        self.combo=0; self.combo_timer=0; self.eaten_count=0; self.total_time=0
-        self.speed_mult=3.0 if self.mode=="speed" else 1.0
-        self.walls=set(); self.invuln_timer=0; self.rainbow_timer=0
-        self.powerup=None; self.powerup_timer=0
-        self.base_interval=0.12 if self.mode=="speed" else 0.15
+class Game(SnakeSim):
+    """SnakeSim plus real-time pacing, animation state and effects for its events.
+
+    Every run is recorded to REPLAY_DIR unless `replay` (a ReplayReader) is
+    given, in which case its actions drive the snake instead of the keyboard.
+    """
+    def __init__(self,mode="classic",seed=None,replay=None):
+        self.input_queue=deque(maxlen=3); self.replay=replay; super().__init__(mode,seed)
+
+    def reset(self,seed=None):
+        self.stop_recording()
+        if self.replay: seed=self.replay.seed
+        elif RECORD and seed is None: seed=random.getrandbits(32)
+        super().reset(seed)
+        if RECORD and not self.replay:
+            try:
+                os.makedirs(REPLAY_DIR,exist_ok=True); prune_replays(REPLAY_DIR,REPLAY_KEEP-1)
+                name=time.strftime(f"{self.mode}-%Y%m%d-%H%M%S-{seed:08x}.nsr")
+                self.recorder=ReplayWriter(os.path.join(REPLAY_DIR,name),self.mode,seed,self.cols,self.rows)
+            except OSError: self.recorder=None
+        self.input_queue.clear(); self.move_timer=0
         self.death_anim=0.0; self.eat_anim=0.0; self.levelup_anim=0.0
-        self.food_type="apple"
         # Smooth movement interpolation
         self.move_progress=1.0  # 0..1, 1 means arrived
-        self.prev_positions={}  # segment index -> previous (x,y)
+        self.prev_positions=[]  # segment index -> previous (x,y)
         particles.clear(); floating_texts.clear(); trails.clear()
-        self.place_food()
-
-    @property
-    def move_interval(self):
-        return max(0.04,self.base_interval-(self.level-1)*0.008)/self.speed_mult
 
-    def _free(self,extra=None):
-        occ=set(self.snake)|self.walls
-        if extra: occ|=extra
-        return [(x,y) for x in range(COLS) for y in range(ROWS) if (x,y) not in occ]
-
-    def place_food(self):
-        f=self._free()
-        if f: self.food=random.choice(f); self.food_type=random.choice(["apple","apple","cherry"])
-        else: self.win=True; self.alive=False
-
-    def place_bonus(self):
-        f=self._free({self.food} if self.food else set())
-        if f: self.bonus=random.choice(f); self.bonus_timer=6.0
-
-    def place_powerup(self):
-        f=self._free({self.food} if self.food else set())
-        if f: self.powerup=random.choice(f); self.powerup_timer=8.0
+    def stop_recording(self):
+        if self.recorder: self.recorder.close(); self.recorder=None
 
     def update(self,dt):
         if not self.alive:
             self.death_anim=min(1.0,self.death_anim+dt*2.5); return
 
-        self.total_time+=dt; self.move_timer+=dt; self.combo_timer-=dt
+        self.move_timer+=dt
         self.eat_anim=max(0,self.eat_anim-dt*4)
         self.levelup_anim=max(0,self.levelup_anim-dt*2)
 
-        if self.combo_timer<=0: self.combo=0
-        if self.bonus:
-            self.bonus_timer-=dt
-            if self.bonus_timer<=0: self.bonus=None
-        if self.powerup:
-            self.powerup_timer-=dt
-            if self.powerup_timer<=0: self.powerup=None
-        if self.invuln_timer>0: self.invuln_timer-=dt
-        if self.rainbow_timer>0: self.rainbow_timer-=dt
-
         # Smooth interpolation progress
         self.move_progress=min(1.0,self.move_progress+dt/self.move_interval)
 
         if self.move_timer>=self.move_interval:
             self.move_timer-=self.move_interval
-            if self.input_queue:
-                ndx,ndy=self.input_queue.popleft()
-                dx,dy=self.direction
-                if (ndx,ndy)!=(-dx,-dy): self.direction=(ndx,ndy)
             # Save positions before step for interpolation
-            self.prev_positions={i:pos for i,pos in enumerate(self.snake)}
-            self.step()
+            self.prev_positions=list(self.snake)
+            if self.replay: action=self.replay.action(self.steps)
+            else: action=self.input_queue.popleft() if self.input_queue else None
+            self.play_events(self.step(action))
             self.move_progress=0.0
 
-    def step(self):
-        hx,hy=self.snake[0]; dx,dy=self.direction; nx,ny=hx+dx,hy+dy
-
-        if self.cfg["walls"]:
-            if nx<0 or nx>=COLS or ny<0 or ny>=ROWS:
-                if self.invuln_timer<=0: self.die(); return
-                else: nx%=COLS; ny%=ROWS
-        else: nx%=COLS; ny%=ROWS
-
-        if (nx,ny) in self.walls:
-            if self.invuln_timer<=0: self.die(); return
-        if (nx,ny) in self.snake[:-1]:
-            if self.invuln_timer<=0: self.die(); return
-
-        self.snake.insert(0,(nx,ny))
-        trails.append(Trail(nx*CELL+CELL//2,ny*CELL+CELL//2,theme["snake_head"]))
-
-        ate=False
-        if (nx,ny)==self.food:
-            snd_eat.play(); self.eaten_count+=1; self.combo+=1; self.combo_timer=3.0
-            self.eat_anim=1.0; pts=10*self.level*max(1,self.combo); self.score+=pts
-            fx=nx*CELL+CELL//2; fy=ny*CELL+CELL//2
-            spawn_explosion(fx,fy,25,theme["food"]); spawn_ring(fx,fy,20,16,theme["food"])
-            floating_texts.append(FloatingText(fx,fy-10,f"+{pts}",theme["accent"],font_md))
-            if self.combo>1:
-                floating_texts.append(FloatingText(fx,fy-30,f"x{self.combo} Combo!",theme["gold"],font_sm,1.5))
-            if self.combo==5: spawn_firework(fx,fy,theme["gold"])
-            if self.combo==10:
-                spawn_confetti(fx,fy,40)
-                floating_texts.append(FloatingText(fx,fy-50,"Unstoppable!",(255,100,255),font_lg,2.0))
-            trigger_flash(theme["food"],0.08); self.place_food(); ate=True
-
-            if self.eaten_count%8==0:
-                self.level+=1; self.levelup_anim=1.0; snd_levelup.play()
-                floating_texts.append(FloatingText(FIELD_W//2,FIELD_H//2,f"Level {self.level}!",theme["gold"],font_xl,2.0))
+    def play_events(self,events):
+        """Turn simulation events into sound, particles, texts and screen effects."""
+        if self.alive:
+            hx,hy=self.snake[0]; trails.append(Trail(hx*CELL+CELL//2,hy*CELL+CELL//2,theme["snake_head"]))
+        for kind,gx,gy,a,b in events:
+            cx2=gx*CELL+CELL//2; cy2=gy*CELL+CELL//2
+            if kind==EAT:
+                snd_eat.variant(1+0.04*min(b-1,10)).play(); self.eat_anim=1.0  # pitch climbs with the combo
+                spawn_explosion(cx2,cy2,25,theme["food"]); spawn_ring(cx2,cy2,20,16,theme["food"])
+                floating_texts.append(FloatingText(cx2,cy2-10,f"+{a}",theme["accent"],font_md))
+                if b>1:
+                    floating_texts.append(FloatingText(cx2,cy2-30,f"x{b} Combo!",theme["gold"],font_sm,1.5))
+                if b==5: spawn_firework(cx2,cy2,theme["gold"])
+                if b==10:
+                    spawn_confetti(cx2,cy2,40)
+                    floating_texts.append(FloatingText(cx2,cy2-50,"Unstoppable!",(255,100,255),font_lg,2.0))
+                trigger_flash(theme["food"],0.08)
+            elif kind==LEVEL:
+                self.levelup_anim=1.0; snd_levelup.play()
+                floating_texts.append(FloatingText(FIELD_W//2,FIELD_H//2,f"Level {a}!",theme["gold"],font_xl,2.0))
                 spawn_firework(FIELD_W//2,FIELD_H//2,theme["gold"])
                 spawn_firework(FIELD_W//4,FIELD_H//2,theme["accent"])
                 spawn_firework(FIELD_W*3//4,FIELD_H//2,theme["particles"][2])
                 trigger_shake(5,0.25); trigger_flash(theme["gold"],0.12)
-                if self.cfg["walls"]: self.walls=generate_walls(self.level)
-            if random.random()<0.3 and not self.bonus: self.place_bonus()
-            if random.random()<0.15 and not self.powerup and self.level>=2: self.place_powerup()
-        else: self.snake.pop()
-
-        if self.bonus and (nx,ny)==self.bonus:
-            snd_bonus.play(); p2=50*self.level; self.score+=p2
-            bx2=nx*CELL+CELL//2; by2=ny*CELL+CELL//2
-            spawn_firework(bx2,by2,theme["bonus"]); spawn_ring(bx2,by2,25,20,theme["bonus"])
-            floating_texts.append(FloatingText(bx2,by2-10,f"+{p2}",theme["gold"],font_md))
-            trigger_flash(theme["bonus"],0.1); self.bonus=None; ate=True
-
-        if self.powerup and (nx,ny)==self.powerup:
-            snd_powerup.play(); ptype=random.choice(["invuln","rainbow","shrink"])
-            px2=nx*CELL+CELL//2; py2=ny*CELL+CELL//2
-            if ptype=="invuln":
-                self.invuln_timer=5.0
-                floating_texts.append(FloatingText(px2,py2-10,"Shield!",(100,200,255),font_lg,1.8))
-                spawn_spiral(px2,py2,35,(100,200,255)); spawn_ring(px2,py2,30,24,(100,200,255))
-            elif ptype=="rainbow":
-                self.rainbow_timer=6.0
-                floating_texts.append(FloatingText(px2,py2-10,"Rainbow!",(255,100,255),font_lg,1.8))
-                spawn_confetti(px2,py2,35); spawn_ring(px2,py2,30,24,(255,100,255))
-            elif ptype=="shrink":
-                if len(self.snake)>5:
-                    rem=len(self.snake)//3
-                    for seg in self.snake[-rem:]:
+            elif kind==BONUS:
+                snd_bonus.play()
+                spawn_firework(cx2,cy2,theme["bonus"]); spawn_ring(cx2,cy2,25,20,theme["bonus"])
+                floating_texts.append(FloatingText(cx2,cy2-10,f"+{a}",theme["gold"],font_md))
+                trigger_flash(theme["bonus"],0.1)
+            elif kind==POWERUP:
+                snd_powerup.play()
+                if a=="invuln":
+                    floating_texts.append(FloatingText(cx2,cy2-10,"Shield!",(100,200,255),font_lg,1.8))
+                    spawn_spiral(cx2,cy2,35,(100,200,255)); spawn_ring(cx2,cy2,30,24,(100,200,255))
+                elif a=="rainbow":
+                    floating_texts.append(FloatingText(cx2,cy2-10,"Rainbow!",(255,100,255),font_lg,1.8))
+                    spawn_confetti(cx2,cy2,35); spawn_ring(cx2,cy2,30,24,(255,100,255))
+                elif isinstance(b,list):
+                    for seg in b:
                         spawn_particles(seg[0]*CELL+CELL//2,seg[1]*CELL+CELL//2,3,theme["danger"],shape="spark")
-                    self.snake=self.snake[:len(self.snake)-rem]
-                    floating_texts.append(FloatingText(px2,py2-10,f"Trim -{rem}!",theme["danger"],font_lg,1.5))
+                    floating_texts.append(FloatingText(cx2,cy2-10,f"Trim -{len(b)}!",theme["danger"],font_lg,1.5))
                 else:
-                    bp=30*self.level; self.score+=bp
-                    floating_texts.append(FloatingText(px2,py2-10,f"+{bp}",theme["gold"]))
-                spawn_explosion(px2,py2,30,theme["danger"])
-            trigger_flash(get_rainbow(pygame.time.get_ticks()/1000.0),0.1)
-            self.powerup=None; ate=True
-
-    def die(self):
-        self.alive=False; self.death_anim=0.0; snd_die.play()
-        hx,hy=self.snake[0]; cx2=hx*CELL+CELL//2; cy2=hy*CELL+CELL//2
-        spawn_firework(cx2,cy2,theme["danger"])
-        for i,(sx,sy) in enumerate(self.snake[:20]):
-            for _ in range(3):
-                particles.append(Particle(sx*CELL+CELL//2+random.randint(-5,5),
-                    sy*CELL+CELL//2+random.randint(-5,5),theme["danger"],
-                    spd=(1,5),life=(0.3+i*0.02,0.8+i*0.02),sz=(2,5),grav=0.15,shape="spark",acurve="smooth"))
-        trigger_shake(14,0.5); trigger_flash(theme["danger"],0.18); trigger_slow_mo(0.4)
+                    floating_texts.append(FloatingText(cx2,cy2-10,f"+{b}",theme["gold"]))
+                if a=="shrink": spawn_explosion(cx2,cy2,30,theme["danger"])
+                trigger_flash(get_rainbow(pygame.time.get_ticks()/1000.0),0.1)
+            elif kind==DIE:
+                self.death_anim=0.0; snd_die.play()
+                spawn_firework(cx2,cy2,theme["danger"])
+                for i,(sx,sy) in enumerate(islice(self.snake,20)):
+                    particles.spawn(sx*CELL+CELL//2,sy*CELL+CELL//2,3,theme["danger"],spd=(1,5),
+                        life=(0.3+i*0.02,0.8+i*0.02),sz=(2,5),grav=0.15,shape="spark",acurve="smooth",jitter=5)
+                trigger_shake(14,0.5); trigger_flash(theme["danger"],0.18); trigger_slow_mo(0.4)
 
     def handle_input(self,key):
         m={pygame.K_UP:(0,-1),pygame.K_w:(0,-1),pygame.K_DOWN:(0,1),pygame.K_s:(0,1),
@@ -599,7 +670,7 @@ class Game:
         """Get interpolated pixel position for a segment."""
         cur=self.snake[idx]
         t2=ease_in_out_quad(min(1.0,self.move_progress))
-        if idx in self.prev_positions:
+        if idx<len(self.prev_positions):
             prev=self.prev_positions[idx]
             dx2=cur[0]-prev[0]; dy2=cur[1]-prev[1]
             # Handle wrap-around (don't interpolate across screen)
@@ -610,136 +681,216 @@ class Game:
             return (px,py)
         return (cur[0]*CELL+CELL//2, cur[1]*CELL+CELL//2)
 
+    def smooth_positions(self):
+        """Interpolated pixel centres of all segments, head first (get_smooth_pos in one pass)."""
+        t2=ease_in_out_quad(min(1.0,self.move_progress)); prev=self.prev_positions; np2=len(prev); h=CELL//2; out=[]
+        for i,(cx,cy) in enumerate(self.snake):
+            if i<np2:
+                px,py=prev[i]
+                if -1<=cx-px<=1 and -1<=cy-py<=1:
+                    out.append(((px+(cx-px)*t2)*CELL+h,(py+(cy-py)*t2)*CELL+h)); continue
+            out.append((cx*CELL+h,cy*CELL+h))
+        return out
+
 # ── DRAWING ───────────────────────────────────────────────────────────────
 def draw_grid(surf):
     gc=theme["grid"]
     for x in range(0,FIELD_W,CELL): pygame.draw.line(surf,gc,(x,0),(x,FIELD_H))
     for y in range(0,FIELD_H,CELL): pygame.draw.line(surf,gc,(0,y),(FIELD_W,y))
 
-def draw_snake(surf,game,t):
-    n=len(game.snake)
-    for i_rev,(sx,sy) in enumerate(reversed(game.snake)):
-        idx=n-1-i_rev
-        # Smooth position
-        smx,smy=game.get_smooth_pos(idx)
-        rw=CELL-2; rh=CELL-2
-
-        if game.rainbow_timer>0:
-            color=get_rainbow(t,idx*0.3); outline=tuple(max(0,c-60) for c in color)
-        elif game.invuln_timer>0:
-            p=0.5+0.5*math.sin(t*10); color=(int(100+100*p),int(200+55*p),255); outline=(40,80,130)
-        elif idx==0:
-            color=theme["snake_head"]; outline=theme["snake_outline"]
-            if game.eat_anim>0:
-                sc2=1+0.2*game.eat_anim; extra=int(rw*(sc2-1)/2); rw+=extra*2; rh+=extra*2
-        else:
-            frac=idx/max(1,n-1)
-            color=lerp_color(theme["snake_head"],theme["snake_body"],frac)
-            outline=theme["snake_outline"]
+# Static layers are cached per theme (and mode) and blitted whole each frame.
+layers=SpriteCache(64); profiler.watch(layers)
+field=pygame.Surface((FIELD_W,FIELD_H))  # reused for every frame
+
+def _build_background(key):
+    bg=pygame.Surface((FIELD_W,FIELD_H)); bg.fill(theme["bg"]); draw_grid(bg); return bg
+
+def background_layer():
+    """Field background (fill + grid) for the current theme."""
+    return layers.get(("bg",current_theme_idx),_build_background)
+
+def _build_flash(key):
+    fs=pygame.Surface((FIELD_W,FIELD_H)); fs.fill(key[1]); return fs
+
+GRADIENT_STEPS=48   # head-to-body colour buckets per theme
+RAINBOW_STEPS=48    # hue buckets for rainbow mode
+RAINBOW_TABLE=[get_rainbow(0,k*math.tau/RAINBOW_STEPS) for k in range(RAINBOW_STEPS)]
+RAINBOW_OUTLINE=[tuple(max(0,c-60) for c in col) for col in RAINBOW_TABLE]
+
+def _build_gradient(key):
+    return [lerp_color(theme["snake_head"],theme["snake_body"],k/(GRADIENT_STEPS-1)) for k in range(GRADIENT_STEPS)]
+
+def _build_segment(key):
+    """Body segment: outline, fill and highlight, with the outline at (0, 0)."""
+    _,color,outline,rw=key
+    seg=pygame.Surface((rw+2,rw+2),pygame.SRCALPHA)
+    pygame.draw.rect(seg,outline,(0,0,rw+2,rw+2),border_radius=6)
+    pygame.draw.rect(seg,color,(1,1,rw,rw),border_radius=5)
+    hl=tuple(min(255,c+30) for c in color)
+    hs2=pygame.Surface((rw//2-1,rw//2-1),pygame.SRCALPHA)
+    pygame.draw.rect(hs2,(*hl,50),(0,0,rw//2-1,rw//2-1),border_radius=3)
+    seg.blit(hs2,(3,3))
+    return seg
+
+def _build_connector(key):
+    _,color,outline,rw=key
+    con=pygame.Surface((rw+2,rw+2),pygame.SRCALPHA)
+    pygame.draw.rect(con,outline,(0,0,rw+2,rw+2),border_radius=3)
+    pygame.draw.rect(con,color,(1,1,rw,rw),border_radius=2)
+    return con
 
-        rx=int(smx-rw//2); ry=int(smy-rh//2)
-        rect=pygame.Rect(rx,ry,rw,rh)
+def draw_snake(surf,game,t):
+    pos=game.smooth_positions(); n=len(pos); rw=rh=CELL-2; half=rw//2; near=CELL*1.5
 
-        # Connector to next segment
+    # Body, tail first, as one blits() batch of cached connector + segment sprites
+    if game.rainbow_timer>0:
+        k0=t*3/math.tau*RAINBOW_STEPS; kstep=0.3/math.tau*RAINBOW_STEPS
+        colors=[(RAINBOW_TABLE[k],RAINBOW_OUTLINE[k]) for k in (int(k0+i*kstep)%RAINBOW_STEPS for i in range(n))]
+    elif game.invuln_timer>0:
+        p=round((0.5+0.5*math.sin(t*10))*15)/15; c=((int(100+100*p),int(200+55*p),255),(40,80,130)); colors=[c]*n
+    else:
+        grad=layers.get(("gradient",current_theme_idx),_build_gradient); ol=tuple(theme["snake_outline"])
+        scale=(GRADIENT_STEPS-1)/max(1,n-1); colors=[(grad[int(i*scale+0.5)],ol) for i in range(n)]
+    seq=[]; get=sprites.get
+    for idx in range(n-1,0,-1):
+        smx,smy=pos[idx]; color,outline=colors[idx]
         if idx<n-1:
-            nmx,nmy=game.get_smooth_pos(idx+1)
-            ddx=smx-nmx; ddy=smy-nmy
-            if abs(ddx)<CELL*1.5 and abs(ddy)<CELL*1.5:
-                mx2=(smx+nmx)/2; my2=(smy+nmy)/2
-                cr=pygame.Rect(int(mx2-rw//2),int(my2-rh//2),rw,rh)
-                pygame.draw.rect(surf,outline,cr.inflate(2,2),border_radius=3)
-                pygame.draw.rect(surf,color,cr,border_radius=2)
-
-        pygame.draw.rect(surf,outline,rect.inflate(2,2),border_radius=6)
-        pygame.draw.rect(surf,color,rect,border_radius=5)
-
-        # Body highlight
-        if idx>0:
-            hl=tuple(min(255,c+30) for c in color)
-            hs2=pygame.Surface((rw//2-1,rh//2-1),pygame.SRCALPHA)
-            pygame.draw.rect(hs2,(*hl,50),(0,0,rw//2-1,rh//2-1),border_radius=3)
-            surf.blit(hs2,(rx+2,ry+2))
-
-        # Head
-        if idx==0:
-            dx2,dy2=game.direction
-            ecx=int(smx)+dx2*5; ecy=int(smy)+dy2*5
-            ew=5
-            e1x=ecx-4*abs(dy2); e1y=ecy-4*abs(dx2)
-            e2x=ecx+4*abs(dy2); e2y=ecy+4*abs(dx2)
-            pygame.draw.circle(surf,(255,255,255),(e1x,e1y),ew)
-            pygame.draw.circle(surf,(255,255,255),(e2x,e2y),ew)
-            pygame.draw.circle(surf,(10,10,30),(e1x+dx2*2,e1y+dy2*2),3)
-            pygame.draw.circle(surf,(10,10,30),(e2x+dx2*2,e2y+dy2*2),3)
-            pygame.draw.circle(surf,(255,255,255),(e1x+dx2*2-1,e1y+dy2*2-1),1)
-            pygame.draw.circle(surf,(255,255,255),(e2x+dx2*2-1,e2y+dy2*2-1),1)
-
-            if game.invuln_timer>0 or game.rainbow_timer>0:
-                draw_glow(surf,int(smx),int(smy),22,color,35)
-
-            # Tongue
-            tp=math.sin(t*6)
-            if tp>0.7:
-                tl=int(4+3*(tp-0.7)/0.3)
-                tx=int(smx)+dx2*(rw//2+tl); ty=int(smy)+dy2*(rh//2+tl)
-                pygame.draw.line(surf,(255,60,80),(int(smx)+dx2*(rw//2),int(smy)+dy2*(rh//2)),(tx,ty),2)
-                if tl>5:
-                    f1=(tx+(abs(dy2)*3+dx2*2),ty+(abs(dx2)*3+dy2*2))
-                    f2=(tx+(-abs(dy2)*3+dx2*2),ty+(-abs(dx2)*3+dy2*2))
-                    pygame.draw.line(surf,(255,60,80),(tx,ty),f1,1)
-                    pygame.draw.line(surf,(255,60,80),(tx,ty),f2,1)
+            nmx,nmy=pos[idx+1]
+            if -near<smx-nmx<near and -near<smy-nmy<near:
+                seq.append((get(("con",color,outline,rw),_build_connector),
+                            (int((smx+nmx)/2-half)-1,int((smy+nmy)/2-half)-1)))
+        seq.append((get(("seg",color,outline,rw),_build_segment),(int(smx-half)-1,int(smy-half)-1)))
+    surf.blits(seq,False)
+
+    # Head
+    idx=0; smx,smy=pos[0]; color,outline=colors[0]
+    if game.rainbow_timer<=0 and game.invuln_timer<=0:
+        color=theme["snake_head"]
+        if game.eat_anim>0:
+            sc2=1+0.2*game.eat_anim; extra=int(rw*(sc2-1)/2); rw+=extra*2; rh+=extra*2
+    rx=int(smx-rw//2); ry=int(smy-rh//2)
+    rect=pygame.Rect(rx,ry,rw,rh)
+    if n>1:
+        nmx,nmy=pos[1]
+        if abs(smx-nmx)<near and abs(smy-nmy)<near:
+            mx2=(smx+nmx)/2; my2=(smy+nmy)/2
+            cr=pygame.Rect(int(mx2-rw//2),int(my2-rh//2),rw,rh)
+            pygame.draw.rect(surf,outline,cr.inflate(2,2),border_radius=3)
+            pygame.draw.rect(surf,color,cr,border_radius=2)
+    pygame.draw.rect(surf,outline,rect.inflate(2,2),border_radius=6)
+    pygame.draw.rect(surf,color,rect,border_radius=5)
+
+    # Eyes
+    dx2,dy2=game.direction
+    ecx=int(smx)+dx2*5; ecy=int(smy)+dy2*5
+    ew=5
+    e1x=ecx-4*abs(dy2); e1y=ecy-4*abs(dx2)
+    e2x=ecx+4*abs(dy2); e2y=ecy+4*abs(dx2)
+    pygame.draw.circle(surf,(255,255,255),(e1x,e1y),ew)
+    pygame.draw.circle(surf,(255,255,255),(e2x,e2y),ew)
+    pygame.draw.circle(surf,(10,10,30),(e1x+dx2*2,e1y+dy2*2),3)
+    pygame.draw.circle(surf,(10,10,30),(e2x+dx2*2,e2y+dy2*2),3)
+    pygame.draw.circle(surf,(255,255,255),(e1x+dx2*2-1,e1y+dy2*2-1),1)
+    pygame.draw.circle(surf,(255,255,255),(e2x+dx2*2-1,e2y+dy2*2-1),1)
+
+    if game.invuln_timer>0 or game.rainbow_timer>0:
+        draw_glow(surf,int(smx),int(smy),22,color,35)
+
+    # Tongue
+    tp=math.sin(t*6)
+    if tp>0.7:
+        tl=int(4+3*(tp-0.7)/0.3)
+        tx=int(smx)+dx2*(rw//2+tl); ty=int(smy)+dy2*(rh//2+tl)
+        pygame.draw.line(surf,(255,60,80),(int(smx)+dx2*(rw//2),int(smy)+dy2*(rh//2)),(tx,ty),2)
+        if tl>5:
+            f1=(tx+(abs(dy2)*3+dx2*2),ty+(abs(dx2)*3+dy2*2))
+            f2=(tx+(-abs(dy2)*3+dx2*2),ty+(-abs(dx2)*3+dy2*2))
+            pygame.draw.line(surf,(255,60,80),(tx,ty),f1,1)
+            pygame.draw.line(surf,(255,60,80),(tx,ty),f2,1)
+
+WALL_LEVELS=16   # wall pulse brightness steps
+
+def _build_wall_tile(key):
+    _,wc,q=key; p=0.5+0.5*q/(WALL_LEVELS-1)
+    tile=pygame.Surface((CELL,CELL),pygame.SRCALPHA); rect=tile.get_rect()
+    c=tuple(clamp(int(ch*p),0,255) for ch in wc)
+    pygame.draw.rect(tile,c,rect,border_radius=3)
+    lt=tuple(min(255,ch+20) for ch in c)
+    pygame.draw.line(tile,lt,(rect.left+2,rect.centery),(rect.right-2,rect.centery),1)
+    pygame.draw.line(tile,lt,(rect.centerx,rect.top+2),(rect.centerx,rect.centery),1)
+    pygame.draw.rect(tile,tuple(min(255,ch+10) for ch in c),rect,1,border_radius=3)
+    return tile
 
 def draw_walls(surf,game,t):
-    wc=theme["wall"]
+    if not game.walls: return
+    wc=tuple(theme["wall"]); seq=[]
     for wx,wy in game.walls:
-        rect=pygame.Rect(wx*CELL,wy*CELL,CELL,CELL)
-        p=0.75+0.25*math.sin(t*1.5+wx*0.4+wy*0.3)
-        c=tuple(clamp(int(ch*p),0,255) for ch in wc)
-        pygame.draw.rect(surf,c,rect,border_radius=3)
-        lt=tuple(min(255,ch+20) for ch in c)
-        pygame.draw.line(surf,lt,(rect.left+2,rect.centery),(rect.right-2,rect.centery),1)
-        pygame.draw.line(surf,lt,(rect.centerx,rect.top+2),(rect.centerx,rect.centery),1)
-        pygame.draw.rect(surf,tuple(min(255,ch+10) for ch in c),rect,1,border_radius=3)
+        q=int((0.5+0.5*math.sin(t*1.5+wx*0.4+wy*0.3))*(WALL_LEVELS-1)+0.5)
+        seq.append((sprites.get(("wall",wc,q),_build_wall_tile),(wx*CELL,wy*CELL)))
+    surf.blits(seq,False)
 
 # ── SIDEBAR ───────────────────────────────────────────────────────────────
-def draw_sidebar(surf,game,t):
-    sb=pygame.Rect(FIELD_W,0,SIDEBAR_W,HEIGHT); pygame.draw.rect(surf,theme["sidebar_bg"],sb)
+SIDEBAR_SPEED_Y=406   # sidebar rows sit at fixed heights; the labels live in _build_sidebar
+
+def _build_sidebar(key):
+    """Everything in the sidebar that only changes with theme or mode."""
+    surf=pygame.Surface((SIDEBAR_W,HEIGHT)); surf.fill(theme["sidebar_bg"])
     bc=theme["sidebar_border"]
     for i in range(3):
         a=max(0,255-i*80); c2=tuple(clamp(int(c*a/255),0,255) for c in bc)
-        pygame.draw.line(surf,c2,(FIELD_W+i,0),(FIELD_W+i,HEIGHT))
+        pygame.draw.line(surf,c2,(i,0),(i,HEIGHT))
 
-    x=FIELD_W+16; y=12
+    x=16; y=12
     # Sidebar title — use theme accent directly
     draw_text(surf,font_lg,"Neon",x,y,theme["accent"]); y+=34
     draw_text(surf,font_lg,"Snake",x,y,theme["accent"]); y+=44
     draw_text(surf,font_xs,f"Theme: {theme['name']}",x,y,theme["silver"]); y+=18
     dim_hint=lerp_color(theme["silver"],theme["sidebar_bg"],0.3)
     draw_text(surf,font_xs,"T = change theme",x,y,dim_hint); y+=22
-    draw_text(surf,font_sm,f"Mode: {game.cfg['name']}",x,y,theme["gold"]); y+=28
+    draw_text(surf,font_sm,f"Mode: {MODES[key[2]]['name']}",x,y,theme["gold"]); y+=28
 
     dc=lerp_color(theme["sidebar_bg"],theme["accent"],0.4)
     pygame.draw.line(surf,dc,(x,y),(x+SIDEBAR_W-32,y),1); y+=12
+    draw_text(surf,font_xs,"Score",x,y,theme["silver"]); y+=58
+    draw_text(surf,font_xs,"Level",x,y,theme["silver"]); y+=46
+    draw_text(surf,font_xs,"Length",x,y,theme["silver"]); y+=46+58
+    pygame.draw.line(surf,dc,(x,y),(x+SIDEBAR_W-32,y),1); y+=10
+    draw_text(surf,font_xs,"Speed",x,y,theme["silver"])
+
+    y=HEIGHT-55; pygame.draw.line(surf,dc,(x,y),(x+SIDEBAR_W-32,y),1); y+=32
+    draw_text(surf,font_xs,"P = Pause   Esc = Menu",x,y,dim_hint)
+    return surf
+
+def _build_speed_bar(key):
+    fw,bc2=key[2],key[3]; bw=SIDEBAR_W-36; bh=8
+    bar=pygame.Surface((bw,bh),pygame.SRCALPHA)
+    pygame.draw.rect(bar,tuple(max(0,c-180) for c in theme["accent"]),(0,0,bw,bh),border_radius=3)
+    pygame.draw.rect(bar,bc2,(0,0,fw,bh),border_radius=3)
+    if fw>4:
+        sh2=pygame.Surface((fw-2,bh//2),pygame.SRCALPHA)
+        pygame.draw.rect(sh2,(255,255,255,40),(0,0,fw-2,bh//2),border_radius=2)
+        bar.blit(sh2,(1,1))
+    return bar
+
+def draw_sidebar(surf,game,t):
+    surf.blit(layers.get(("sidebar",current_theme_idx,game.mode),_build_sidebar),(FIELD_W,0))
+    x=FIELD_W+16; y=188
 
     # Score
-    draw_text(surf,font_xs,"Score",x,y,theme["silver"]); y+=18
     sc_color=theme["text"]
-    st=font_score.render(f"{game.score:,}",True,sc_color)
+    st=render_text(font_score,f"{game.score:,}",sc_color)
+    st_sh=render_text(font_score,f"{game.score:,}",sc_color,120)
     if game.eat_anim>0:
         sc2=1+0.15*game.eat_anim
         st=pygame.transform.smoothscale(st,(max(1,int(st.get_width()*sc2)),max(1,int(st.get_height()*sc2))))
-    st_sh=font_score.render(f"{game.score:,}",True,(0,0,0)); st_sh.set_alpha(120)
-    if game.eat_anim>0:
-        st_sh=pygame.transform.smoothscale(st_sh,(st.get_width(),st.get_height()))
-    surf.blit(st_sh,(x+1,y+1)); surf.blit(st,(x,y)); y+=40
+        st_sh=pygame.transform.smoothscale(st_sh,(st.get_width(),st.get_height())); st_sh.set_alpha(120)
+    surf.blit(st_sh,(x+1,y+1)); surf.blit(st,(x,y)); y+=58
 
     # Level
-    draw_text(surf,font_xs,"Level",x,y,theme["silver"]); y+=18
     lc=get_rainbow(t) if game.levelup_anim>0 else theme["accent"]
-    draw_text(surf,font_hud,f"{game.level}",x,y,lc); y+=28
+    draw_text(surf,font_hud,f"{game.level}",x,y,lc); y+=46
 
     # Length
-    draw_text(surf,font_xs,"Length",x,y,theme["silver"]); y+=18
     draw_text(surf,font_hud,f"{len(game.snake)}",x,y,theme["text"]); y+=28
 
     # Combo
@@ -750,19 +901,12 @@ def draw_sidebar(surf,game,t):
         draw_text(surf,font_hud,f"x{game.combo}",x+combo_ox,y,cc); y+=26
         bw=SIDEBAR_W-36; frac=max(0,game.combo_timer/3.0)
         pygame.draw.rect(surf,tuple(max(0,c-150) for c in cc),(x,y,bw,4),border_radius=2)
-        pygame.draw.rect(surf,cc,(x,y,int(bw*frac),4),border_radius=2); y+=14
-    else: y+=58
+        pygame.draw.rect(surf,cc,(x,y,int(bw*frac),4),border_radius=2)
 
-    pygame.draw.line(surf,dc,(x,y),(x+SIDEBAR_W-32,y),1); y+=10
-    draw_text(surf,font_xs,"Speed",x,y,theme["silver"]); y+=18
-    bw=SIDEBAR_W-36; bh=8; spd=min(1.0,(1/game.move_interval)*10/100)
-    pygame.draw.rect(surf,tuple(max(0,c-180) for c in theme["accent"]),(x,y,bw,bh),border_radius=3)
-    bc2=theme["danger"] if spd>0.7 else theme["accent"]; fw=int(bw*spd)
-    pygame.draw.rect(surf,bc2,(x,y,fw,bh),border_radius=3)
-    if fw>4:
-        sh2=pygame.Surface((fw-2,bh//2),pygame.SRCALPHA)
-        pygame.draw.rect(sh2,(255,255,255,40),(0,0,fw-2,bh//2),border_radius=2)
-        surf.blit(sh2,(x+1,y+1))
+    y=SIDEBAR_SPEED_Y
+    bw=SIDEBAR_W-36; spd=min(1.0,(1/game.move_interval)*10/100)
+    bc2=tuple(theme["danger"] if spd>0.7 else theme["accent"])
+    surf.blit(layers.get(("speed",current_theme_idx,int(bw*spd),bc2),_build_speed_bar),(x,y))
     y+=20
 
     if game.invuln_timer>0:
@@ -770,11 +914,9 @@ def draw_sidebar(surf,game,t):
     if game.rainbow_timer>0:
         draw_text(surf,font_xs,f"Rainbow {game.rainbow_timer:.1f}s",x,y,get_rainbow(t)); y+=18
 
-    y=HEIGHT-55; pygame.draw.line(surf,dc,(x,y),(x+SIDEBAR_W-32,y),1); y+=8
+    y=HEIGHT-47
     m=int(game.total_time//60); s=int(game.total_time%60)
-    draw_text(surf,font_sm,f"Time  {m:02d}:{s:02d}",x,y,theme["silver"]); y+=24
-    dim_hint2=lerp_color(theme["silver"],theme["sidebar_bg"],0.3)
-    draw_text(surf,font_xs,"P = Pause   Esc = Menu",x,y,dim_hint2)
+    draw_text(surf,font_sm,f"Time  {m:02d}:{s:02d}",x,y,theme["silver"])
 
 # ── DEATH SCREEN ──────────────────────────────────────────────────────────
 def draw_death_screen(surf,game,t):
@@ -808,7 +950,7 @@ def draw_death_screen(surf,game,t):
     tt.set_alpha(int(255*anim)); surf.blit(tt,(cx2-tt.get_width()//2,268))
 
     # High scores
-    data=load_data(); ms=data["scores"].get(game.mode,[])
+    ms=store.scores(game.mode)
     if ms and anim>0.5:
         a2=min(1.0,(anim-0.5)*4)
         hs=font_sm.render("High Scores",True,(255,215,0)); hs.set_alpha(int(255*a2))
@@ -834,7 +976,7 @@ _menu_arrow_phase = 0.0   # arrow bounce phase
 def draw_menu(surf,selected,t):
     global _menu_anim_sel, _menu_anim_prev, _menu_anim_glow, _menu_arrow_phase
     surf.fill(theme["bg"]); cx2=WIDTH//2
-    for star in bg_stars: star.draw(surf,t)
+    bg_stars.draw(surf,t=t)
 
     # ── Title — white with thin black outline ──
     # Gentle float animation for title
@@ -874,9 +1016,8 @@ def draw_menu(surf,selected,t):
     # Detect selection change for burst
     if _menu_anim_prev != selected:
         sel_cy = sy + selected * ITEM_H + bh // 2
-        for _ in range(8):
-            particles.append(Particle(cx2 + random.randint(-80, 80), sel_cy + random.randint(-10, 10),
-                theme["accent"], spd=(0.5, 2.5), life=(0.3, 0.7), sz=(1, 3), shape="circle", acurve="smooth"))
+        particles.spawn([cx2 + random.randint(-80, 80) for _ in range(8)], [sel_cy + random.randint(-10, 10) for _ in range(8)],
+            8, theme["accent"], spd=(0.5, 2.5), life=(0.3, 0.7), sz=(1, 3), shape="circle", acurve="smooth")
         _menu_anim_prev = selected
 
     # Glow and arrow phase
@@ -954,8 +1095,8 @@ def draw_menu(surf,selected,t):
 
     # Subtle ambient particles
     if random.random() < 0.1:
-        particles.append(Particle(random.randint(0, WIDTH), random.randint(0, HEIGHT),
-            random.choice(theme["particles"]), spd=(0.2, 1.0), life=(0.5, 1.5), sz=(1, 2), shape="circle", acurve="smooth"))
+        particles.spawn(random.randint(0, WIDTH), random.randint(0, HEIGHT), 1,
+            None, spd=(0.2, 1.0), life=(0.5, 1.5), sz=(1, 2), shape="circle", acurve="smooth")
 
 def draw_pause(surf,t):
     ov=pygame.Surface((WIDTH,HEIGHT),pygame.SRCALPHA); ov.fill((0,0,0,180)); surf.blit(ov,(0,0))
@@ -978,36 +1119,45 @@ def draw_levelup_overlay(surf,game,t):
             surf.blit(ls,(0,ly))
 
 # ── MAIN LOOP ─────────────────────────────────────────────────────────────
-def main():
+def main(replay=None):
     global shake_timer,shake_intensity,flash_timer,slow_mo_timer
 
     state="menu"; menu_sel=0; game=None; mode_keys=["classic","walls","speed"]; dead_saved=False
+    warm_particle_sprites()
+    frame_ms=[]  # per-frame work time, reported at the end of a replay
+    if replay: game=Game(replay.mode,replay=replay); state="playing"
 
     running=True
     while running:
-        raw_dt=clock.tick(FPS)/1000.0; t=pygame.time.get_ticks()/1000.0
+        raw_dt=clock.tick(FPS)/1000.0; t=pygame.time.get_ticks()/1000.0; profiler.start()
         if slow_mo_timer>0: slow_mo_timer-=raw_dt; dt=raw_dt*0.3
         else: dt=raw_dt
 
-        particles[:]=[p for p in particles if p.update(dt)]
+        particles.update(dt); profiler.lap("particles")
         floating_texts[:]=[ft for ft in floating_texts if ft.update(dt)]
         trails[:]=[tr for tr in trails if tr.update(dt)]
-        for star in bg_stars: star.update(dt)
+        bg_stars.update(dt)
         if flash_timer>0: flash_timer-=dt
 
         if shake_timer>0:
             shake_timer-=dt; si=int(shake_intensity*(shake_timer/0.5 if shake_timer<0.5 else 1))
             ox=random.randint(-si,si) if si>0 else 0; oy=random.randint(-si,si) if si>0 else 0
         else: ox=oy=0
+        profiler.lap("update")
 
         for event in pygame.event.get():
             if event.type==pygame.QUIT: running=False
             if event.type==pygame.KEYDOWN:
+                if event.key==pygame.K_F3: profiler.toggle(); continue
                 if event.key==pygame.K_t and state in ("menu","playing","paused"):
-                    set_theme(current_theme_idx+1); save_theme(current_theme_idx)
+                    set_theme(current_theme_idx+1); store.set("theme",current_theme_idx); warm_particle_sprites()
                     snd_theme.play(); spawn_confetti(WIDTH//2,HEIGHT//2,20)
 
-                if state=="menu":
+                if replay:
+                    if event.key==pygame.K_ESCAPE or (state=="dead" and event.key==pygame.K_RETURN): running=False
+                    elif event.key in (pygame.K_p,pygame.K_SPACE) and state in ("playing","paused"):
+                        state="paused" if state=="playing" else "playing"
+                elif state=="menu":
                     if event.key in (pygame.K_UP,pygame.K_w): menu_sel=(menu_sel-1)%4; snd_select.play()
                     elif event.key in (pygame.K_DOWN,pygame.K_s): menu_sel=(menu_sel+1)%4; snd_select.play()
                     elif event.key==pygame.K_RETURN:
@@ -1017,33 +1167,42 @@ def main():
                             game=Game(mode_keys[menu_sel]); state="playing"; dead_saved=False
                             spawn_firework(FIELD_W//2,FIELD_H//2,theme["accent"])
                 elif state=="playing":
-                    if event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; particles.clear(); floating_texts.clear(); trails.clear()
+                    if event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; game.stop_recording(); particles.clear(); floating_texts.clear(); trails.clear()
                     elif event.key in (pygame.K_p,pygame.K_SPACE): state="paused"
                     else: game.handle_input(event.key)
                 elif state=="paused":
                     if event.key in (pygame.K_p,pygame.K_SPACE): state="playing"
-                    elif event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; particles.clear(); floating_texts.clear(); trails.clear()
+                    elif event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; game.stop_recording(); particles.clear(); floating_texts.clear(); trails.clear()
                 elif state=="dead":
                     if event.key==pygame.K_RETURN:
                         game.reset(); state="playing"; dead_saved=False
                         spawn_firework(FIELD_W//2,FIELD_H//2,theme["accent"])
-                    elif event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; particles.clear(); floating_texts.clear(); trails.clear()
+                    elif event.key==pygame.K_ESCAPE: state="menu"; _menu_anim_prev=-1; game.stop_recording(); particles.clear(); floating_texts.clear(); trails.clear()
 
+        profiler.lap("event"); work_t0=time.perf_counter()
         if state=="playing" and game:
             game.update(dt)
             if not game.alive and state=="playing":
                 state="dead"
-                if not dead_saved: add_score(game.mode,game.score); dead_saved=True
+                if replay: report_replay(replay,game,frame_ms)
+                elif not dead_saved:
+                    store.add_score(game.mode,game.score,level=game.level,steps=game.steps,length=len(game.snake),
+                                    replay=os.path.basename(game.recorder.path) if game.recorder else None)
+                    dead_saved=True
+            elif replay and replay.end is None and replay.exhausted and game.steps>replay.last_step:
+                report_replay(replay,game,frame_ms); running=False  # recording stopped mid-run
         elif state=="dead" and game: game.update(dt)
+        profiler.lap("update")
 
-        screen.fill(theme["bg"])
         if state=="menu":
+            screen.fill(theme["bg"])
             draw_menu(screen,menu_sel,t)
-            for p in particles: p.draw(screen)
+            profiler.lap("draw"); particles.draw(screen); profiler.lap("particles")
         else:
-            field=pygame.Surface((FIELD_W,FIELD_H)); field.fill(theme["bg"])
-            for star in bg_stars: star.draw(field,t)
-            draw_grid(field)
+            # Field and sidebar cover the window; only a shaken field exposes the edges.
+            if ox or oy: screen.fill(theme["bg"])
+            field.blit(background_layer(),(0,0))
+            bg_stars.draw(field,t=t)
             if game:
                 draw_walls(field,game,t)
                 for tr in trails: tr.draw(field)
@@ -1058,20 +1217,84 @@ def main():
                     px2,py2=game.powerup
                     draw_powerup_orb(field,px2*CELL+CELL//2,py2*CELL+CELL//2,CELL//2,t,game.powerup_timer/8.0)
                 draw_snake(field,game,t); draw_levelup_overlay(field,game,t)
-            for p in particles:
-                if 0<=p.x<FIELD_W and 0<=p.y<FIELD_H: p.draw(field)
+            profiler.lap("draw"); particles.draw(field,(FIELD_W,FIELD_H)); profiler.lap("particles")
             for ft in floating_texts: ft.draw(field)
             if flash_timer>0:
-                fa=int(60*(flash_timer/0.15))
-                fs2=pygame.Surface((FIELD_W,FIELD_H),pygame.SRCALPHA); fs2.fill((*flash_color[:3],fa))
-                field.blit(fs2,(0,0))
+                fs2=layers.get(("flash",tuple(flash_color[:3])),_build_flash)
+                fs2.set_alpha(int(60*(flash_timer/0.15))); field.blit(fs2,(0,0))
             screen.blit(field,(ox,oy))
             if game: draw_sidebar(screen,game,t)
             if state=="paused": draw_pause(screen,t)
             elif state=="dead": draw_death_screen(screen,game,t)
 
-        pygame.display.flip()
-
-    pygame.quit(); sys.exit()
-
-if __name__=="__main__": main()
+        if replay and state=="playing": frame_ms.append((time.perf_counter()-work_t0)*1000)
+        if profiler.visible: profiler.draw(screen,font_prof,(8,FIELD_H-8))
+        profiler.lap("draw"); pygame.display.flip(); profiler.lap("flip"); profiler.frame(particles=len(particles))
+
+    if game: game.stop_recording()
+    store.close(); pygame.quit(); sys.exit()
+
+def report_replay(replay,game,frame_ms):
+    """Print how a rendered replay ended and the frame times it produced."""
+    end=replay.end; ok=bool(end) and end[1]==game.steps and end[2]==game.score
+    print(f"{replay.path}: steps={game.steps} score={game.score} recorded={end[2] if end else None}"
+          f" {'OK' if ok else 'MISMATCH' if end else 'INCOMPLETE'}")
+    if frame_ms:
+        ft=sorted(frame_ms); n=len(ft)
+        print(f"{n} frames  avg {sum(ft)/n:.2f} ms  p99 {ft[max(0,int(n*0.99)-1)]:.2f} ms  max {ft[-1]:.2f} ms")
+
+def bench_particles(count=10000,frames=600):
+    """Stress test: keep `count` particles alive and time update + draw."""
+    field=pygame.Surface((FIELD_W,FIELD_H)); ut=[]; dt_draw=[]
+    for _ in range(frames):
+        pygame.event.pump()
+        while len(particles)<count:
+            spawn_explosion(random.randint(40,FIELD_W-40),random.randint(40,FIELD_H-40),min(60,count-len(particles)))
+        t0=time.perf_counter(); particles.update(1/FPS); t1=time.perf_counter()
+        field.fill(theme["bg"]); particles.draw(field,(FIELD_W,FIELD_H)); t2=time.perf_counter()
+        screen.blit(field,(0,0)); pygame.display.flip(); ut.append(t1-t0); dt_draw.append(t2-t1)
+    ft=sorted(u+d for u,d in zip(ut,dt_draw)); avg=sum(ft)/frames
+    print(f"particles={count} frames={frames} backend={'numpy' if np is not None else 'array'}")
+    print(f"update avg {sum(ut)/frames*1000:.2f} ms  draw avg {sum(dt_draw)/frames*1000:.2f} ms")
+    print(f"frame avg {avg*1000:.2f} ms  p99 {ft[int(frames*0.99)-1]*1000:.2f} ms  (~{1/avg:.0f} FPS, budget {1000/FPS:.1f} ms)")
+
+def bench_snake(length=600,frames=600):
+    """Render a `length`-segment snake (plain, then rainbow) mid-move and time each frame."""
+    global RECORD
+    RECORD=False; game=Game("classic",seed=0)
+    path=[(x if y%2==0 else COLS-1-x,y) for y in range(ROWS) for x in range(COLS)][:length+1]
+    game.snake=deque(reversed(path[1:])); game.prev_positions=list(reversed(path[:-1]))
+    print(f"segments={len(game.snake)} frames={frames}")
+    for label in ("plain","rainbow"):
+        game.rainbow_timer=1e9 if label=="rainbow" else 0; snake_ms=[]; frame_ms=[]
+        for i in range(frames):
+            pygame.event.pump(); t=i/FPS; game.move_progress=(i%10)/10
+            t0=time.perf_counter(); field.blit(background_layer(),(0,0))
+            t1=time.perf_counter(); draw_snake(field,game,t); t2=time.perf_counter()
+            screen.blit(field,(0,0)); draw_sidebar(screen,game,t); t3=time.perf_counter()
+            pygame.display.flip(); snake_ms.append((t2-t1)*1000); frame_ms.append((t3-t0)*1000)
+        ft=sorted(frame_ms); avg=sum(ft)/frames
+        print(f"{label:8s} draw_snake avg {sum(snake_ms)/frames:.2f} ms  frame avg {avg:.2f} ms"
+              f"  p99 {ft[int(frames*0.99)-1]:.2f} ms  (~{1000/avg:.0f} FPS, budget {1000/FPS:.1f} ms)")
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser(description="Neon Snake")
+    ap.add_argument("--bench-particles",type=int,nargs="?",const=10000,metavar="N",
+                    help="run the particle stress benchmark with N live particles and exit")
+    ap.add_argument("--bench-snake",type=int,nargs="?",const=600,metavar="N",
+                    help="time rendering of an N-segment snake and exit")
+    ap.add_argument("--replay",metavar="FILE",help="play back a recorded run (files are saved in replays/)")
+    ap.add_argument("--fast",action="store_true",help="with --replay: re-simulate without rendering and check the score")
+    ap.add_argument("--no-record",action="store_true",help="do not record runs to replays/")
+    ap.add_argument("--profile",metavar="FILE",help="write per-frame phase timings to FILE (.csv or .jsonl); F3 shows them in game")
+    args=ap.parse_args()
+    if args.bench_particles: bench_particles(args.bench_particles); pygame.quit(); sys.exit()
+    if args.bench_snake: bench_snake(args.bench_snake); pygame.quit(); sys.exit()
+    if args.no_record: RECORD=False
+    if args.profile: profiler.open(args.profile)
+    if args.replay and args.fast:
+        res=verify_replay(args.replay)
+        print(f"{args.replay}: mode={res['mode']} steps={res['steps']} score={res['score']}"
+              f" recorded={res['recorded_score']} {'OK' if res['match'] else 'MISMATCH'}")
+        pygame.quit(); sys.exit(0 if res["match"] else 1)
+    main(ReplayReader(args.replay) if args.replay else None)
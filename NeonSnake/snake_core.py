@@ -0,0 +1,501 @@
+"""Neon Snake rules without pygame: a seedable, fixed-timestep simulation.
+
+snake.pyw subclasses SnakeSim and turns the events returned by step() into
+sounds, particles and floating texts; bots, fuzzers and replays drive it
+directly:
+
+    sim = SnakeSim("walls", seed=42)
+    while sim.alive: events = sim.step(bot(sim))
+"""
+import random
+import time
+import argparse
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try: import numpy as np
+except ImportError: np=None  # SnakeBatch needs numpy; run_games falls back to SnakeSim
+
+# ── CONSTANTS ─────────────────────────────────────────────────────────────
+COLS, ROWS = 28, 23
+MIN_COLS, MIN_ROWS = 8, 8   # smallest board SnakeSim accepts
+UP, DOWN, LEFT, RIGHT = (0,-1), (0,1), (-1,0), (1,0)
+ACTIONS = (UP, DOWN, LEFT, RIGHT)   # step() also takes an index into this
+POWERUPS = ("invuln","rainbow","shrink")
+
+# step() returns a list of (kind, x, y, a, b) tuples; x, y are grid cells:
+#   ("eat",     x, y, points, combo)      ("level",   x, y, level, None)
+#   ("bonus",   x, y, points, None)       ("powerup", x, y, kind, detail)
+#   ("die",     x, y, None, None)         ("win",     x, y, None, None)
+# detail is the list of trimmed cells for "shrink", the points awarded when
+# the snake was too short to trim, and None otherwise.
+EAT, LEVEL, BONUS, POWERUP, DIE, WIN = "eat", "level", "bonus", "powerup", "die", "win"
+
+MODES={"classic":{"name":"Classic","desc":"No walls, wrap around edges","walls":False},
+       "walls":{"name":"Walls","desc":"Walls kill! Level obstacles","walls":True},
+       "speed":{"name":"Speed","desc":"Starts fast, gets faster!","walls":False}}
+
+def generate_walls(level,cols=COLS,rows=ROWS):
+    """Wall cells for level. The layout is drawn on the default COLS x ROWS
+    board and scaled to cols x rows, so every cell stays on the board."""
+    X=lambda v: v*cols//COLS; Y=lambda v: v*rows//ROWS
+    w=set()
+    if level>=2:
+        for i in range(X(5),X(10)): w.add((i,Y(8)));w.add((cols-1-i,rows-1-Y(8)))
+    if level>=3:
+        for i in range(Y(8),Y(16)): w.add((X(14),i))
+    if level>=4:
+        for i in range(X(3),X(7)): w.add((i,Y(15)));w.add((cols-1-i,Y(15)))
+    if level>=5:
+        for i in range(X(6),X(18)): w.add((i,Y(5)));w.add((i,rows-1-Y(5)))
+    return w
+
+# ── FREE-CELL INDEX ───────────────────────────────────────────────────────
+class FreeCells:
+    """Indexable set of cell ids: add, discard and random choice are all O(1).
+
+    items holds the members in no particular order and pos[c] is c's index
+    in items (-1 when absent); discard swaps the last member into the hole.
+    """
+    __slots__=("items","pos")
+    def __init__(self,n): self.items=list(range(n)); self.pos=list(range(n))
+    def __len__(self): return len(self.items)
+    def __contains__(self,c): return self.pos[c]>=0
+    def add(self,c):
+        if self.pos[c]<0: self.pos[c]=len(self.items); self.items.append(c)
+    def discard(self,c):
+        i=self.pos[c]
+        if i<0: return
+        last=self.items.pop()
+        if last!=c: self.items[i]=last; self.pos[last]=i
+        self.pos[c]=-1
+
+# ── SIMULATION ────────────────────────────────────────────────────────────
+class SnakeSim:
+    """Game rules only. One step() is one grid move; timers advance by move_interval.
+
+    snake is a deque of (x, y) cells, head first. occ counts the segments on
+    each cell (id x*rows+y) and free indexes the cells holding neither snake
+    nor wall, so collisions and item placement cost O(1) on any board size.
+    """
+    def __init__(self,mode="classic",seed=None,cols=COLS,rows=ROWS):
+        if cols<MIN_COLS or rows<MIN_ROWS:
+            raise ValueError(f"board must be at least {MIN_COLS}x{MIN_ROWS}, got {cols}x{rows}")
+        self.mode=mode; self.cfg=MODES[mode]; self.seed=seed; self.cols=cols; self.rows=rows
+        self.rng=random.Random(seed); self.events=[]; self.recorder=None; self.reset()
+
+    def reset(self,seed=None):
+        if seed is not None: self.seed=seed; self.rng.seed(seed)
+        cx2,cy2=self.cols//2,self.rows//2
+        self.snake=deque([(cx2,cy2),(cx2-1,cy2),(cx2-2,cy2)])
+        self.occ=bytearray(self.cols*self.rows); self.free=FreeCells(self.cols*self.rows)
+        for x,y in self.snake: self._occupy(x,y)
+        self.direction=RIGHT; self.steps=0
+        self.score=0; self.level=1; self.food=None; self.bonus=None; self.bonus_timer=0
+        self.alive=True; self.win=False
+        self.combo=0; self.combo_timer=0; self.eaten_count=0; self.total_time=0
+        self.speed_mult=3.0 if self.mode=="speed" else 1.0
+        self.walls=set(); self.invuln_timer=0; self.rainbow_timer=0
+        self.powerup=None; self.powerup_timer=0
+        self.base_interval=0.12 if self.mode=="speed" else 0.15
+        self.food_type="apple"; self.events.clear()
+        self.place_food()
+
+    @property
+    def move_interval(self):
+        return max(0.04,self.base_interval-(self.level-1)*0.008)/self.speed_mult
+
+    def _occupy(self,x,y):
+        c=x*self.rows+y; self.occ[c]+=1; self.free.discard(c)
+
+    def _vacate(self,x,y):
+        c=x*self.rows+y; self.occ[c]-=1
+        if not self.occ[c] and (x,y) not in self.walls: self.free.add(c)
+
+    def set_walls(self,walls):
+        for x,y in self.walls-walls:
+            if not self.occ[x*self.rows+y]: self.free.add(x*self.rows+y)
+        for x,y in walls: self.free.discard(x*self.rows+y)
+        self.walls=walls
+
+    def blocked(self,x,y):
+        """True if moving the head onto in-bounds cell (x, y) would kill without a shield."""
+        n=self.occ[x*self.rows+y]
+        return (x,y) in self.walls or (n>1 or (n==1 and (x,y)!=self.snake[-1]))
+
+    def _pick(self,avoid=None):
+        """Random free cell other than avoid, or None when there is none."""
+        items=self.free.items
+        if avoid is not None:
+            a=avoid[0]*self.rows+avoid[1]
+            if a in self.free and len(items)==1: return None
+        else: a=-1
+        if not items: return None
+        c=self.rng.choice(items)
+        while c==a: c=self.rng.choice(items)
+        return (c//self.rows,c%self.rows)
+
+    def place_food(self):
+        f=self._pick()
+        if f: self.food=f; self.food_type=self.rng.choice(["apple","apple","cherry"])
+        else:
+            self.win=True; self.alive=False
+            self.events.append((WIN,self.snake[0][0],self.snake[0][1],None,None))
+            if self.recorder: self.recorder.end(self.steps,self.score)
+
+    def place_bonus(self):
+        f=self._pick(self.food)
+        if f: self.bonus=f; self.bonus_timer=6.0
+
+    def place_powerup(self):
+        f=self._pick(self.food)
+        if f: self.powerup=f; self.powerup_timer=8.0
+
+    def _tick(self,dt):
+        self.total_time+=dt; self.combo_timer-=dt
+        if self.combo_timer<=0: self.combo=0
+        if self.bonus:
+            self.bonus_timer-=dt
+            if self.bonus_timer<=0: self.bonus=None
+        if self.powerup:
+            self.powerup_timer-=dt
+            if self.powerup_timer<=0: self.powerup=None
+        if self.invuln_timer>0: self.invuln_timer-=dt
+        if self.rainbow_timer>0: self.rainbow_timer-=dt
+
+    def step(self,action=None):
+        """Advance one move. action: None (keep going), a direction or an ACTIONS index."""
+        ev=self.events; ev.clear()
+        if not self.alive: return ev
+        if action is not None:
+            if action.__class__ is int: action=ACTIONS[action]
+            if self.recorder: self.recorder.action(self.steps,action)
+            dx,dy=self.direction
+            if action!=(-dx,-dy): self.direction=action
+        self._tick(self.move_interval); self.steps+=1
+
+        snake=self.snake; hx,hy=snake[0]; dx,dy=self.direction; nx,ny=hx+dx,hy+dy
+        cols,rows=self.cols,self.rows
+        if self.cfg["walls"]:
+            if nx<0 or nx>=cols or ny<0 or ny>=rows:
+                if self.invuln_timer<=0: self.die(); return ev
+                else: nx%=cols; ny%=rows
+        else: nx%=cols; ny%=rows
+
+        head=(nx,ny); occ=self.occ; c=nx*rows+ny; n=occ[c]
+        if self.invuln_timer<=0 and ((n and (n>1 or head!=snake[-1])) or head in self.walls):
+            self.die(); return ev
+        snake.appendleft(head); occ[c]=n+1
+        if not n: self.free.discard(c)
+
+        if head==self.food:
+            self.eaten_count+=1; self.combo+=1; self.combo_timer=3.0
+            pts=10*self.level*max(1,self.combo); self.score+=pts
+            ev.append((EAT,nx,ny,pts,self.combo))
+            if self.eaten_count%8==0:
+                self.level+=1; ev.append((LEVEL,nx,ny,self.level,None))
+                if self.cfg["walls"]: self.set_walls(generate_walls(self.level,cols,rows))
+            self.place_food()   # after the level's walls exist, so food never lands inside one
+            if self.rng.random()<0.3 and not self.bonus: self.place_bonus()
+            if self.rng.random()<0.15 and not self.powerup and self.level>=2: self.place_powerup()
+        else:
+            tx,ty=snake.pop(); c=tx*rows+ty; occ[c]-=1
+            if not occ[c] and (not self.walls or (tx,ty) not in self.walls): self.free.add(c)
+
+        if self.bonus and head==self.bonus:
+            p2=50*self.level; self.score+=p2; self.bonus=None
+            ev.append((BONUS,nx,ny,p2,None))
+
+        if self.powerup and head==self.powerup:
+            ptype=self.rng.choice(POWERUPS); detail=None
+            if ptype=="invuln": self.invuln_timer=5.0
+            elif ptype=="rainbow": self.rainbow_timer=6.0
+            elif len(snake)>5:
+                detail=[snake.pop() for _ in range(len(snake)//3)][::-1]
+                for x,y in detail: self._vacate(x,y)
+            else: detail=30*self.level; self.score+=detail
+            self.powerup=None; ev.append((POWERUP,nx,ny,ptype,detail))
+        return ev
+
+    def die(self):
+        self.alive=False
+        self.events.append((DIE,self.snake[0][0],self.snake[0][1],None,None))
+        if self.recorder: self.recorder.end(self.steps,self.score)
+
+    def state(self):
+        """Plain-data snapshot for logging and regression checks."""
+        return {"mode":self.mode,"steps":self.steps,"score":self.score,"level":self.level,
+                "alive":self.alive,"win":self.win,"snake":list(self.snake),"food":self.food,
+                "bonus":self.bonus,"powerup":self.powerup}
+
+# ── REPLAYS ───────────────────────────────────────────────────────────────
+# A replay is a header followed by fixed-size records, appended as the game runs:
+#   header  "NSR1", version, mode index, seed, cols, rows
+#   record  kind, step, value   kind b"A": action index given at that step
+#                               kind b"E": run ended at that step with score = value
+# Since SnakeSim is deterministic, seed + actions reproduce the run exactly.
+REPLAY_MAGIC=b"NSR1"; REPLAY_VERSION=1
+_HEADER=struct.Struct("<4sBBQHH"); _RECORD=struct.Struct("<cII")
+
+class ReplayWriter:
+    """Streams one run to disk; assign it to SnakeSim.recorder after reset."""
+    def __init__(self,path,mode,seed,cols=COLS,rows=ROWS):
+        self.path=path; self.f=open(path,"wb")
+        self.f.write(_HEADER.pack(REPLAY_MAGIC,REPLAY_VERSION,list(MODES).index(mode),seed,cols,rows))
+    def action(self,step,action):
+        if self.f: self.f.write(_RECORD.pack(b"A",step,ACTIONS.index(action)))
+    def end(self,step,score):
+        if self.f: self.f.write(_RECORD.pack(b"E",step,score)); self.close()
+    def close(self):
+        if self.f: self.f.close(); self.f=None
+
+class ReplayReader:
+    """Reads a replay record by record; action(step) feeds SnakeSim.step in order."""
+    def __init__(self,path):
+        self.path=path; self.f=open(path,"rb")
+        magic,ver,mi,self.seed,self.cols,self.rows=_HEADER.unpack(self.f.read(_HEADER.size))
+        if magic!=REPLAY_MAGIC or ver!=REPLAY_VERSION: raise ValueError(f"{path}: not a Neon Snake replay")
+        self.mode=list(MODES)[mi]; self.end=None; self.last_step=0; self._pending=self._read()
+
+    def _read(self):
+        b=self.f.read(_RECORD.size)
+        if len(b)<_RECORD.size: self.close(); return None
+        rec=_RECORD.unpack(b); self.last_step=rec[1]
+        if rec[0]==b"E": self.end=rec
+        return rec
+
+    def action(self,step):
+        """Recorded action for `step`, or None if the player gave none."""
+        rec=self._pending; act=None
+        while rec and rec[1]<=step:
+            if rec[0]==b"A" and rec[1]==step: act=ACTIONS[rec[2]]
+            rec=self._read()
+        self._pending=rec; return act
+
+    @property
+    def exhausted(self): return self._pending is None
+
+    def sim(self):
+        return SnakeSim(self.mode,self.seed,self.cols,self.rows)
+
+    def close(self):
+        if self.f: self.f.close(); self.f=None
+
+def verify_replay(path):
+    """Re-simulate a replay headless; returns a dict comparing recorded and simulated results."""
+    r=ReplayReader(path); sim=r.sim()
+    while sim.alive and not (r.exhausted and sim.steps>=r.last_step):
+        sim.step(r.action(sim.steps))
+    r.close(); rec=r.end
+    return {"mode":r.mode,"seed":r.seed,"steps":sim.steps,"score":sim.score,"complete":rec is not None,
+            "recorded_steps":rec[1] if rec else None,"recorded_score":rec[2] if rec else None,
+            "match":bool(rec) and rec[1]==sim.steps and rec[2]==sim.score}
+
+def prune_replays(folder,keep=50):
+    """Delete all but the `keep` newest .nsr files in folder. Runs saved within the
+    filesystem's timestamp resolution are ordered by the time in their name
+    (mode-YYYYmmdd-HHMMSS-seed.nsr)."""
+    try: files=sorted((f for f in os.listdir(folder) if f.endswith(".nsr")),
+                      key=lambda f: (os.path.getmtime(os.path.join(folder,f)),f.partition("-")[2]))
+    except OSError: return
+    for f in files[:-keep] if keep else files:
+        try: os.remove(os.path.join(folder,f))
+        except OSError: pass
+
+# ── BATCHED SIMULATION ────────────────────────────────────────────────────
+CELLS=COLS*ROWS
+WALL_LEVELS=5   # generate_walls adds nothing past level 5
+
+class SnakeBatch:
+    """N independent boards of one mode advanced together with numpy.
+
+    Cells are flat indices x*ROWS+y. Each body is a ring buffer of cells and
+    occ[n, cell] counts the segments on a cell, so collisions are array
+    lookups. Bonus stars and powerups are not simulated here; they only add
+    score on top of the food/combo/level curve this is meant to balance.
+    """
+    def __init__(self,n,mode="classic",seed=None):
+        if np is None: raise RuntimeError("SnakeBatch needs numpy")
+        self.n=n; self.mode=mode; self.cfg=MODES[mode]; self.rng=np.random.default_rng(seed)
+        self.speed_mult=3.0 if mode=="speed" else 1.0
+        self.base_interval=0.12 if mode=="speed" else 0.15
+        self.wall_grid=np.zeros((WALL_LEVELS+1,CELLS),bool)
+        if self.cfg["walls"]:
+            for lv in range(1,WALL_LEVELS+1):
+                for x,y in generate_walls(lv): self.wall_grid[lv,x*ROWS+y]=True
+        self.dx=np.array([a[0] for a in ACTIONS]); self.dy=np.array([a[1] for a in ACTIONS])
+        self.body=np.zeros((n,CELLS+1),np.int32); self.occ=np.zeros((n,CELLS),np.uint8)
+        self.head=np.zeros(n,np.int32); self.length=np.zeros(n,np.int32)
+        self.direction=np.zeros(n,np.int8); self.food=np.zeros(n,np.int32)
+        self.score=np.zeros(n,np.int64); self.level=np.ones(n,np.int32); self.eaten=np.zeros(n,np.int32)
+        self.combo=np.zeros(n,np.int32); self.combo_timer=np.zeros(n); self.total_time=np.zeros(n)
+        self.steps=np.zeros(n,np.int64); self.alive=np.zeros(n,bool); self.win=np.zeros(n,bool)
+        self.reset()
+
+    def reset(self,mask=None):
+        """Reset every board, or only those selected by a bool mask / index array."""
+        idx=np.arange(self.n) if mask is None else (np.flatnonzero(mask) if np.asarray(mask).dtype==bool else np.asarray(mask))
+        if not len(idx): return
+        cx2,cy2=COLS//2,ROWS//2; start=[(cx2-2)*ROWS+cy2,(cx2-1)*ROWS+cy2,cx2*ROWS+cy2]  # tail..head
+        self.occ[idx]=0; self.body[idx,:3]=start; self.occ[idx[:,None],start]=1
+        self.head[idx]=2; self.length[idx]=3; self.direction[idx]=ACTIONS.index(RIGHT)
+        for arr in (self.score,self.eaten,self.combo,self.combo_timer,self.total_time,self.steps): arr[idx]=0
+        self.level[idx]=1; self.alive[idx]=True; self.win[idx]=False
+        self._place_food(idx)
+
+    @property
+    def move_interval(self):
+        return np.maximum(0.04,self.base_interval-(self.level-1)*0.008)/self.speed_mult
+
+    def _walls(self,idx,cells):
+        return self.wall_grid[np.minimum(self.level[idx],WALL_LEVELS),cells]
+
+    def _place_food(self,idx):
+        free=(self.occ[idx]==0)&~self.wall_grid[np.minimum(self.level[idx],WALL_LEVELS)]
+        keys=self.rng.random(free.shape); keys[~free]=-1
+        self.food[idx]=keys.argmax(1)
+        full=~free.any(1)
+        if full.any(): self.win[idx[full]]=True; self.alive[idx[full]]=False
+
+    def _next(self,idx,d):
+        """Next head cell and whether moving there kills, for boards idx moving in directions d."""
+        h=self.body[idx,self.head[idx]]; nx=h//ROWS+self.dx[d]; ny=h%ROWS+self.dy[d]
+        oob=((nx<0)|(nx>=COLS)|(ny<0)|(ny>=ROWS)) if self.cfg["walls"] else np.zeros(len(idx),bool)
+        cell=(nx%COLS)*ROWS+ny%ROWS
+        tail=self.body[idx,(self.head[idx]-self.length[idx]+1)%(CELLS+1)]
+        hit=oob|self._walls(idx,cell)|(self.occ[idx,cell]>(cell==tail))
+        return cell,tail,hit
+
+    def step(self,actions=None):
+        """Advance every live board one move; returns (ate, died) bool arrays."""
+        ate=np.zeros(self.n,bool); died=np.zeros(self.n,bool)
+        idx=np.flatnonzero(self.alive)
+        if not len(idx): return ate,died
+        if actions is not None:
+            a=np.asarray(actions)[idx]; ok=a!=(self.direction[idx]^1)   # ACTIONS pairs opposites
+            self.direction[idx[ok]]=a[ok]
+        dt=self.move_interval[idx]
+        self.total_time[idx]+=dt; self.combo_timer[idx]-=dt; self.steps[idx]+=1
+        self.combo[idx[self.combo_timer[idx]<=0]]=0
+
+        cell,tail,hit=self._next(idx,self.direction[idx])
+        dead=idx[hit]; died[dead]=True; self.alive[dead]=False
+        live=idx[~hit]; cell=cell[~hit]; tail=tail[~hit]
+        self.head[live]=(self.head[live]+1)%(CELLS+1); self.body[live,self.head[live]]=cell
+        self.occ[live,cell]+=1; self.length[live]+=1
+
+        eat=cell==self.food[live]; e=live[eat]; ate[e]=True
+        if len(e):
+            self.eaten[e]+=1; self.combo[e]+=1; self.combo_timer[e]=3.0
+            self.score[e]+=10*self.level[e]*np.maximum(1,self.combo[e])
+            self.level[e[self.eaten[e]%8==0]]+=1
+            self._place_food(e)
+        ne=live[~eat]; self.occ[ne,tail[~eat]]-=1; self.length[ne]-=1
+        return ate,died
+
+    def greedy_actions(self):
+        """Vectorized greedy_bot: nearest-to-food move that does not kill outright."""
+        idx=np.arange(self.n); f=self.food; fx=f//ROWS; fy=f%ROWS; best=np.full(self.n,np.inf); act=self.direction.copy()
+        for k in range(len(ACTIONS)):
+            d=np.full(self.n,k,np.int8); cell,_,hit=self._next(idx,d)
+            h=self.body[idx,self.head]; nx=h//ROWS+self.dx[k]; ny=h%ROWS+self.dy[k]
+            if not self.cfg["walls"]: nx%=COLS; ny%=ROWS
+            cost=np.where(hit|(self.direction==k^1),np.inf,np.abs(nx-fx)+np.abs(ny-fy))
+            better=cost<best; act[better]=k; best[better]=cost[better]
+        return act
+
+    def run(self,policy="greedy",max_steps=20000,max_idle=4*CELLS):
+        """Play every board to the end and return per-game results.
+
+        A game also ends after max_steps moves, or as stalled after max_idle
+        moves without food (the greedy bot circles forever behind a wall).
+        """
+        idle=np.zeros(self.n,np.int32); stalled=np.zeros(self.n,bool)
+        while self.alive.any() and self.steps.max()<max_steps:
+            ate,_=self.step(self.greedy_actions() if policy=="greedy" else self.rng.integers(0,len(ACTIONS),self.n))
+            idle+=1; idle[ate]=0
+            stuck=self.alive&(idle>max_idle); stalled|=stuck; self.alive[stuck]=False
+        return {"score":self.score.tolist(),"level":self.level.tolist(),"steps":self.steps.tolist(),
+                "time":self.total_time.tolist(),"win":self.win.tolist(),"stalled":stalled.tolist()}
+
+def _play_chunk(args):
+    n,mode,seed,policy,max_steps=args
+    if np is not None: return SnakeBatch(n,mode,seed).run(policy,max_steps)
+    out={"score":[],"level":[],"steps":[],"time":[],"win":[],"stalled":[]}; rng=random.Random(seed)
+    for i in range(n):
+        sim=SnakeSim(mode,rng.random()); idle=0
+        while sim.alive and sim.steps<max_steps and idle<=4*CELLS:
+            idle=0 if any(e[0]==EAT for e in sim.step(greedy_bot(sim) if policy=="greedy" else rng.randrange(4))) else idle+1
+        for k,v in (("score",sim.score),("level",sim.level),("steps",sim.steps),("time",sim.total_time),
+                    ("win",sim.win),("stalled",sim.alive)): out[k].append(v)
+    return out
+
+def run_games(games,mode="classic",seed=0,policy="greedy",workers=1,chunk=256,max_steps=20000):
+    """Play `games` self-play games, split into batches of `chunk` across `workers` processes."""
+    jobs=[(min(chunk,games-i),mode,seed+i,policy,max_steps) for i in range(0,games,chunk)]
+    if workers>1:
+        with ProcessPoolExecutor(workers) as ex: parts=list(ex.map(_play_chunk,jobs))
+    else: parts=[_play_chunk(j) for j in jobs]
+    return {k:[v for p in parts for v in p[k]] for k in parts[0]}
+
+# ── BOTS / BENCHMARK ──────────────────────────────────────────────────────
+def greedy_bot(sim):
+    """Head for the food, avoiding cells that kill outright."""
+    hx,hy=sim.snake[0]; fx,fy=sim.food or (hx,hy); best=None; bd=None
+    dx0,dy0=sim.direction
+    for a in ACTIONS:
+        if a==(-dx0,-dy0): continue
+        nx,ny=hx+a[0],hy+a[1]
+        if sim.cfg["walls"] and not (0<=nx<sim.cols and 0<=ny<sim.rows): continue
+        nx%=sim.cols; ny%=sim.rows
+        if sim.blocked(nx,ny): continue
+        d=abs(nx-fx)+abs(ny-fy)
+        if bd is None or d<bd: best=a; bd=d
+    return best
+
+def bench_sim(steps=200000,mode="classic",seed=0,bot=None):
+    """Time headless steps; dead games are reset so every step simulates."""
+    sim=SnakeSim(mode,seed); rng=random.Random(seed); games=0; score=0
+    t0=time.perf_counter()
+    for _ in range(steps):
+        sim.step(bot(sim) if bot else rng.randrange(4))
+        if not sim.alive: games+=1; score+=sim.score; sim.reset()
+    el=time.perf_counter()-t0
+    print(f"mode={mode} steps={steps} bot={getattr(bot,'__name__','random')} games={games}"
+          f" avg_score={score/max(1,games):.0f}")
+    print(f"{el:.2f} s  {steps/el:,.0f} steps/s")
+
+def bench_batch(games=2000,mode="classic",seed=0,policy="greedy",workers=1,max_steps=20000):
+    """Self-play `games` games and print a per-level table for tuning move_interval."""
+    t0=time.perf_counter(); res=run_games(games,mode,seed,policy,workers,max_steps=max_steps)
+    el=time.perf_counter()-t0; n=len(res["score"])
+    print(f"mode={mode} policy={policy} workers={workers} backend={'numpy' if np is not None else 'python'}")
+    print(f"{n} games in {el:.2f} s  ({n/el*60:,.0f} games/min, {sum(res['steps'])/el:,.0f} steps/s)")
+    print(f"avg score {sum(res['score'])/n:.0f}  avg level {sum(res['level'])/n:.2f}  avg survival {sum(res['time'])/n:.1f} s"
+          f"  stalled {sum(res['stalled'])}  won {sum(res['win'])}")
+    print("level  interval  games  avg score  avg survival"); probe=SnakeSim(mode)
+    for lv in sorted(set(res["level"])):
+        sel=[i for i in range(n) if res["level"][i]==lv]; probe.level=lv
+        print(f"{lv:5d}  {probe.move_interval*1000:6.0f}ms  {len(sel):5d}  {sum(res['score'][i] for i in sel)/len(sel):9.0f}"
+              f"  {sum(res['time'][i] for i in sel)/len(sel):10.1f} s")
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser(description="Neon Snake headless simulation")
+    ap.add_argument("--bench",type=int,default=200000,metavar="N",help="number of steps to simulate")
+    ap.add_argument("--batch",type=int,metavar="GAMES",help="self-play GAMES games in numpy batches and report")
+    ap.add_argument("--workers",type=int,default=1,help="processes for --batch")
+    ap.add_argument("--mode",choices=list(MODES),default="classic")
+    ap.add_argument("--seed",type=int,default=0)
+    ap.add_argument("--bot",choices=["random","greedy"],default="random")
+    ap.add_argument("--replay",metavar="FILE",help="re-simulate a recorded run headless and check its score")
+    args=ap.parse_args()
+    if args.replay:
+        t0=time.perf_counter(); res=verify_replay(args.replay); el=time.perf_counter()-t0
+        print(f"{args.replay}: mode={res['mode']} seed={res['seed']} steps={res['steps']} score={res['score']}"
+              f" recorded={res['recorded_score']} {'OK' if res['match'] else 'MISMATCH' if res['complete'] else 'INCOMPLETE'}"
+              f" ({el*1000:.1f} ms)")
+        raise SystemExit(0 if res["match"] else 1)
+    if args.batch: bench_batch(args.batch,args.mode,args.seed,args.bot,args.workers)
+    else: bench_sim(args.bench,args.mode,args.seed,greedy_bot if args.bot=="greedy" else None)
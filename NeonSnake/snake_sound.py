@@ -0,0 +1,99 @@
+"""Procedural sound effects for Neon Snake: bulk synthesis, a disk cache, lazy loading.
+
+    snd_eat = LazySound(600, 80, 0.2, "square")   # nothing is synthesized yet
+    snd_eat.play()                                 # built (or read from disk) on first play
+    snd_eat.variant(1.2).play()                    # same sound a bit higher, built on demand
+
+PCM buffers are 16-bit interleaved samples matching the mixer format. They
+are cached in CACHE_DIR under a hash of every parameter, so changing a sound
+simply produces a new file.
+"""
+import os
+import math
+import array
+import hashlib
+
+try: import numpy as np
+except ImportError: np=None  # falls back to a pure-Python loop into array('h')
+
+CACHE_DIR=None       # set by the game; None disables the disk cache
+CACHE_VERSION=1      # bump when synthesize() output changes
+WAVES=("square","sine","saw")
+
+def synthesize(freq,ms,vol=0.3,wave="square",rate=44100,channels=2,attack=0,release=50):
+    """Render one tone as bytes of signed 16-bit PCM.
+
+    attack and release are linear fade-in/fade-out lengths in ms; the
+    defaults reproduce the original 50 ms tail fade.
+    """
+    n=int(rate*ms/1000); amp=int(32767*vol); na=rate*attack/1000; nr=rate*release/1000
+    if np is not None:
+        t=np.arange(n)/rate
+        if wave=="square": v=np.where(np.sin(2*math.pi*freq*t)>=0,amp,-amp).astype(np.float64)
+        elif wave=="sine": v=np.trunc(amp*np.sin(2*math.pi*freq*t))
+        elif wave=="saw":  v=np.trunc(amp*(2*(freq*t%1)-1))
+        else: v=np.zeros(n)
+        env=np.minimum(1.0,(n-np.arange(n))/nr) if nr else np.ones(n)
+        if na: env=np.minimum(env,np.arange(n)/na)
+        pcm=np.trunc(v*env).astype("<i2")
+        return np.repeat(pcm,channels).tobytes() if channels>1 else pcm.tobytes()
+    buf=array.array('h')
+    for i in range(n):
+        t=i/rate
+        if wave=="square": v=amp if math.sin(2*math.pi*freq*t)>=0 else -amp
+        elif wave=="sine": v=int(amp*math.sin(2*math.pi*freq*t))
+        elif wave=="saw":  v=int(amp*(2*(freq*t%1)-1))
+        else: v=0
+        e=min(1.0,(n-i)/nr) if nr else 1.0
+        if na: e=min(e,i/na)
+        v=int(v*e)
+        buf.extend((v,)*channels)
+    return buf.tobytes()
+
+def cached_pcm(*args,**kw):
+    """synthesize() with results kept in CACHE_DIR between runs."""
+    if not CACHE_DIR: return synthesize(*args,**kw)
+    key=repr((CACHE_VERSION,args,sorted(kw.items())))
+    path=os.path.join(CACHE_DIR,hashlib.sha1(key.encode()).hexdigest()[:20]+".pcm")
+    try:
+        with open(path,"rb") as f: return f.read()
+    except OSError: pass
+    pcm=synthesize(*args,**kw)
+    try:
+        os.makedirs(CACHE_DIR,exist_ok=True); tmp=path+".tmp"
+        with open(tmp,"wb") as f: f.write(pcm)
+        os.replace(tmp,path)
+    except OSError: pass
+    return pcm
+
+class LazySound:
+    """A pygame Sound that is synthesized the first time it is played.
+    If pygame can't make or play it (no mixer, no audio device) the sound is
+    disabled and every later play() returns None at once."""
+    def __init__(self,freq,ms,vol=0.3,wave="square",attack=0,release=50):
+        self.params=(freq,ms,vol,wave,attack,release); self.sound=None; self.variants={}; self.disabled=False
+
+    def load(self):
+        if self.sound is None:
+            import pygame
+            rate,fmt,channels=pygame.mixer.get_init() or (44100,-16,2)
+            freq,ms,vol,wave,attack,release=self.params
+            pcm=cached_pcm(freq,ms,vol,wave,rate,channels,attack=attack,release=release)
+            self.sound=pygame.mixer.Sound(buffer=pcm)
+        return self.sound
+
+    def play(self,*args,**kw):
+        if self.disabled: return None
+        import pygame
+        try: return self.load().play(*args,**kw)
+        except pygame.error: self.disabled=True; return None  # no audio: stay silent from now on
+
+    def variant(self,pitch=1.0,vol=None):
+        """Copy of this sound at pitch x frequency (and optionally another volume), cached."""
+        if self.disabled: return self
+        key=(round(pitch,3),vol)
+        v=self.variants.get(key)
+        if v is None:
+            freq,ms,vol0,wave,attack,release=self.params
+            v=self.variants[key]=LazySound(freq*key[0],ms,vol0 if vol is None else vol,wave,attack,release)
+        return v
@@ -0,0 +1,92 @@
+"""Time PyLearn's syntax highlighter against the old one-regex-per-word one.
+
+    python bench_highlighter.py [LINES]
+
+Pastes LINES lines (default 10000) of lesson code into an editor with each
+highlighter, then times one keystroke in the middle and opening a triple
+quote at the top, which re-highlights everything below it.
+"""
+import os
+import re
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor
+from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+
+from python_learner import LESSONS, PythonHL
+
+
+class _RuleListHL(QSyntaxHighlighter):
+    """The previous highlighter (one regex per word), kept for comparison."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rules = []
+        kw = QTextCharFormat(); kw.setForeground(QColor("#c678dd")); kw.setFontWeight(QFont.Weight.Bold)
+        for w in PythonHL.KEYWORDS:
+            self.rules.append((re.compile(rf"\b{w}\b"), kw))
+        bf = QTextCharFormat(); bf.setForeground(QColor("#61afef"))
+        for w in PythonHL.BUILTINS:
+            self.rules.append((re.compile(rf"\b{w}\b"), bf))
+        sf = QTextCharFormat(); sf.setForeground(QColor("#98c379"))
+        self.rules.append((re.compile(r'"""[\s\S]*?"""'), sf))
+        self.rules.append((re.compile(r"'''[\s\S]*?'''"), sf))
+        self.rules.append((re.compile(r'"[^"\\]*(\\.[^"\\]*)*"'), sf))
+        self.rules.append((re.compile(r"'[^'\\]*(\\.[^'\\]*)*'"), sf))
+        nf = QTextCharFormat(); nf.setForeground(QColor("#d19a66"))
+        self.rules.append((re.compile(r"\b\d+\.?\d*\b"), nf))
+        cf = QTextCharFormat(); cf.setForeground(QColor("#5c6370")); cf.setFontItalic(True)
+        self.rules.append((re.compile(r"#[^\n]*"), cf))
+        dc = QTextCharFormat(); dc.setForeground(QColor("#e5c07b"))
+        self.rules.append((re.compile(r"@\w+"), dc))
+        se = QTextCharFormat(); se.setForeground(QColor("#e06c75")); se.setFontItalic(True)
+        self.rules.append((re.compile(r"\bself\b"), se))
+        fn = QTextCharFormat(); fn.setForeground(QColor("#61afef"))
+        self.rules.append((re.compile(r"(?<=\bdef\s)\w+"), fn))
+        self.rules.append((re.compile(r"(?<=\bclass\s)\w+"), fn))
+
+    def highlightBlock(self, text):
+        for pat, fmt in self.rules:
+            for m in pat.finditer(text):
+                self.setFormat(m.start(), m.end() - m.start(), fmt)
+
+
+def main(lines=10000):
+    """Time pasting `lines` lines of lesson code into an editor, per highlighter."""
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    snippet = []
+    for lesson in LESSONS:
+        snippet += lesson["code"].splitlines()
+    snippet += ['def f(x):', '    """Docstring', '    over lines."""', '    return x  # done']
+    src = "\n".join((snippet * (lines // len(snippet) + 1))[:lines])
+    print(f"{lines} lines, {len(src) // 1024} KB")
+    for name, cls in (("rule list", _RuleListHL), ("single pass", PythonHL)):
+        ed = QPlainTextEdit()
+        hl = cls(ed.document())
+        app.processEvents()
+        t0 = time.perf_counter()
+        ed.textCursor().insertText(src)
+        t1 = time.perf_counter()
+        calls = [0]
+        block = hl.highlightBlock
+        def counted(text):
+            calls[0] += 1
+            block(text)
+        hl.highlightBlock = counted
+        cur = QTextCursor(ed.document().findBlockByNumber(lines // 2))
+        t2 = time.perf_counter()
+        cur.insertText("x")
+        t3 = time.perf_counter()
+        typed = calls[0]
+        cur = QTextCursor(ed.document().firstBlock())
+        t4 = time.perf_counter()
+        cur.insertText('"""')
+        t5 = time.perf_counter()
+        print(f"  {name:<12} paste {(t1 - t0) * 1000:8.1f} ms   keystroke {(t3 - t2) * 1000:6.2f} ms "
+              f"({typed} block)   open \"\"\" at top {(t5 - t4) * 1000:8.1f} ms ({calls[0] - typed} blocks)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
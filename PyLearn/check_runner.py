@@ -0,0 +1,71 @@
+"""Check what PyLearn's Run button shows for a few programs.
+
+    python check_runner.py
+
+Each program runs through CodeRunner twice, once in a freshly started
+interpreter and once in one taken from the warm pool, and its stdout and
+finish status are compared with what plain `python` would give. Exits
+non-zero if any case differs.
+"""
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+import python_learner as pl
+
+THREAD = """\
+import threading, time
+def work():
+    time.sleep(0.3)
+    print("thread done")
+threading.Thread(target=work).start()
+print("main done")
+"""
+
+CASES = [
+    # (name, source, expected stdout, expected status)
+    ("print", "print('hello')", "hello\n", "ok"),
+    ("background thread", THREAD, "main done\nthread done\n", "ok"),
+    ("atexit hook", "import atexit\natexit.register(print, 'bye')\nprint('hi')", "hi\nbye\n", "ok"),
+    ("exit code", "import sys\nprint('x')\nsys.exit(3)", "x\n", "error"),
+    ("exception", "print('before')\n1/0", "before\n", "error"),
+]
+
+
+def run(runner, code):
+    """Run `code` and return (stdout, status) once it has finished."""
+    out, result = [], []
+    loop = QEventLoop()
+    runner.output.connect(lambda text, is_err: is_err or out.append(text))
+    runner.finished.connect(lambda status, secs: (result.append(status), loop.quit()))
+    runner.start(code)
+    QTimer.singleShot((pl.RUN_TIMEOUT + 5) * 1000, loop.quit)
+    loop.exec()
+    runner.output.disconnect()
+    runner.finished.disconnect()
+    return "".join(out), result[0] if result else "no finish"
+
+
+def main():
+    app = QApplication(sys.argv[:1])
+    pool = pl.InterpreterPool(size=1)
+    failed = 0
+    for label, runner_pool in (("cold", None), ("pool", pool)):
+        for name, code, want_out, want_status in CASES:
+            if runner_pool:
+                app.processEvents()   # let the pool start its interpreter
+            out, status = run(pl.CodeRunner(runner_pool), code)
+            ok = out == want_out and status == want_status
+            failed += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} {label:<5} {name:<18} {status:<6} {out!r}")
+    pool.shutdown()
+    print("all passed" if not failed else f"{failed} failed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,25 @@ PyLearn v1.0 — Interactive Python Learning App
 Advanced code editor with file operations and 20 lessons.
 """
 
-import sys, subprocess, re, math, os, random, time, io, threading, shutil
+import sys, re, math, os, random, time, io, threading, shutil, codecs, json, bisect, collections, tempfile
+_START = time.perf_counter()   # --profile-startup counts from here, before the Qt imports
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QTextEdit, QPlainTextEdit, QScrollArea,
     QStackedWidget, QFrame, QGraphicsDropShadowEffect, QSplitter,
     QGraphicsOpacityEffect, QSizePolicy, QFileDialog,
-    QLineEdit, QStatusBar, QTabBar
+    QLineEdit, QStatusBar, QTabBar, QPlainTextDocumentLayout
 )
 from PyQt6.QtCore import (
     Qt, QPropertyAnimation, QEasingCurve, QTimer, QSize,
-    QParallelAnimationGroup, QPoint, QRect, QSequentialAnimationGroup,
-    pyqtProperty, QEvent
+    QParallelAnimationGroup, QPoint, QRect, QSequentialAnimationGroup, QAbstractAnimation,
+    pyqtProperty, QEvent, QObject, QProcess, QProcessEnvironment, pyqtSignal
 )
 from PyQt6.QtGui import (
     QFont, QColor, QPalette, QSyntaxHighlighter, QTextCharFormat,
     QPainter, QLinearGradient, QPen, QIcon, QBrush, QRadialGradient,
-    QTextCursor, QKeySequence, QShortcut, QAction, QTextBlockFormat
+    QTextCursor, QKeySequence, QShortcut, QAction, QTextBlockFormat, QTextDocument,
+    QTextBlockUserData
 )
 
 
@@ -82,11 +84,136 @@ def set_theme(name):
     T = THEMES[name]
 
 
+def theme_stylesheet():
+    """The whole window's look for the current theme, set once on MainWindow.
+
+    Widgets are picked by object name (Type#name) and state by dynamic
+    properties (see restyle), so a theme switch is one setStyleSheet call
+    instead of one per widget. The first rule gives everything under the
+    central widget the page background; every later rule is at least as
+    specific, so it wins by coming after it. Dialogs are left alone.
+    """
+    bar = lambda sel: f"""
+        {sel} QScrollBar:vertical{{background:{T['bg']};width:8px;margin:0;border:none;}}
+        {sel} QScrollBar::handle:vertical{{background:{T['bg3']};border-radius:4px;min-height:30px;}}
+        {sel} QScrollBar::handle:vertical:hover{{background:{T['dim']};}}
+        {sel} QScrollBar::add-line:vertical,{sel} QScrollBar::sub-line:vertical{{height:0;border:none;background:none;}}
+        {sel} QScrollBar::add-page:vertical,{sel} QScrollBar::sub-page:vertical{{background:{T['bg']};}}"""
+    return f"""
+        #central QWidget{{background:{T['bg']};}}
+        QWidget#central{{background:{T['bg']};}}
+        QStatusBar#status{{background:{T['bg2']};color:{T['dim']};border-top:1px solid {T['border']};}}
+        QLabel#statusLabel{{color:{T['dim']};}}
+
+        Sidebar#sidebar{{background:{T['bg2']};border-right:1px solid {T['border']};}}
+        QWidget#logoBox{{background:transparent;}}
+        QLabel#logo{{color:{T['accent']};background:transparent;}}
+        QLabel#logoSub{{color:{T['dim']};background:transparent;}}
+        QFrame#sidebarSep{{background:{T['border']};}}
+        QLabel#themeLabel{{color:{T['dim']};padding-left:8px;background:transparent;}}
+        QLabel#sidebarFoot{{color:{T['dim']};padding:10px;background:transparent;}}
+        QPushButton#navBtn{{background:transparent;color:{T['dim']};border:none;
+            border-radius:8px;text-align:left;padding-left:12px;margin:2px 8px;}}
+        QPushButton#navBtn:hover{{background:{T['bg3']};color:{T['text']};
+            border-left:3px solid {T['accent']};}}
+        QPushButton#navBtn[active="true"]{{background:qlineargradient(x1:0,y1:0,x2:1,y2:0,
+            stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border:none;}}
+        QPushButton#themeBtn{{background:transparent;color:{T['dim']};border:none;
+            border-radius:6px;text-align:left;padding-left:12px;margin:1px 8px;}}
+        QPushButton#themeBtn:hover{{background:{T['bg3']};color:{T['text']};}}
+        QPushButton#themeBtn[active="true"]{{background:{T['bg3']};color:{T['text']};
+            border:none;border-left:3px solid {T['accent']};}}
+
+        SlideStack#stack{{background:{T['bg']};}}
+        QLabel#lessonsHeader{{color:{T['text']};padding:14px 0 2px 10px;background:{T['bg']};}}
+        QLabel#lessonsSub{{color:{T['dim']};padding:0 0 6px 10px;background:{T['bg']};font-style:italic;}}
+        QScrollArea#lessonScroll{{border:none;background:{T['bg']};}}
+        {bar('QScrollArea#lessonScroll')}
+        LessonCard#lessonCard{{background:{T['bg2']};border:1px solid {T['border']};border-radius:10px;}}
+        LessonCard#lessonCard[hot="true"]{{background:{T['bg3']};border:1px solid {T['accent']};}}
+        QLabel#cardBadge{{background:qlineargradient(x1:0,y1:0,x2:1,y2:1,
+            stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border-radius:19px;}}
+        QLabel#cardTitle{{color:{T['text']};background:transparent;}}
+        QLabel#cardDesc,QLabel#cardArrow{{color:{T['dim']};background:transparent;}}
+        QLabel#cardArrow[hot="true"]{{color:{T['accent']};}}
+
+        QPushButton#backBtn{{background:transparent;color:{T['accent']};border:none;padding:8px 12px;}}
+        QPushButton#backBtn:hover{{color:{T['text']};}}
+        QPushButton#tryBtn{{background:qlineargradient(x1:0,y1:0,x2:1,y2:1,
+            stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border:none;border-radius:8px;padding:10px 18px;}}
+        QPushButton#tryBtn:hover{{background:{T['accent2']};}}
+        QLabel#lessonTitle{{color:{T['accent']};background:transparent;padding-left:8px;}}
+        QTextEdit#lessonContent{{background:{T['bg']};color:{T['text']};border:none;padding:14px;}}
+        {bar('QTextEdit#lessonContent')}
+
+        QLabel#editorTitle{{color:{T['text']};background:transparent;}}
+        QFrame#accentBar{{background:qlineargradient(x1:0,y1:0,x2:1,y2:0,
+            stop:0 {T['accent']},stop:0.5 {T['accent2']},stop:1 {T['accent']});}}
+        QPushButton#fileBtn{{background:{T['bg2']};color:{T['dim']};
+            border:1px solid {T['border']};border-radius:4px;padding:4px 12px;}}
+        QPushButton#fileBtn:hover{{background:{T['bg3']};color:{T['text']};}}
+        GlowButton#runBtn{{background:{T['green']};color:white;border:none;
+            border-radius:6px;padding:5px 14px;min-width:60px;}}
+        GlowButton#runBtn:hover{{background:#24a06b;}}
+        GlowButton#runBtn[running="true"]{{background:{T['orange']};}}
+        QTabBar#editorTabs{{background:{T['bg']};border:none;}}
+        QTabBar#editorTabs::tab{{
+            background:{T['bg2']};color:{T['dim']};
+            border:1px solid {T['border']};border-bottom:none;
+            padding:5px 18px 5px 12px;margin-right:2px;
+            border-top-left-radius:6px;border-top-right-radius:6px;
+            min-width:80px;
+        }}
+        QTabBar#editorTabs::tab:selected{{
+            background:{T['bg3']};color:{T['text']};
+            border-bottom:2px solid {T['accent']};
+        }}
+        QTabBar#editorTabs::tab:hover{{background:{T['bg3']};color:{T['text']};}}
+        QTabBar#editorTabs::close-button{{subcontrol-position:right;margin:2px;border-radius:3px;padding:1px;}}
+        QTabBar#editorTabs::close-button:hover{{background:{T['accent']};}}
+        CodeEditor#codeEditor{{
+            background:{T['bg2']};color:{T['text']};border:1px solid {T['border']};
+            border-radius:8px;padding:8px;selection-background-color:#264f78;}}
+        QSplitter#editorSplit::handle{{background:{T['border']};height:2px;}}
+        QLabel#consoleLabel,QLabel#runTime{{color:{T['dim']};background:transparent;}}
+        QPushButton#consoleBtn{{background:transparent;color:{T['dim']};
+            border:none;padding:2px 6px;font-size:8px;}}
+        QPushButton#consoleBtn:hover{{color:{T['text']};}}
+        QPlainTextEdit#console{{background:{T['bg2']};color:{T['green']};
+            border:1px solid {T['border']};border-radius:8px;padding:8px;}}
+        QPlainTextEdit#console QScrollBar:vertical{{background:{T['bg']};width:8px;border-radius:4px;}}
+        QPlainTextEdit#console QScrollBar::handle:vertical{{background:{T['bg3']};border-radius:4px;min-height:30px;}}
+        QPlainTextEdit#console QScrollBar::add-line:vertical,QPlainTextEdit#console QScrollBar::sub-line:vertical{{height:0;}}
+        QFrame#progress{{background:transparent;}}
+        QFrame#progress[active="true"]{{background:{T['accent']};}}
+        """
+
+
+def restyle(widget, **state):
+    """Set the dynamic properties the theme stylesheet selects on
+    (e.g. [active="true"]) and re-apply it to `widget` if one changed."""
+    if all(widget.property(k) == v for k, v in state.items()):
+        return
+    for k, v in state.items():
+        widget.setProperty(k, v)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+    widget.update()
+
+
 
 # ─── Floating Particles Background ──────────────────────────────────────────
 
 class ParticleWidget(QWidget):
-    """Floating dots background — purely cosmetic."""
+    """Floating dots background — purely cosmetic.
+
+    Moves only while it can be seen: the timer stops while the widget is
+    hidden (or the window minimized) and slows to a check every
+    COVERED_MS while the pages on top cover all of it.
+    """
+    TICK_MS = 33
+    COVERED_MS = 1000
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
@@ -99,9 +226,22 @@ class ParticleWidget(QWidget):
             })
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._tick)
-        self._timer.start(33)
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        self._timer.start(self.TICK_MS)
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        self._timer.stop()
 
     def _tick(self):
+        covered = self.visibleRegion().isEmpty()
+        interval = self.COVERED_MS if covered else self.TICK_MS
+        if self._timer.interval() != interval:
+            self._timer.setInterval(interval)
+        if covered:
+            return
         for p in self.particles:
             p["x"] += p["dx"]
             p["y"] += p["dy"]
@@ -146,42 +286,252 @@ class SlideStack(QStackedWidget):
 # ─── Syntax Highlighter ─────────────────────────────────────────────────────
 
 class PythonHL(QSyntaxHighlighter):
+    """Single-pass Python highlighter.
+
+    One alternation regex scans each block left to right, so a keyword
+    inside a string or comment is never coloured. A block that ends inside
+    a triple-quoted string stores the open quote as its block state; Qt
+    then re-highlights the following blocks only while their state keeps
+    changing, so typing re-colours one line. The brackets found outside
+    strings and comments are kept per block for BracketIndex.
+    """
+    KEYWORDS = ("and", "as", "assert", "async", "await", "break", "class", "continue", "def", "del",
+                "elif", "else", "except", "finally", "for", "from", "global", "if", "import", "in",
+                "is", "lambda", "nonlocal", "not", "or", "pass", "raise", "return", "try", "while",
+                "with", "yield", "True", "False", "None", "match", "case")
+    BUILTINS = ("print", "input", "len", "range", "int", "str", "float", "list", "dict", "tuple",
+                "set", "bool", "type", "isinstance", "enumerate", "zip", "map", "filter", "sorted",
+                "reversed", "open", "super", "abs", "max", "min", "sum", "round", "any", "all", "hex",
+                "bin", "oct", "ord", "chr", "format", "hasattr", "getattr", "setattr", "property")
+    TOKENS = re.compile(r"""
+        (?P<comment>\#.*)
+      | (?P<string>(?:\b[rRbBuUfF]{1,2})?(?:\"\"\"|'''|"[^"\\]*(?:\\.[^"\\]*)*"?|'[^'\\]*(?:\\.[^'\\]*)*'?))
+      | (?P<deco>@\w+)
+      | \b(?P<defkw>def|class)\s+(?P<defname>\w+)
+      | (?P<number>0[xXoObB][\da-fA-F_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][+-]?\d+)?[jJ]?)
+      | (?P<word>[^\W\d]\w*)
+      | (?P<bracket>[()\[\]{}])
+    """, re.X)
+    STATES = {'"""': 1, "'''": 2}     # block state: inside a triple-quoted string
+    QUOTES = {v: k for k, v in STATES.items()}
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.rules = []
-        kw = QTextCharFormat(); kw.setForeground(QColor("#c678dd")); kw.setFontWeight(QFont.Weight.Bold)
-        for w in ["and","as","assert","async","await","break","class","continue","def","del",
-                   "elif","else","except","finally","for","from","global","if","import","in",
-                   "is","lambda","nonlocal","not","or","pass","raise","return","try","while",
-                   "with","yield","True","False","None","match","case"]:
-            self.rules.append((re.compile(rf"\b{w}\b"), kw))
-        bf = QTextCharFormat(); bf.setForeground(QColor("#61afef"))
-        for w in ["print","input","len","range","int","str","float","list","dict","tuple",
-                   "set","bool","type","isinstance","enumerate","zip","map","filter","sorted",
-                   "reversed","open","super","abs","max","min","sum","round","any","all","hex",
-                   "bin","oct","ord","chr","format","hasattr","getattr","setattr","property"]:
-            self.rules.append((re.compile(rf"\b{w}\b"), bf))
-        sf = QTextCharFormat(); sf.setForeground(QColor("#98c379"))
-        self.rules.append((re.compile(r'"""[\s\S]*?"""'), sf))
-        self.rules.append((re.compile(r"'''[\s\S]*?'''"), sf))
-        self.rules.append((re.compile(r'"[^"\\]*(\\.[^"\\]*)*"'), sf))
-        self.rules.append((re.compile(r"'[^'\\]*(\\.[^'\\]*)*'"), sf))
-        nf = QTextCharFormat(); nf.setForeground(QColor("#d19a66"))
-        self.rules.append((re.compile(r"\b\d+\.?\d*\b"), nf))
-        cf = QTextCharFormat(); cf.setForeground(QColor("#5c6370")); cf.setFontItalic(True)
-        self.rules.append((re.compile(r"#[^\n]*"), cf))
-        dc = QTextCharFormat(); dc.setForeground(QColor("#e5c07b"))
-        self.rules.append((re.compile(r"@\w+"), dc))
-        se = QTextCharFormat(); se.setForeground(QColor("#e06c75")); se.setFontItalic(True)
-        self.rules.append((re.compile(r"\bself\b"), se))
-        fn = QTextCharFormat(); fn.setForeground(QColor("#61afef"))
-        self.rules.append((re.compile(r"(?<=\bdef\s)\w+"), fn))
-        self.rules.append((re.compile(r"(?<=\bclass\s)\w+"), fn))
+        def fmt(color, bold=False, italic=False):
+            f = QTextCharFormat(); f.setForeground(QColor(color))
+            if bold: f.setFontWeight(QFont.Weight.Bold)
+            if italic: f.setFontItalic(True)
+            return f
+        self.kw = fmt("#c678dd", bold=True)
+        self.string = fmt("#98c379")
+        self.number = fmt("#d19a66")
+        self.comment = fmt("#5c6370", italic=True)
+        self.deco = fmt("#e5c07b")
+        self.name = fmt("#61afef")
+        self.words = dict.fromkeys(self.KEYWORDS, self.kw)
+        self.words.update(dict.fromkeys(self.BUILTINS, self.name))
+        self.words["self"] = fmt("#e06c75", italic=True)
+        self.brackets = BracketIndex(self)
 
     def highlightBlock(self, text):
-        for pat, fmt in self.rules:
-            for m in pat.finditer(text):
-                self.setFormat(m.start(), m.end() - m.start(), fmt)
+        columns, chars = [], []
+        self._format(text, columns, chars)
+        chars = "".join(chars)
+        data = self.currentBlockUserData()
+        if data is None and not chars:
+            return
+        if data is not None and data.chars == chars:
+            data.columns = columns    # same sums, the tree is still right
+            return
+        data = BlockBrackets(columns, chars)
+        self.setCurrentBlockUserData(data)
+        self.brackets.changed(self.currentBlock(), data)
+
+    def _format(self, text, columns, chars):
+        pos, n = 0, len(text)
+        quote = self.QUOTES.get(self.previousBlockState())
+        if quote:
+            end = text.find(quote)
+            if end < 0:
+                self.setFormat(0, n, self.string)
+                self.setCurrentBlockState(self.STATES[quote])
+                return
+            pos = end + 3
+            self.setFormat(0, pos, self.string)
+        self.setCurrentBlockState(0)
+        match = self.TOKENS.search
+        while pos < n:
+            m = match(text, pos)
+            if m is None:
+                break
+            kind, start, pos = m.lastgroup, m.start(), m.end()
+            if kind == "word":
+                f = self.words.get(m.group())
+                if f is not None:
+                    self.setFormat(start, pos - start, f)
+            elif kind == "bracket":
+                columns.append(start)
+                chars.append(m.group())
+            elif kind == "string":
+                q = m.group()[-3:]
+                if q in self.STATES and len(m.group().lstrip("rRbBuUfF")) == 3:
+                    end = text.find(q, pos)
+                    if end < 0:
+                        self.setFormat(start, n - start, self.string)
+                        self.setCurrentBlockState(self.STATES[q])
+                        return
+                    pos = end + 3
+                self.setFormat(start, pos - start, self.string)
+            elif kind == "defname":
+                self.setFormat(m.start("defkw"), len(m.group("defkw")), self.kw)
+                self.setFormat(m.start("defname"), pos - m.start("defname"), self.name)
+            else:
+                self.setFormat(start, pos - start, getattr(self, kind))
+
+
+class BlockBrackets(QTextBlockUserData):
+    """The code brackets of one block (not those in strings or comments).
+
+    Counting an opening bracket as +1 and a closing one as -1, `total` is
+    the block's sum, `low` the lowest running sum from its start and `high`
+    the highest sum of one of its tails (both include the empty run, 0).
+    """
+    def __init__(self, columns, chars):
+        super().__init__()
+        self.columns, self.chars = columns, chars
+        total = low = 0
+        for ch in chars:
+            total += 1 if ch in "([{" else -1
+            low = min(low, total)
+        self.total, self.low, self.high = total, low, total - low
+
+
+class BracketIndex:
+    """Finds the bracket matching another one without reading the text.
+
+    A segment tree over the blocks' BlockBrackets sums finds the block
+    holding the match in O(log n). PythonHL reports every block it
+    re-highlights; those leaves are refreshed on the next lookup, and the
+    tree is rebuilt once lines have been added or removed.
+    """
+    OPEN = "([{"
+    PAIRS = {"(": ")", "[": "]", "{": "}", ")": "(", "]": "[", "}": "{"}
+
+    def __init__(self, highlighter):
+        self.hl = highlighter
+        self.size = 0
+        self.blocks = -1          # block count the tree was built for
+        self.stale = {}           # block number -> BlockBrackets changed since
+        self.total = self.low = self.high = []
+
+    def changed(self, block, data):
+        if self.blocks < 0:
+            return                # not built yet, or already due for a rebuild
+        if self.blocks != block.document().blockCount():
+            self.blocks = -1      # lines added or removed: rebuild on the next lookup
+        else:
+            self.stale[block.blockNumber()] = data
+
+    def _pull(self, node):
+        t, lo, hi = self.total, self.low, self.high
+        a, b = 2 * node, 2 * node + 1
+        t[node] = t[a] + t[b]
+        lo[node] = min(lo[a], t[a] + lo[b])
+        hi[node] = max(hi[b], t[b] + hi[a])
+
+    def _refresh(self):
+        doc = self.hl.document()
+        if doc.blockCount() != self.blocks or len(self.stale) > self.size // 8:
+            self.blocks = doc.blockCount()
+            self.size = 1 << max(0, self.blocks - 1).bit_length()
+            self.total, self.low, self.high = ([0] * (2 * self.size) for _ in range(3))
+            block, i = doc.firstBlock(), self.size
+            while block.isValid():
+                data = block.userData()
+                if data is not None:
+                    self.total[i], self.low[i], self.high[i] = data.total, data.low, data.high
+                block, i = block.next(), i + 1
+            for node in range(self.size - 1, 0, -1):
+                self._pull(node)
+        else:
+            for number, data in self.stale.items():
+                node = self.size + number
+                self.total[node], self.low[node], self.high[node] = data.total, data.low, data.high
+                node //= 2
+                while node:
+                    self._pull(node)
+                    node //= 2
+        self.stale.clear()
+
+    def _find(self, number, need, forward):
+        """The first block after (forward) or before `number` in which
+        `need` unmatched brackets get closed, as (block number, need left
+        at its edge), or None."""
+        t, lo, hi, size = self.total, self.low, self.high, self.size
+        first, last = (number + 1, size) if forward else (0, number)
+        lefts, rights = [], []
+        first += size; last += size
+        while first < last:
+            if first & 1:
+                lefts.append(first); first += 1
+            if last & 1:
+                last -= 1; rights.append(last)
+            first >>= 1; last >>= 1
+        nodes = lefts + rights[::-1]
+        if not forward:
+            nodes.reverse()
+        for node in nodes:
+            if (need + lo[node] <= 0) if forward else (hi[node] >= need):
+                while node < size:
+                    near, far = (2 * node, 2 * node + 1) if forward else (2 * node + 1, 2 * node)
+                    if (need + lo[near] <= 0) if forward else (hi[near] >= need):
+                        node = near
+                    else:
+                        need += t[near] if forward else -t[near]
+                        node = far
+                return node - size, need
+            need += t[node] if forward else -t[node]
+        return None
+
+    def _scan(self, block, need, forward, start=None):
+        """Index in `block` where `need` reaches 0, or (None, need left)."""
+        chars = block.userData().chars
+        if forward:
+            order = range(0 if start is None else start, len(chars))
+        else:
+            order = range(len(chars) - 1 if start is None else start, -1, -1)
+        for i in order:
+            need += 1 if (chars[i] in self.OPEN) == forward else -1
+            if need == 0:
+                return i, 0
+        return None, need
+
+    def match(self, block, column):
+        """Document position of the bracket pairing with the one at
+        `column` of `block`, or -1 (not a code bracket, no partner, or a
+        partner of the wrong kind)."""
+        data = block.userData()
+        if not isinstance(data, BlockBrackets):
+            return -1
+        k = bisect.bisect_left(data.columns, column)
+        if k == len(data.columns) or data.columns[k] != column:
+            return -1
+        ch = data.chars[k]
+        forward = ch in self.OPEN
+        i, need = self._scan(block, 0, forward, k)
+        if i is None:
+            self._refresh()
+            found = self._find(block.blockNumber(), need, forward)
+            if found is None:
+                return -1
+            block = self.hl.document().findBlockByNumber(found[0])
+            i, need = self._scan(block, found[1], forward)
+            if i is None:
+                return -1
+        data = block.userData()
+        if data.chars[i] != self.PAIRS[ch]:
+            return -1
+        return block.position() + data.columns[i]
 
 
 # ─── Code Editor with Line Numbers ───────────────────────────────────────────
@@ -195,10 +545,20 @@ class LineNumArea(QWidget):
     def paintEvent(self, e):
         self.editor.paint_ln(e)
 
+LARGE_FILE_BYTES = 1 << 20    # files this big open without highlighting or line wrap
+
+
 class CodeEditor(QPlainTextEdit):
     def __init__(self):
         super().__init__()
         self.ln = LineNumArea(self)
+        self.large = False
+        self._ln_font = QFont("Consolas", 9)
+        self._ln_shown = None     # (first visible line, cursor line) the gutter shows
+        self._ln_timer = QTimer(self)
+        self._ln_timer.setSingleShot(True)
+        self._ln_timer.setInterval(30)
+        self._ln_timer.timeout.connect(self.ln.update)
         self.blockCountChanged.connect(self._update_w)
         self.updateRequest.connect(self._update_area)
         self.cursorPositionChanged.connect(self._highlight_current_line)
@@ -209,10 +569,44 @@ class CodeEditor(QPlainTextEdit):
         self.hl = PythonHL(self.document())
         self._bracket_selections = []
 
+    def new_document(self, large=False, parent=None):
+        """An empty document for a tab, with a highlighter unless `large`.
+
+        Returns (document, highlighter or None); show it with set_document.
+        """
+        doc = QTextDocument(parent)
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setDefaultFont(self.font())
+        opt = doc.defaultTextOption()
+        opt.setTabStopDistance(self.tabStopDistance())
+        doc.setDefaultTextOption(opt)
+        return doc, (None if large else PythonHL(doc))
+
+    def set_document(self, doc, hl=None, large=False):
+        """Show another document. Swapping keeps each one's text, undo
+        history and highlighting; nothing is copied."""
+        self.hl, self.large = hl, large
+        self._ln_shown = None
+        # Wrap mode and gutter width changes re-lay out the attached
+        # document, so make them while the smaller of the two is attached.
+        if large:
+            self._apply_layout(doc)
+            self.setDocument(doc)
+        else:
+            self.setDocument(doc)
+            self._apply_layout(doc)
+        self._highlight_brackets()
+
+    def _apply_layout(self, doc):
+        mode = QPlainTextEdit.LineWrapMode.NoWrap if self.large else QPlainTextEdit.LineWrapMode.WidgetWidth
+        if self.lineWrapMode() != mode:
+            self.setLineWrapMode(mode)
+        # a scroll bar appearing later would narrow the viewport: another re-layout
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn if self.large
+                                        else Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self._update_w(doc.blockCount())
+
     def apply_theme(self):
-        self.setStyleSheet(f"""QPlainTextEdit{{
-            background:{T['bg2']};color:{T['text']};border:1px solid {T['border']};
-            border-radius:8px;padding:8px;selection-background-color:#264f78;}}""")
         self._highlight_current_line()
 
     def _highlight_current_line(self):
@@ -226,44 +620,16 @@ class CodeEditor(QPlainTextEdit):
         self.setExtraSelections(selections)
 
     def _highlight_brackets(self):
-        """Highlight matching bracket pairs."""
+        """Highlight the bracket before the cursor and its match."""
         self._bracket_selections = []
         cursor = self.textCursor()
-        text = self.toPlainText()
-        pos = cursor.position()
-        if pos <= 0 or pos > len(text):
-            return
-        ch = text[pos - 1] if pos > 0 else ''
-        pairs = {'(': ')', '[': ']', '{': '}'}
-        rpairs = {')': '(', ']': '[', '}': '{'}
-        match_pos = -1
-        if ch in pairs:
-            # Search forward
-            target = pairs[ch]
-            depth = 0
-            for i in range(pos, len(text)):
-                if text[i] == ch: depth += 1
-                elif text[i] == target:
-                    depth -= 1
-                    if depth == 0:
-                        match_pos = i
-                        break
-        elif ch in rpairs:
-            # Search backward
-            target = rpairs[ch]
-            depth = 0
-            for i in range(pos - 2, -1, -1):
-                if text[i] == ch: depth += 1
-                elif text[i] == target:
-                    depth -= 1
-                    if depth == 0:
-                        match_pos = i
-                        break
+        block, col = cursor.block(), cursor.positionInBlock() - 1
+        match_pos = self.hl.brackets.match(block, col) if self.hl and col >= 0 else -1
         if match_pos >= 0:
             fmt = QTextCharFormat()
             fmt.setBackground(QColor(T["accent"]))
             fmt.setForeground(QColor("white"))
-            for p in [pos - 1, match_pos]:
+            for p in [block.position() + col, match_pos]:
                 sel = QTextEdit.ExtraSelection()
                 sel.format = fmt
                 c = self.textCursor()
@@ -339,11 +705,20 @@ class CodeEditor(QPlainTextEdit):
             new_lines = ['# ' + l if l.strip() else l for l in lines]
         cursor.insertText('\n'.join(new_lines))
 
-    def ln_width(self):
-        return 16 + self.fontMetrics().horizontalAdvance("9") * max(1, len(str(self.blockCount())))
-    def _update_w(self, _): self.setViewportMargins(self.ln_width(), 0, 0, 0)
+    def ln_width(self, lines=None):
+        return 16 + self.fontMetrics().horizontalAdvance("9") * max(1, len(str(lines or self.blockCount())))
+    def _update_w(self, lines=None):
+        if self.viewportMargins().left() != self.ln_width(lines):
+            self.setViewportMargins(self.ln_width(lines), 0, 0, 0)
     def _update_area(self, rect, dy):
-        if dy: self.ln.scroll(0, dy)
+        if self.large:
+            # Large files: repaint the gutter at most every 30 ms, and only
+            # when the lines in view or the cursor line moved (not on blinks).
+            shown = (self.firstVisibleBlock().blockNumber(), self.textCursor().blockNumber())
+            if shown != self._ln_shown:
+                self._ln_shown = shown
+                self._ln_timer.start()
+        elif dy: self.ln.scroll(0, dy)
         else: self.ln.update(0, rect.y(), self.ln.width(), rect.height())
         if rect.contains(self.viewport().rect()): self._update_w(0)
     def resizeEvent(self, e):
@@ -357,10 +732,11 @@ class CodeEditor(QPlainTextEdit):
         top = round(self.blockBoundingGeometry(b).translated(self.contentOffset()).top())
         bot = top + round(self.blockBoundingRect(b).height())
         cur_block = self.textCursor().blockNumber()
+        p.setFont(self._ln_font)
         while b.isValid() and top <= event.rect().bottom():
             if b.isVisible() and bot >= event.rect().top():
                 color = T["text"] if n == cur_block else T["dim"]
-                p.setPen(QColor(color)); p.setFont(QFont("Consolas", 9))
+                p.setPen(QColor(color))
                 p.drawText(0, top, self.ln.width()-6, self.fontMetrics().height(),
                            Qt.AlignmentFlag.AlignRight, str(n+1))
             b = b.next(); top = bot
@@ -368,11 +744,71 @@ class CodeEditor(QPlainTextEdit):
         p.end()
 
 
+class FileLoader(QObject):
+    """Reads a text file on a background thread and hands it over in chunks.
+
+    Connect the signals, then call start(). The thread only reads; the
+    chunks are emitted from the GUI thread one per event-loop pass, so
+    inserting them never starves painting and input. `chunk` carries
+    the text (newlines normalised, as open() in text mode does),
+    `progress` the fraction handed over so far, and `finished` an error
+    message, "" on success.
+    """
+    CHUNK = 1 << 17       # characters per chunk
+
+    chunk = pyqtSignal(str)
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.cancelled = False
+        self._chunks = collections.deque()    # (text, fraction), filled by the thread
+        self._error = None                     # set by the thread when it is done
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._deliver)
+
+    def start(self):
+        threading.Thread(target=self._read, daemon=True).start()
+        self._timer.start(0)
+
+    def cancel(self):
+        self.cancelled = True
+        self._timer.stop()
+
+    def _read(self):
+        try:
+            total = max(1, os.path.getsize(self.path))
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                while not self.cancelled:
+                    text = f.read(self.CHUNK)
+                    if not text:
+                        break
+                    self._chunks.append((text, min(1.0, f.buffer.tell() / total)))
+                    while len(self._chunks) > 8 and not self.cancelled:
+                        time.sleep(0.005)
+        except OSError as e:
+            self._error = str(e)
+        else:
+            self._error = ""
+
+    def _deliver(self):
+        if self._chunks:
+            text, frac = self._chunks.popleft()
+            self.chunk.emit(text)
+            self.progress.emit(frac)
+        elif self._error is not None:
+            self._timer.stop()
+            self.finished.emit(self._error)
+
+
 # ─── Animated Lesson Card ───────────────────────────────────────────────────
 
 class LessonCard(QFrame):
     def __init__(self, number, title, desc):
         super().__init__()
+        self.setObjectName("lessonCard")
         self.setFixedHeight(76)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.num = number
@@ -382,6 +818,7 @@ class LessonCard(QFrame):
         lay.setSpacing(12)
 
         self.badge = QLabel(str(number).zfill(2))
+        self.badge.setObjectName("cardBadge")
         self.badge.setFixedSize(38, 38)
         self.badge.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.badge.setFont(QFont("Consolas", 12, QFont.Weight.Bold))
@@ -389,14 +826,17 @@ class LessonCard(QFrame):
 
         tb = QVBoxLayout(); tb.setSpacing(1)
         self.title_lbl = QLabel(title)
+        self.title_lbl.setObjectName("cardTitle")
         self.title_lbl.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
         tb.addWidget(self.title_lbl)
         self.desc_lbl = QLabel(desc)
+        self.desc_lbl.setObjectName("cardDesc")
         self.desc_lbl.setFont(QFont("Segoe UI", 9))
         tb.addWidget(self.desc_lbl)
         lay.addLayout(tb, 1)
 
         self.arrow = QLabel("\u276f")
+        self.arrow.setObjectName("cardArrow")
         self.arrow.setFont(QFont("Segoe UI", 13))
         lay.addWidget(self.arrow)
 
@@ -408,22 +848,13 @@ class LessonCard(QFrame):
 
     def apply_theme(self):
         self._shadow.setColor(QColor(T["accent"]))
-        self.badge.setStyleSheet(f"""background:qlineargradient(x1:0,y1:0,x2:1,y2:1,
-            stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border-radius:19px;""")
-        self.title_lbl.setStyleSheet(f"color:{T['text']};background:transparent;")
-        self.desc_lbl.setStyleSheet(f"color:{T['dim']};background:transparent;")
-        self.arrow.setStyleSheet(f"color:{T['dim']};background:transparent;")
-        self._set_base()
-
-    def _set_base(self):
-        self.setStyleSheet(f"LessonCard{{background:{T['bg2']};border:1px solid {T['border']};border-radius:10px;}}")
 
-    def _set_hover(self):
-        self.setStyleSheet(f"LessonCard{{background:{T['bg3']};border:1px solid {T['accent']};border-radius:10px;}}")
+    def _set_hot(self, hot):
+        restyle(self, hot=hot)
+        restyle(self.arrow, hot=hot)
 
     def enterEvent(self, e):
-        self._set_hover()
-        self.arrow.setStyleSheet(f"color:{T['accent']};background:transparent;")
+        self._set_hot(True)
         a1 = QPropertyAnimation(self._shadow, b"blurRadius"); a1.setDuration(200)
         a1.setStartValue(0); a1.setEndValue(25); a1.setEasingCurve(QEasingCurve.Type.OutCubic)
         a2 = QPropertyAnimation(self._shadow, b"color"); a2.setDuration(200)
@@ -434,8 +865,7 @@ class LessonCard(QFrame):
         self._anims = [g]; super().enterEvent(e)
 
     def leaveEvent(self, e):
-        self._set_base()
-        self.arrow.setStyleSheet(f"color:{T['dim']};background:transparent;")
+        self._set_hot(False)
         a1 = QPropertyAnimation(self._shadow, b"blurRadius"); a1.setDuration(250)
         a1.setStartValue(25); a1.setEndValue(0)
         a2 = QPropertyAnimation(self._shadow, b"color"); a2.setDuration(250)
@@ -448,8 +878,26 @@ class LessonCard(QFrame):
 
 # ─── Pulsing Glow Button ────────────────────────────────────────────────────
 
+def set_animating(anim, on):
+    """Run or pause a looping animation; a paused one resumes where it stopped.
+
+    Widgets call this from showEvent/hideEvent, which Qt also sends to
+    every child when the window is minimized and restored.
+    """
+    if anim is None:
+        return
+    state = anim.state()
+    if not on:
+        if state == QAbstractAnimation.State.Running:
+            anim.pause()
+    elif state == QAbstractAnimation.State.Paused:
+        anim.resume()
+    elif state == QAbstractAnimation.State.Stopped:
+        anim.start()
+
+
 class GlowButton(QPushButton):
-    """Button with a pulsing glow shadow."""
+    """Button with a pulsing glow shadow, paused while it is hidden."""
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
         self._glow = QGraphicsDropShadowEffect()
@@ -471,8 +919,17 @@ class GlowButton(QPushButton):
         a_out.setDuration(1200); a_out.setStartValue(18); a_out.setEndValue(0)
         a_out.setEasingCurve(QEasingCurve.Type.InOutSine)
         seq.addAnimation(a_in); seq.addAnimation(a_out)
-        seq.setLoopCount(-1); seq.start()
+        seq.setLoopCount(-1)
         self._pulse_anim = seq
+        set_animating(seq, self.isVisible())
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        set_animating(self._pulse_anim, True)
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        set_animating(self._pulse_anim, False)
 
     def stop_pulse(self):
         if self._pulse_anim:
@@ -583,11 +1040,13 @@ class LessonsPage(QWidget):
         self.layout_.setSpacing(0)
 
         self.header = QLabel("  📚 Lessons")
+        self.header.setObjectName("lessonsHeader")
         self.header.setFont(QFont("Segoe UI", 20, QFont.Weight.Bold))
         self.header.setFixedHeight(50)
         self.layout_.addWidget(self.header)
 
         self.sub = QLabel(f"  {len(LESSONS)} topics — select one to learn  •  By Kotan123")
+        self.sub.setObjectName("lessonsSub")
         self.sub.setFont(QFont("Segoe UI", 10))
         self.layout_.addWidget(self.sub)
 
@@ -614,20 +1073,8 @@ class LessonsPage(QWidget):
         self.layout_.addWidget(self.scroll)
 
     def apply_theme(self):
-        bg = T['bg']
-        bgc = QColor(bg)
-        self.header.setStyleSheet(f"color:{T['text']};padding:14px 0 2px 10px;background:{bg};")
-        self.sub.setStyleSheet(f"color:{T['dim']};padding:0 0 6px 10px;background:{bg};font-style:italic;")
-        # Scrollbar styling + force scroll background
-        self.scroll.setStyleSheet(f"""
-            QScrollArea#lessonScroll{{border:none;background:{bg};}}
-            QScrollBar:vertical{{background:{bg};width:8px;margin:0;border:none;}}
-            QScrollBar::handle:vertical{{background:{T['bg3']};border-radius:4px;min-height:30px;}}
-            QScrollBar::handle:vertical:hover{{background:{T['dim']};}}
-            QScrollBar::add-line:vertical{{height:0;border:none;background:none;}}
-            QScrollBar::sub-line:vertical{{height:0;border:none;background:none;}}
-            QScrollBar::add-page:vertical,QScrollBar::sub-page:vertical{{background:{bg};}}""")
-        # Force bg via palette on every level
+        bgc = QColor(T['bg'])
+        # Force bg via palette on every level (the stylesheet has the rest)
         for w in [self, self.scroll, self.scroll.viewport(), self.container]:
             w.setAutoFillBackground(True)
             p = w.palette()
@@ -672,16 +1119,19 @@ class LessonDetailPage(QWidget):
         top.setContentsMargins(10, 8, 10, 0)
 
         self.back_btn = QPushButton("\u2190  Back")
+        self.back_btn.setObjectName("backBtn")
         self.back_btn.setFont(QFont("Segoe UI", 11))
         self.back_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.back_btn.clicked.connect(on_back)
         top.addWidget(self.back_btn)
 
         self.lesson_title = QLabel("")
+        self.lesson_title.setObjectName("lessonTitle")
         self.lesson_title.setFont(QFont("Consolas", 13, QFont.Weight.Bold))
         top.addWidget(self.lesson_title, 1)
 
         self.try_btn = QPushButton("\u25b6  Try in Editor")
+        self.try_btn.setObjectName("tryBtn")
         self.try_btn.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
         self.try_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.try_btn.clicked.connect(lambda: self.on_try(LESSONS[self._idx]["code"]))
@@ -689,32 +1139,19 @@ class LessonDetailPage(QWidget):
         lay.addLayout(top)
 
         self.content = QTextEdit()
+        self.content.setObjectName("lessonContent")
         self.content.setReadOnly(True)
         self.content.setFont(QFont("Segoe UI", 11))
         lay.addWidget(self.content)
 
     def apply_theme(self):
-        bg = T['bg']
-        self.back_btn.setStyleSheet(f"""QPushButton{{background:transparent;color:{T['accent']};border:none;padding:8px 12px;}}
-            QPushButton:hover{{color:{T['text']};}}""")
-        self.try_btn.setStyleSheet(f"""QPushButton{{background:qlineargradient(x1:0,y1:0,x2:1,y2:1,
-            stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border:none;border-radius:8px;padding:10px 18px;}}
-            QPushButton:hover{{background:{T['accent2']};}}""")
-        bgc = QColor(bg)
-        self.content.setStyleSheet(f"""QTextEdit{{background:{bg};color:{T['text']};border:none;padding:14px;}}
-            QScrollBar:vertical{{background:{bg};width:8px;margin:0;border:none;}}
-            QScrollBar::handle:vertical{{background:{T['bg3']};border-radius:4px;min-height:30px;}}
-            QScrollBar::handle:vertical:hover{{background:{T['dim']};}}
-            QScrollBar::add-line:vertical{{height:0;border:none;background:none;}}
-            QScrollBar::sub-line:vertical{{height:0;border:none;background:none;}}
-            QScrollBar::add-page:vertical,QScrollBar::sub-page:vertical{{background:{bg};}}""")
+        bgc = QColor(T['bg'])
         for widget in [self.content.viewport(), self.content]:
             widget.setAutoFillBackground(True)
             pal = widget.palette()
             pal.setColor(QPalette.ColorRole.Window, bgc)
             pal.setColor(QPalette.ColorRole.Base, bgc)
             widget.setPalette(pal)
-        self.lesson_title.setStyleSheet(f"color:{T['accent']};background:transparent;padding-left:8px;")
 
     def set_lesson(self, idx):
         self._idx = idx
@@ -750,15 +1187,375 @@ class LessonDetailPage(QWidget):
             self._typing_timer.stop()
 
 
+# ─── Code Runner ─────────────────────────────────────────────────────────────
+
+RUN_TIMEOUT = 15      # seconds of wall time before a run is killed
+RUN_MEM_MB = 1024     # address-space limit per run (where `resource` exists)
+RUN_CPU_S = 10        # CPU-seconds limit per run (where `resource` exists)
+POOL_SIZE = 2         # interpreters kept started and waiting for a run
+OUTPUT_MAX_LINES = 5000   # console lines kept per tab; older ones scroll away
+OUTPUT_MAX_LINE = 1000    # characters shown of one output line
+OUTPUT_SPOOL_MB = 100     # output kept on disk per run for "Save"
+# Imported by waiting interpreters, so lessons don't pay for them on Run.
+POOL_PRELOAD = ("math", "random", "re", "json", "datetime", "time", "collections",
+                "itertools", "functools", "contextlib", "string", "statistics",
+                "dataclasses", "typing", "tempfile", "traceback")
+
+# Runs in the child via `python -c`, preloading the modules named in argv.
+# The job ({path, src, cwd, mem, cpu} as JSON) then arrives on stdin; the
+# limits are applied and the program runs in a fresh namespace, so its
+# tracebacks look like those of a plain `python -c` / `python file`.
+_RUN_BOOT = r"""
+import sys
+for _m in sys.argv[1:]:
+    try:
+        __import__(_m)
+    except Exception:
+        pass
+import json, os
+job = json.loads(sys.stdin.read() or "null")
+if not job:
+    sys.exit(0)
+try:
+    import resource
+    if job["mem"]:
+        resource.setrlimit(resource.RLIMIT_AS, (job["mem"] << 20, job["mem"] << 20))
+    if job["cpu"]:
+        used = sum(resource.getrusage(resource.RUSAGE_SELF)[:2])
+        resource.setrlimit(resource.RLIMIT_CPU, (int(used) + job["cpu"], int(used) + job["cpu"] + 1))
+except (ImportError, ValueError, OSError):
+    pass
+if job["cwd"]:
+    os.chdir(job["cwd"])
+name, src = job["path"] or "<string>", job["src"]
+preload, sys.argv = sys.argv[1:], [job["path"] or "-c"]
+if job["path"]:
+    sys.path[0] = os.path.dirname(job["path"])
+    for _m in preload:  # a file next to the program shadows the preloaded module
+        if os.path.exists(os.path.join(sys.path[0], _m + ".py")) or os.path.isdir(os.path.join(sys.path[0], _m)):
+            sys.modules.pop(_m, None)
+    with open(job["path"], "rb") as f:
+        src = f.read()
+g = {"__name__": "__main__", "__builtins__": __builtins__}
+if job["path"]:
+    g["__file__"] = job["path"]
+for _n in ("job", "f", "_m", "preload"):
+    globals().pop(_n, None)
+status = 0
+try:
+    exec(compile(src, name, "exec"), g)
+except SystemExit as e:
+    status = e.code
+except BaseException as e:
+    import traceback
+    traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+    status = 1
+# Skip tearing down the preloaded modules, which costs more than the run:
+# wait for the program's non-daemon threads as a normal exit would,
+# release its objects (closing files it left open), run its atexit
+# hooks, flush and leave.
+if "threading" in sys.modules:
+    sys.modules["threading"]._shutdown()
+g.clear()
+import atexit
+atexit._run_exitfuncs()
+if status is not None and not isinstance(status, int):
+    print(status, file=sys.stderr)
+    status = 1
+for _s in (sys.stdout, sys.stderr):
+    try:
+        _s.flush()
+    except Exception:
+        pass
+os._exit((status or 0) & 0xFF)
+"""
+
+
+def _start_interpreter(py, preload=(), parent=None):
+    """Start `py` running _RUN_BOOT; it waits on stdin for its job."""
+    proc = QProcess(parent)
+    env = QProcessEnvironment.systemEnvironment()
+    env.insert("PYTHONUNBUFFERED", "1")
+    env.insert("PYTHONIOENCODING", "utf-8")
+    proc.setProcessEnvironment(env)
+    proc.start(py, ["-c", _RUN_BOOT, *preload])
+    return proc
+
+
+class InterpreterPool(QObject):
+    """Keeps POOL_SIZE interpreters started, with POOL_PRELOAD imported.
+
+    take() hands one over (or None when none is ready) and starts a
+    replacement. Each interpreter runs a single program and exits, so no
+    module state carries over from one run to the next; an interpreter
+    that dies while waiting is replaced, giving up after a few failures
+    in a row.
+    """
+    MAX_FAILURES = 3
+
+    def __init__(self, size=POOL_SIZE, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.idle = []
+        self.failures = 0
+        QTimer.singleShot(0, self._fill)
+
+    def _fill(self):
+        py = _find_python()
+        while py and len(self.idle) < self.size and self.failures < self.MAX_FAILURES:
+            proc = _start_interpreter(py, POOL_PRELOAD, self)
+            proc.finished.connect(lambda *a, p=proc: self._died(p))
+            proc.errorOccurred.connect(lambda err, p=proc: err == QProcess.ProcessError.FailedToStart and self._died(p))
+            self.idle.append(proc)
+
+    def _died(self, proc):
+        if proc in self.idle:
+            self.idle.remove(proc)
+            proc.deleteLater()
+            self.failures += 1
+            QTimer.singleShot(500, self._fill)
+
+    def take(self):
+        proc = None
+        while self.idle and proc is None:
+            proc = self.idle.pop(0)
+            if proc.state() == QProcess.ProcessState.NotRunning:
+                proc.deleteLater()
+                proc = None
+        if proc is not None:
+            proc.finished.disconnect()
+            proc.errorOccurred.disconnect()
+            self.failures = 0
+        QTimer.singleShot(0, self._fill)
+        return proc
+
+    def shutdown(self):
+        self.size = 0
+        idle, self.idle = self.idle, []
+        for proc in idle:
+            proc.kill()
+            proc.waitForFinished(500)
+
+
+class CodeRunner(QObject):
+    """Runs a program in a QProcess and streams its output without blocking the UI.
+
+    output(text, is_err) delivers stdout/stderr in batches, at most every
+    FLUSH_MS. finished(status, seconds) fires once per run, with status
+    "ok", "error" (non-zero exit), "crashed", "timeout", "stopped" or "failed".
+    """
+    output = pyqtSignal(str, bool)
+    finished = pyqtSignal(str, float)
+    FLUSH_MS = 40
+
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.proc = None
+        self._pending = []          # [is_err, [chunks]] in arrival order
+        self._status = None
+        self._start = 0.0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+        self._deadline = QTimer(self)
+        self._deadline.setSingleShot(True)
+        self._deadline.timeout.connect(self._on_timeout)
+        self._grace = QTimer(self)
+        self._grace.setSingleShot(True)
+        self._grace.timeout.connect(self.kill)
+
+    def is_running(self):
+        return self.proc is not None
+
+    def start(self, code, path=None):
+        """Run `path` (in its folder) if given, else the source `code`.
+
+        A waiting interpreter is taken from the pool when there is one;
+        otherwise a new one is started (and pays the startup cost).
+        """
+        self._start = time.perf_counter()
+        self._status = None
+        self._decoders = [codecs.getincrementaldecoder("utf-8")("replace") for _ in range(2)]
+        proc = self.pool.take() if self.pool else None
+        if proc is None:
+            py = _find_python()
+            if py is None:
+                self.output.emit("Python not found! Install Python and add to PATH.", True)
+                self.finished.emit("failed", 0.0)
+                return
+            proc = _start_interpreter(py)
+        proc.setParent(self)
+        self.proc = proc
+        proc.readyReadStandardOutput.connect(lambda: self._read(proc, False))
+        proc.readyReadStandardError.connect(lambda: self._read(proc, True))
+        proc.finished.connect(lambda code, st: self._on_finished(proc, code, st))
+        proc.errorOccurred.connect(lambda err: self._on_error(proc, err))
+        job = {"path": path, "src": "" if path else code, "cwd": os.path.dirname(path) if path else None,
+               "mem": RUN_MEM_MB, "cpu": RUN_CPU_S}
+        proc.write(json.dumps(job).encode("utf-8"))
+        proc.closeWriteChannel()
+        self._deadline.start(RUN_TIMEOUT * 1000)
+
+    def cancel(self):
+        """Ask the program to stop; it is killed if still running a second later."""
+        if self.proc:
+            self._status = self._status or "stopped"
+            self.proc.terminate()
+            self._grace.start(1000)
+
+    def kill(self, wait=False):
+        if self.proc:
+            self._status = self._status or "stopped"
+            self.proc.kill()
+            if wait:
+                self.proc.waitForFinished(1000)
+
+    def _read(self, proc, is_err):
+        data = proc.readAllStandardError() if is_err else proc.readAllStandardOutput()
+        text = self._decoders[is_err].decode(bytes(data))
+        if not text:
+            return
+        if self._pending and self._pending[-1][0] == is_err:
+            self._pending[-1][1].append(text)
+        else:
+            self._pending.append([is_err, [text]])
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_MS)
+
+    def _flush(self):
+        pending, self._pending = self._pending, []
+        for is_err, chunks in pending:
+            self.output.emit("".join(chunks), is_err)
+
+    def _on_timeout(self):
+        self._status = "timeout"
+        self.kill()
+
+    def _on_error(self, proc, err):
+        if err == QProcess.ProcessError.FailedToStart and proc is self.proc:
+            self._finish(proc, "failed", proc.errorString())
+
+    def _on_finished(self, proc, code, exit_status):
+        if proc is not self.proc:
+            return
+        self._read(proc, False)
+        self._read(proc, True)
+        if exit_status == QProcess.ExitStatus.CrashExit:
+            status = "crashed"
+        else:
+            status = "ok" if code == 0 else "error"
+        self._finish(proc, self._status or status)
+
+    def _finish(self, proc, status, message=""):
+        self._deadline.stop()
+        self._grace.stop()
+        self._flush_timer.stop()
+        self._flush()
+        if message:
+            self.output.emit(message, True)
+        self.proc = None
+        proc.deleteLater()
+        self.finished.emit(status, time.perf_counter() - self._start)
+
+
+class OutputLog:
+    """One tab's console: the tail of a run's output on screen, all of it on disk.
+
+    `doc` holds at most OUTPUT_MAX_LINES lines of at most OUTPUT_MAX_LINE
+    characters; a batch with more lines than fit is cut before it reaches
+    the document, so a flood costs no more to show than a screenful. The
+    whole output (up to OUTPUT_SPOOL_MB) goes to a temporary file that
+    save() copies out.
+    """
+    def __init__(self, font, parent=None):
+        self.doc = QTextDocument(parent)
+        self.doc.setDocumentLayout(QPlainTextDocumentLayout(self.doc))
+        self.doc.setDefaultFont(font)
+        self.doc.setUndoRedoEnabled(False)
+        self.doc.setMaximumBlockCount(OUTPUT_MAX_LINES)
+        self.spool = None
+        self.lines = 0          # lines the program printed
+        self.spooled = 0        # characters in the spool
+        self._cut = False       # the last line on screen was cut short
+
+    def clear(self):
+        self.doc.clear()
+        if self.spool:
+            self.spool.close()
+        self.spool = None
+        self.lines = self.spooled = 0
+        self._cut = False
+
+    def close(self):
+        self.clear()
+        self.doc.deleteLater()
+
+    def append(self, text, fmt):
+        """Add program output: to the spool, and its tail to the screen."""
+        self._write(text)
+        newlines = text.count("\n")
+        self.lines += newlines
+        if newlines >= OUTPUT_MAX_LINES:
+            cut = len(text)
+            for _ in range(OUTPUT_MAX_LINES):
+                cut = text.rfind("\n", 0, cut)
+            text = text[cut + 1:]
+            self.doc.clear()
+            self._cut = False
+        room = OUTPUT_MAX_LINE - (self.doc.lastBlock().length() - 1)
+        parts = text.split("\n")
+        for i, line in enumerate(parts):
+            if i:
+                room, self._cut = OUTPUT_MAX_LINE, False
+            if len(line) > room:
+                parts[i] = "" if self._cut else line[:max(0, room)] + " \u2026"
+                self._cut = True
+        cur = QTextCursor(self.doc)
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        cur.insertText("\n".join(parts), fmt)
+
+    def note(self, text, fmt):
+        """Add a message of the app's own (not saved with the output) on a line of its own."""
+        cur = QTextCursor(self.doc)
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        if self.doc.lastBlock().text():
+            cur.insertText("\n")
+        cur.insertText(text, fmt)
+
+    def _write(self, text):
+        if self.spooled >= OUTPUT_SPOOL_MB << 20:
+            return
+        try:
+            if self.spool is None:
+                self.spool = tempfile.TemporaryFile("w+", encoding="utf-8", errors="replace", prefix="pylearn-")
+            self.spool.write(text)
+            self.spooled += len(text)
+            if self.spooled >= OUTPUT_SPOOL_MB << 20:
+                self.spool.write(f"\n[output truncated at {OUTPUT_SPOOL_MB} MB]\n")
+        except OSError:
+            self.spooled = OUTPUT_SPOOL_MB << 20    # disk trouble: keep showing, stop spooling
+
+    def save(self, path):
+        """Write everything the program printed to `path`."""
+        with open(path, "w", encoding="utf-8") as out:
+            if self.spool:
+                self.spool.flush()
+                self.spool.seek(0)
+                shutil.copyfileobj(self.spool, out)
+                self.spool.seek(0, io.SEEK_END)
+
+
 # ─── Editor Page ─────────────────────────────────────────────────────────────
 
 class EditorPage(QWidget):
     def __init__(self, status_callback=None):
         super().__init__()
         self._status_cb = status_callback
-        self._tabs = []          # list of {file: path|None, code: str}
+        self._tabs = []          # list of {file, doc, hl, large, view, loader, out, runner}; see _add_tab
         self._active_tab = -1
         self._new_counter = 0
+        self.pool = InterpreterPool(parent=self)
         lay = QVBoxLayout(self)
         lay.setContentsMargins(0, 0, 0, 0)
         lay.setSpacing(0)
@@ -771,6 +1568,7 @@ class EditorPage(QWidget):
         bar.setSpacing(8)
 
         self.title_lbl = QLabel("Code Editor")
+        self.title_lbl.setObjectName("editorTitle")
         self.title_lbl.setFont(QFont("Segoe UI", 13, QFont.Weight.Bold))
         bar.addWidget(self.title_lbl)
 
@@ -782,6 +1580,7 @@ class EditorPage(QWidget):
                             ("Save", "_file_save"), ("Save As", "_file_save_as"),
                             ("Clear", "_clear")]:
             btn = QPushButton(label)
+            btn.setObjectName("fileBtn")
             btn.setFont(QFont("Segoe UI", 9))
             btn.setFixedHeight(28)
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -793,6 +1592,7 @@ class EditorPage(QWidget):
         bar.addSpacing(6)
 
         self.run_btn = GlowButton("\u25b6 Run")
+        self.run_btn.setObjectName("runBtn")
         self.run_btn.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
         self.run_btn.setFixedHeight(28)
         self.run_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -802,22 +1602,27 @@ class EditorPage(QWidget):
 
         # Accent gradient bar
         self._accent_bar = QFrame()
+        self._accent_bar.setObjectName("accentBar")
         self._accent_bar.setFixedHeight(2)
         lay.addWidget(self._accent_bar)
 
         # ── Tab bar ──
         self.tab_bar = QTabBar()
+        self.tab_bar.setObjectName("editorTabs")
         self.tab_bar.setTabsClosable(True)
         self.tab_bar.setMovable(True)
         self.tab_bar.setExpanding(False)
         self.tab_bar.setFont(QFont("Consolas", 9))
         self.tab_bar.currentChanged.connect(self._on_tab_changed)
         self.tab_bar.tabCloseRequested.connect(self._close_tab)
+        self.tab_bar.tabMoved.connect(self._on_tab_moved)
         lay.addWidget(self.tab_bar)
 
         # ── Splitter: editor + console ──
         self.splitter = QSplitter(Qt.Orientation.Vertical)
+        self.splitter.setObjectName("editorSplit")
         self.editor = CodeEditor()
+        self.editor.setObjectName("codeEditor")
         self.editor.setPlaceholderText("# Write Python code here...\n# Ctrl+Enter = run, Ctrl+S = save, Ctrl+N = new tab\n")
         self.editor.cursorPositionChanged.connect(self._update_status)
         self.splitter.addWidget(self.editor)
@@ -830,22 +1635,33 @@ class EditorPage(QWidget):
 
         console_header = QHBoxLayout()
         self.out_lbl = QLabel("Console")
+        self.out_lbl.setObjectName("consoleLabel")
         self.out_lbl.setFont(QFont("Segoe UI", 10, QFont.Weight.Bold))
         console_header.addWidget(self.out_lbl)
         console_header.addStretch()
 
         self.time_lbl = QLabel("")
+        self.time_lbl.setObjectName("runTime")
         self.time_lbl.setFont(QFont("Consolas", 9))
         console_header.addWidget(self.time_lbl)
 
         self.clear_console_btn = QPushButton("Clear")
+        self.clear_console_btn.setObjectName("consoleBtn")
         self.clear_console_btn.setFont(QFont("Segoe UI", 8))
         self.clear_console_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.clear_console_btn.clicked.connect(lambda: self.output.clear())
+        self.clear_console_btn.clicked.connect(self._clear_output)
         console_header.addWidget(self.clear_console_btn)
+
+        self.save_output_btn = QPushButton("Save")
+        self.save_output_btn.setObjectName("consoleBtn")
+        self.save_output_btn.setFont(QFont("Segoe UI", 8))
+        self.save_output_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.save_output_btn.clicked.connect(self._save_output)
+        console_header.addWidget(self.save_output_btn)
         cl.addLayout(console_header)
 
-        self.output = QTextEdit()
+        self.output = QPlainTextEdit()
+        self.output.setObjectName("console")
         self.output.setReadOnly(True)
         self.output.setFont(QFont("Consolas", 11))
         self.output.setPlaceholderText("Output appears here...")
@@ -857,8 +1673,8 @@ class EditorPage(QWidget):
 
         # Progress bar
         self.progress = QFrame()
+        self.progress.setObjectName("progress")
         self.progress.setFixedHeight(3)
-        self.progress.setStyleSheet("background:transparent;")
         lay.addWidget(self.progress)
         self._prog_anim = None
 
@@ -868,40 +1684,83 @@ class EditorPage(QWidget):
 
     # ── Tab management ──
 
-    def _add_tab(self, name, filepath, code):
-        """Add a new tab and switch to it."""
-        self._save_current_tab()
+    def _add_tab(self, name, filepath, code, large=False):
+        """Add a new tab and switch to it.
+
+        Each tab owns its editor document ("doc", highlighted by "hl"
+        unless it is a "large" file) and console document ("out"); "view"
+        keeps the cursor and scroll position while another tab is shown,
+        and "loader" is the FileLoader still filling "doc", if any.
+        """
+        doc, hl = self.editor.new_document(large, self)
+        doc.setPlainText(code)
+        out = OutputLog(self.output.font(), self)
+        tab = {"file": filepath, "doc": doc, "hl": hl, "large": large, "view": None,
+               "loader": None, "out": out, "runner": CodeRunner(self.pool, self)}
+        tab["runner"].output.connect(lambda text, is_err: self._append_output(tab, text, is_err))
+        tab["runner"].finished.connect(lambda status, secs: self._run_finished(tab, status, secs))
+        self._tabs.append(tab)
         idx = self.tab_bar.addTab(name)
-        self._tabs.append({"file": filepath, "code": code})
         self.tab_bar.setCurrentIndex(idx)
-
-    def _save_current_tab(self):
-        """Save editor content into current tab's data."""
-        if 0 <= self._active_tab < len(self._tabs):
-            self._tabs[self._active_tab]["code"] = self.editor.toPlainText()
+        return tab
 
     def _on_tab_changed(self, idx):
         if idx < 0 or idx >= len(self._tabs):
             return
-        if self._active_tab >= 0 and self._active_tab < len(self._tabs):
-            self._tabs[self._active_tab]["code"] = self.editor.toPlainText()
+        if 0 <= self._active_tab < len(self._tabs):
+            self._tabs[self._active_tab]["view"] = (self.editor.textCursor(),
+                                                    self.editor.verticalScrollBar().value())
         self._active_tab = idx
         tab = self._tabs[idx]
-        self.editor.setPlainText(tab["code"])
-        self.output.clear()
+        self.editor.set_document(tab["doc"], tab["hl"], tab["large"])
+        self.editor.setReadOnly(tab["loader"] is not None)
+        if tab["view"]:
+            self.editor.setTextCursor(tab["view"][0])
+            self.editor.verticalScrollBar().setValue(tab["view"][1])
+        self.output.setDocument(tab["out"].doc)
+        self._show_run_state()
+        self._show_load_state()
         self._update_status()
 
+    def _on_tab_moved(self, frm, to):
+        self._tabs.insert(to, self._tabs.pop(frm))
+        self._active_tab = self.tab_bar.currentIndex()
+
     def _close_tab(self, idx):
         if len(self._tabs) <= 1:
             # Don't close last tab, just clear it
-            self._tabs[0] = {"file": None, "code": ""}
+            tab = self._tabs[0]
+            tab["runner"].kill()
+            self._cancel_load(tab)
+            old = tab["doc"]
+            tab["doc"], tab["hl"] = self.editor.new_document(False, self)
+            tab.update(file=None, large=False, view=None)
             self.tab_bar.setTabText(0, "untitled")
-            self.editor.clear()
-            self.output.clear()
+            self.editor.set_document(tab["doc"], tab["hl"])
+            self.editor.setReadOnly(False)
+            old.deleteLater()
+            tab["out"].clear()
+            self._show_load_state()
             return
-        self._tabs.pop(idx)
+        tab = self._tabs.pop(idx)
+        if idx < self._active_tab:
+            self._active_tab -= 1
+        elif idx == self._active_tab:
+            self._active_tab = -1   # its view is gone; don't record it on a neighbour
         self.tab_bar.removeTab(idx)
         # _active_tab will be updated by currentChanged signal
+        self._cancel_load(tab)
+        tab["runner"].kill(wait=True)
+        tab["runner"].deleteLater()
+        tab["out"].close()
+        tab["doc"].deleteLater()
+
+    def stop_all(self):
+        """Kill every running program (the window is closing)."""
+        for tab in self._tabs:
+            tab["runner"].kill(wait=True)
+            self._cancel_load(tab)
+        self.pool.shutdown()
 
     def _current_file(self):
         if 0 <= self._active_tab < len(self._tabs):
@@ -921,58 +1780,8 @@ class EditorPage(QWidget):
     # ── Theme ──
 
     def apply_theme(self):
-        self.title_lbl.setStyleSheet(f"color:{T['text']};background:transparent;")
-        self._accent_bar.setStyleSheet(f"background:qlineargradient(x1:0,y1:0,x2:1,y2:0,"
-            f"stop:0 {T['accent']},stop:0.5 {T['accent2']},stop:1 {T['accent']});")
-        file_btn_style = f"""QPushButton{{background:{T['bg2']};color:{T['dim']};
-            border:1px solid {T['border']};border-radius:4px;padding:4px 12px;}}
-            QPushButton:hover{{background:{T['bg3']};color:{T['text']};}}"""
-        for btn in self._file_btns:
-            btn.setStyleSheet(file_btn_style)
-        self.clear_console_btn.setStyleSheet(f"""QPushButton{{background:transparent;color:{T['dim']};
-            border:none;padding:2px 6px;font-size:8px;}}
-            QPushButton:hover{{color:{T['text']};}}""")
-        self._idle_style = f"""QPushButton{{background:{T['green']};color:white;border:none;
-            border-radius:6px;padding:5px 14px;min-width:60px;}}
-            QPushButton:hover{{background:#24a06b;}}"""
-        self._active_style = f"""QPushButton{{background:{T['orange']};color:white;border:none;
-            border-radius:6px;padding:5px 14px;min-width:60px;}}"""
-        self.run_btn.setStyleSheet(self._idle_style)
         self.run_btn.update_glow_color()
-        self.run_btn.start_pulse()
-        # Tab bar style
-        self.tab_bar.setStyleSheet(f"""
-            QTabBar{{background:{T['bg']};border:none;}}
-            QTabBar::tab{{
-                background:{T['bg2']};color:{T['dim']};
-                border:1px solid {T['border']};border-bottom:none;
-                padding:5px 18px 5px 12px;margin-right:2px;
-                border-top-left-radius:6px;border-top-right-radius:6px;
-                min-width:80px;
-            }}
-            QTabBar::tab:selected{{
-                background:{T['bg3']};color:{T['text']};
-                border-bottom:2px solid {T['accent']};
-            }}
-            QTabBar::tab:hover{{background:{T['bg3']};color:{T['text']};}}
-            QTabBar::close-button{{
-                subcontrol-position:right;
-                margin:2px;
-                border-radius:3px;
-                padding:1px;
-            }}
-            QTabBar::close-button:hover{{
-                background:{T['accent']};
-            }}""")
         self.editor.apply_theme()
-        self.out_lbl.setStyleSheet(f"color:{T['dim']};background:transparent;")
-        self.time_lbl.setStyleSheet(f"color:{T['dim']};background:transparent;")
-        self.output.setStyleSheet(f"""QTextEdit{{background:{T['bg2']};color:{T['green']};
-            border:1px solid {T['border']};border-radius:8px;padding:8px;}}
-            QScrollBar:vertical{{background:{T['bg']};width:8px;border-radius:4px;}}
-            QScrollBar::handle:vertical{{background:{T['bg3']};border-radius:4px;min-height:30px;}}
-            QScrollBar::add-line:vertical,QScrollBar::sub-line:vertical{{height:0;}}""")
-        self.splitter.setStyleSheet(f"QSplitter::handle{{background:{T['border']};height:2px;}}")
 
     def _update_status(self):
         if self._status_cb:
@@ -981,36 +1790,103 @@ class EditorPage(QWidget):
             col = cursor.columnNumber() + 1
             f = self._current_file()
             name = os.path.basename(f) if f else "untitled"
-            self._status_cb(f"  {name}    Ln {line}, Col {col}    {self.editor.blockCount()} lines")
+            mode = "    Large file: no highlighting" if self.editor.large else ""
+            self._status_cb(f"  {name}    Ln {line}, Col {col}    {self.editor.blockCount()} lines{mode}")
 
     # ── File operations ──
 
     def _file_new(self):
         """Create a new tab (keeps existing tabs)."""
-        self._save_current_tab()
         self._new_counter += 1
         self._add_tab(f"untitled-{self._new_counter}", None, "")
-        self.editor.clear()
-        self.output.clear()
 
     def _file_open(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open Python File", "",
             "Python Files (*.py *.pyw);;All Files (*)")
         if path:
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                code = f.read()
-            # Open in new tab
-            self._save_current_tab()
-            name = os.path.basename(path)
-            self._add_tab(name, path, code)
-            self.editor.setPlainText(code)
-            self.output.clear()
+            self.open_file(path)
+
+    def open_file(self, path):
+        """Open `path` in a new tab, read in the background.
+
+        The tab stays read-only until the whole file is in; files of
+        LARGE_FILE_BYTES or more open in large-file mode (no highlighting,
+        no line wrap).
+        """
+        try:
+            large = os.path.getsize(path) >= LARGE_FILE_BYTES
+        except OSError as e:
+            self._note(self._tabs[self._active_tab], f"Cannot open {path}: {e}", T["accent"])
+            return
+        tab = self._add_tab(os.path.basename(path), path, "", large)
+        loader = tab["loader"] = FileLoader(path, self)
+        tab["doc"].setUndoRedoEnabled(False)
+        cursor = QTextCursor(tab["doc"])
+        loader.chunk.connect(lambda text: self._load_chunk(tab, cursor, text))
+        loader.progress.connect(lambda frac: self._show_load_state(tab, frac))
+        loader.finished.connect(lambda error: self._load_finished(tab, error))
+        self.editor.setReadOnly(True)
+        self._show_load_state(tab, 0.0)
+        loader.start()
+
+    def _load_chunk(self, tab, cursor, text):
+        first = cursor.position() == 0
+        cursor.insertText(text)
+        if first:
+            # the view's cursor sat where the text went in and moved along; put it
+            # back at the top so later chunks go in after it
+            if tab in self._tabs and self._tabs.index(tab) == self._active_tab:
+                self.editor.moveCursor(QTextCursor.MoveOperation.Start)
+            else:
+                tab["view"] = None
+
+    def _load_finished(self, tab, error):
+        loader, tab["loader"] = tab["loader"], None
+        if loader is None:
+            return
+        loader.deleteLater()
+        tab["doc"].setUndoRedoEnabled(True)
+        tab["doc"].setModified(False)
+        if error:
+            self._note(tab, error, T["accent"])
+        if tab in self._tabs and self._tabs.index(tab) == self._active_tab:
+            self.editor.setReadOnly(False)
+            self._show_load_state()
+            self._update_status()
+
+    def _cancel_load(self, tab):
+        """Stop filling a tab whose document is about to go away."""
+        loader, tab["loader"] = tab["loader"], None
+        if loader is not None:
+            loader.cancel()
+            loader.deleteLater()
+
+    def _show_load_state(self, tab=None, frac=None):
+        """Progress bar and label while the current tab's file is loading."""
+        if not 0 <= self._active_tab < len(self._tabs):
+            return
+        current = self._tabs[self._active_tab]
+        if tab is not None and tab is not current:
+            return
+        if current["loader"] is None:
+            if self.time_lbl.text().startswith("Opening"):
+                self.time_lbl.setText("")
+                restyle(self.progress, active=False)
+            return
+        if frac is None:
+            frac = 0.0
+        self.time_lbl.setText(f"Opening... {frac * 100:.0f}%")
+        restyle(self.progress, active=True)
+        self.progress.setFixedWidth(max(1, int(self.width() * frac)))
 
     def _file_save(self):
+        if 0 <= self._active_tab < len(self._tabs) and self._tabs[self._active_tab]["loader"]:
+            return   # still loading: saving now would cut the file short
         f = self._current_file()
         if f:
             with open(f, 'w', encoding='utf-8') as fh:
                 fh.write(self.editor.toPlainText())
+            self.editor.document().setModified(False)
             self.time_lbl.setText("Saved!")
             QTimer.singleShot(2000, lambda: self.time_lbl.setText(""))
         else:
@@ -1026,80 +1902,112 @@ class EditorPage(QWidget):
 
     def set_code(self, code):
         """Load lesson code into a new tab."""
-        self._save_current_tab()
         self._add_tab("lesson", None, code.strip())
-        self.editor.setPlainText(code.strip())
-        self.output.clear()
 
     def _clear(self):
+        if 0 <= self._active_tab < len(self._tabs) and self._tabs[self._active_tab]["loader"]:
+            return
         self.editor.clear()
-        self.output.clear()
+        self._clear_output()
+
+    def _clear_output(self):
+        if 0 <= self._active_tab < len(self._tabs):
+            self._tabs[self._active_tab]["out"].clear()
+
+    def _save_output(self):
+        """Save everything the current tab's last run printed."""
+        if not 0 <= self._active_tab < len(self._tabs):
+            return
+        log = self._tabs[self._active_tab]["out"]
+        if not log.spooled:
+            self.time_lbl.setText("No output to save")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Output", "output.txt",
+            "Text Files (*.txt);;All Files (*)")
+        if path:
+            try:
+                log.save(path)
+            except OSError as e:
+                self.time_lbl.setText(f"Save failed: {e.strerror}")
+                return
+            self.time_lbl.setText("Output saved!")
+            QTimer.singleShot(2000, lambda: self.time_lbl.setText(""))
 
     def _run_code(self):
+        """Run the current tab's code, or stop it if it is already running."""
+        if not 0 <= self._active_tab < len(self._tabs):
+            return
+        tab = self._tabs[self._active_tab]
+        if tab["runner"].is_running():
+            tab["runner"].cancel()
+            return
+        if tab["loader"]:
+            return
         code = self.editor.toPlainText()
         if not code.strip():
-            c = T["orange"]
-            self.output.setHtml(f"<span style='color:{c}'>No code to run.</span>")
+            tab["out"].clear()
+            self._note(tab, "No code to run.", T["orange"])
             return
-        self.run_btn.stop_pulse()
-        self.run_btn.setStyleSheet(self._active_style)
-        self.run_btn.setText("Running...")
-        self.run_btn.setEnabled(False)
-        self.progress.setStyleSheet(f"background:{T['accent']};")
+        restyle(self.progress, active=True)
         self.progress.setFixedWidth(0)
         a = QPropertyAnimation(self.progress, b"minimumWidth")
         a.setDuration(2000); a.setStartValue(0); a.setEndValue(self.width())
         a.setEasingCurve(QEasingCurve.Type.Linear); a.start()
         self._prog_anim = a
-        c = T["dim"]
-        self.output.setHtml(f"<span style='color:{c}'>Running...</span>")
-        self._run_start = time.perf_counter()
-        QTimer.singleShot(50, lambda: self._exec(code))
-
-    def _exec(self, code):
-        cg, ce, cd = T["green"], T["accent"], T["dim"]
-        py = _find_python()
-        cur_file = self._current_file()
-        try:
-            if py is None:
-                self.output.setHtml(f"<span style='color:{ce}'>Python not found! Install Python and add to PATH.</span>")
-                return
-            if cur_file:
-                r = subprocess.run([py, cur_file],
-                    capture_output=True, text=True, timeout=15,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-                    cwd=os.path.dirname(cur_file))
-            else:
-                r = subprocess.run([py, "-c", code],
-                    capture_output=True, text=True, timeout=15,
-                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0)
-            o, e = r.stdout, r.stderr
-            if o and e:
-                self.output.setHtml(f"<pre style='color:{cg}'>{self._e(o)}</pre><pre style='color:{ce}'>{self._e(e)}</pre>")
-            elif o:
-                self.output.setHtml(f"<pre style='color:{cg}'>{self._e(o)}</pre>")
-            elif e:
-                self.output.setHtml(f"<pre style='color:{ce}'>{self._e(e)}</pre>")
-            else:
-                self.output.setHtml(f"<span style='color:{cd}'>Done (no output).</span>")
-        except subprocess.TimeoutExpired:
-            self.output.setHtml(f"<span style='color:{ce}'>Timeout (15s).</span>")
-        except Exception as ex:
-            self.output.setHtml(f"<span style='color:{ce}'>Error: {self._e(str(ex))}</span>")
-        finally:
-            elapsed = time.perf_counter() - self._run_start
-            self.time_lbl.setText(f"{elapsed:.3f}s")
-            self.run_btn.setEnabled(True)
+        tab["out"].clear()
+        self.time_lbl.setText("Running...")
+        tab["runner"].start(code, tab["file"])
+        self._show_run_state()
+
+    def _show_run_state(self):
+        """Run button reflects the current tab: Stop while its program runs."""
+        if not 0 <= self._active_tab < len(self._tabs):
+            return
+        if self._tabs[self._active_tab]["runner"].is_running():
+            self.run_btn.stop_pulse()
+            restyle(self.run_btn, running=True)
+            self.run_btn.setText("\u25a0 Stop")
+        else:
             self.run_btn.setText("\u25b6 Run")
-            self.run_btn.setStyleSheet(self._idle_style)
+            restyle(self.run_btn, running=False)
             self.run_btn.start_pulse()
-            if self._prog_anim:
-                self._prog_anim.stop()
-            self.progress.setFixedWidth(self.width())
-            QTimer.singleShot(400, lambda: self.progress.setStyleSheet("background:transparent;"))
 
-    def _e(self, t):
-        return t.replace("&","&amp;").replace("<","&lt;").replace(">","&gt;")
+    def _append_output(self, tab, text, is_err):
+        """Append a batch of program output at the end of the tab's console."""
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(T["accent"] if is_err else T["green"]))
+        current = tab["out"].doc is self.output.document()
+        bar = self.output.verticalScrollBar()
+        at_end = bar.value() >= bar.maximum() - 4
+        tab["out"].append(text, fmt)
+        if current and at_end:
+            bar.setValue(bar.maximum())
+
+    def _note(self, tab, text, color):
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        tab["out"].note(text, fmt)
+
+    def _run_finished(self, tab, status, secs):
+        cd, ce = T["dim"], T["accent"]
+        log = tab["out"]
+        note = {"timeout": (f"Timeout ({RUN_TIMEOUT}s).", ce), "stopped": ("Stopped.", ce),
+                "crashed": ("Process killed (CPU or memory limit?).", ce)}.get(status)
+        if note is None and log.doc.isEmpty():
+            note = ("Done (no output).", cd)
+        if log.lines > OUTPUT_MAX_LINES:
+            self._note(tab, f"Showing the last {OUTPUT_MAX_LINES} of {log.lines} lines; "
+                            f"Save keeps them all.", cd)
+        if note:
+            self._note(tab, *note)
+        if log.doc is not self.output.document():
+            return
+        self.time_lbl.setText(f"{secs:.3f}s")
+        self._show_run_state()
+        if self._prog_anim:
+            self._prog_anim.stop()
+        self.progress.setFixedWidth(self.width())
+        QTimer.singleShot(400, lambda: restyle(self.progress, active=False))
 
 
 
@@ -1110,6 +2018,7 @@ class EditorPage(QWidget):
 class Sidebar(QFrame):
     def __init__(self, on_nav, on_theme):
         super().__init__()
+        self.setObjectName("sidebar")
         self.setFixedWidth(200)
         self.on_nav = on_nav
         self.on_theme = on_theme
@@ -1120,31 +2029,40 @@ class Sidebar(QFrame):
 
         logo_box = QWidget()
         logo_box.setFixedHeight(64)
-        logo_box.setStyleSheet("background:transparent;")
+        logo_box.setObjectName("logoBox")
         ll = QVBoxLayout(logo_box)
         ll.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.logo = QLabel("{ Py }")
+        self.logo.setObjectName("logo")
         self.logo.setFont(QFont("Consolas", 22, QFont.Weight.Bold))
         self.logo.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self._logo_shadow = QGraphicsDropShadowEffect()
         self._logo_shadow.setOffset(0, 0)
         self._logo_shadow.setBlurRadius(0)
         self.logo.setGraphicsEffect(self._logo_shadow)
+        self._logo_pulse = None
         ll.addWidget(self.logo)
         self.logo_sub = QLabel("Learn Python • By Kotan123")
+        self.logo_sub.setObjectName("logoSub")
         self.logo_sub.setFont(QFont("Segoe UI", 8))
         self.logo_sub.setAlignment(Qt.AlignmentFlag.AlignCenter)
         ll.addWidget(self.logo_sub)
         lay.addWidget(logo_box)
 
         self.sep = QFrame()
+        self.sep.setObjectName("sidebarSep")
         self.sep.setFixedHeight(1)
         lay.addWidget(self.sep)
         lay.addSpacing(6)
 
+        self.active_page = "📚 Lessons"
+        self.active_theme = "Midnight"
+
         self.nav_btns = []
         for text in ["📚 Lessons", "💻 Code Editor"]:
             btn = QPushButton(f"  {text}")
+            btn.setObjectName("navBtn")
+            btn.setProperty("active", text == self.active_page)
             btn.setFont(QFont("Segoe UI", 11))
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.setFixedHeight(42)
@@ -1155,13 +2073,15 @@ class Sidebar(QFrame):
         lay.addSpacing(12)
 
         theme_label = QLabel("  Theme")
+        theme_label.setObjectName("themeLabel")
         theme_label.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
         lay.addWidget(theme_label)
-        self._theme_label = theme_label
 
         self.theme_btns = []
         for name in THEMES:
             btn = QPushButton(f"  {name}")
+            btn.setObjectName("themeBtn")
+            btn.setProperty("active", name == self.active_theme)
             btn.setFont(QFont("Segoe UI", 10))
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.setFixedHeight(34)
@@ -1172,52 +2092,23 @@ class Sidebar(QFrame):
         lay.addStretch()
 
         self.foot = QLabel("v1.0 • By Kotan123")
+        self.foot.setObjectName("sidebarFoot")
         self.foot.setFont(QFont("Segoe UI", 8))
         self.foot.setAlignment(Qt.AlignmentFlag.AlignCenter)
         lay.addWidget(self.foot)
 
-        self.active_page = "📚 Lessons"
-        self.active_theme = "Midnight"
-
     def apply_theme(self):
-        self.setStyleSheet(f"Sidebar{{background:{T['bg2']};border-right:1px solid {T['border']};}}")
-        self.logo.setStyleSheet(f"color:{T['accent']};background:transparent;")
         self._logo_shadow.setColor(QColor(T["accent"]))
-        self.logo_sub.setStyleSheet(f"color:{T['dim']};background:transparent;")
-        self.sep.setStyleSheet(f"background:{T['border']};")
-        self._theme_label.setStyleSheet(f"color:{T['dim']};padding-left:8px;background:transparent;")
-        self.foot.setStyleSheet(f"color:{T['dim']};padding:10px;background:transparent;")
-        for btn, text in self.nav_btns:
-            btn.setStyleSheet(self._nav_style(text == self.active_page))
-        for btn, name in self.theme_btns:
-            btn.setStyleSheet(self._theme_style(name == self.active_theme))
-
-    def _nav_style(self, active):
-        if active:
-            return f"""QPushButton{{background:qlineargradient(x1:0,y1:0,x2:1,y2:0,
-                stop:0 {T['accent']},stop:1 {T['accent2']});color:white;border:none;
-                border-radius:8px;text-align:left;padding-left:12px;margin:2px 8px;}}"""
-        return f"""QPushButton{{background:transparent;color:{T['dim']};border:none;
-            border-radius:8px;text-align:left;padding-left:12px;margin:2px 8px;}}
-            QPushButton:hover{{background:{T['bg3']};color:{T['text']};
-            border-left:3px solid {T['accent']};}}"""
-
-    def _theme_style(self, active):
-        if active:
-            return f"""QPushButton{{background:{T['bg3']};color:{T['text']};border:none;
-                border-radius:6px;text-align:left;padding-left:12px;margin:1px 8px;
-                border-left:3px solid {T['accent']};}}"""
-        return f"""QPushButton{{background:transparent;color:{T['dim']};border:none;
-            border-radius:6px;text-align:left;padding-left:12px;margin:1px 8px;}}
-            QPushButton:hover{{background:{T['bg3']};color:{T['text']};}}"""
 
     def set_active(self, name):
         self.active_page = name
         for btn, text in self.nav_btns:
-            btn.setStyleSheet(self._nav_style(text == name))
+            restyle(btn, active=text == name)
 
     def set_active_theme(self, name):
         self.active_theme = name
+        for btn, theme in self.theme_btns:
+            restyle(btn, active=theme == name)
 
     def _nav(self, name):
         self.set_active(name)
@@ -1232,8 +2123,17 @@ class Sidebar(QFrame):
         a_out.setDuration(800); a_out.setStartValue(25); a_out.setEndValue(0)
         a_out.setEasingCurve(QEasingCurve.Type.InOutSine)
         seq.addAnimation(a_in); seq.addAnimation(a_out)
-        seq.setLoopCount(-1); seq.start()
+        seq.setLoopCount(-1)
         self._logo_pulse = seq
+        set_animating(seq, self.isVisible())
+
+    def showEvent(self, e):
+        super().showEvent(e)
+        set_animating(self._logo_pulse, True)
+
+    def hideEvent(self, e):
+        super().hideEvent(e)
+        set_animating(self._logo_pulse, False)
 
 
 # ─── Main Window ─────────────────────────────────────────────────────────────
@@ -1247,22 +2147,30 @@ class MainWindow(QMainWindow):
         icon_path = resource_path("icon.ico")
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
+        # Style is in place before any widget exists, so each is polished once.
+        # (Set on the window, not the QApplication: restyling is ~4x faster.)
+        self.setStyleSheet(theme_stylesheet())
 
         # Status bar
         self.status = QStatusBar()
+        self.status.setObjectName("status")
         self.status.setFont(QFont("Consolas", 9))
         self.setStatusBar(self.status)
         self._status_lbl = QLabel("  PyLearn • By Kotan123")
+        self._status_lbl.setObjectName("statusLabel")
         self.status.addWidget(self._status_lbl)
 
         self.central = QWidget()
+        self.central.setObjectName("central")
         self.setCentralWidget(self.central)
         ml = QHBoxLayout(self.central)
         ml.setContentsMargins(0, 0, 0, 0)
         ml.setSpacing(0)
 
         self.sidebar = Sidebar(self._navigate, self._change_theme)
+        self.sidebar.apply_theme()
         ml.addWidget(self.sidebar)
+        profile_mark("sidebar")
 
         content_area = QWidget()
         cl = QVBoxLayout(content_area)
@@ -1270,28 +2178,53 @@ class MainWindow(QMainWindow):
         cl.setSpacing(0)
 
         self.stack = SlideStack()
+        self.stack.setObjectName("stack")
         cl.addWidget(self.stack)
         ml.addWidget(content_area, 1)
 
         self.particles = ParticleWidget(content_area)
         self.particles.lower()
 
-        self.lessons_page = LessonsPage(self._open_lesson)
-        self.detail_page = LessonDetailPage(self._back, self._try_code)
-        self.editor_page = EditorPage(self._set_status)
-        self.stack.addWidget(self.lessons_page)   # 0
-        self.stack.addWidget(self.detail_page)    # 1
-        self.stack.addWidget(self.editor_page)    # 2
+        self.lessons_page = self._add_page(LessonsPage(self._open_lesson))
+        # The lesson and editor pages are built on first use (detail_page, editor_page)
+        self._detail_page = None
+        self._editor_page = None
+        profile_mark("lessons page")
 
-        # Shortcuts
-        QShortcut(QKeySequence("Ctrl+Return"), self, self.editor_page._run_code)
-        QShortcut(QKeySequence("Ctrl+S"), self, self.editor_page._file_save)
-        QShortcut(QKeySequence("Ctrl+O"), self, self.editor_page._file_open)
-        QShortcut(QKeySequence("Ctrl+N"), self, self.editor_page._file_new)
+        # Shortcuts; Run and Save have nothing to act on before the editor exists
+        QShortcut(QKeySequence("Ctrl+Return"), self, lambda: self._editor_key("_run_code"))
+        QShortcut(QKeySequence("Ctrl+S"), self, lambda: self._editor_key("_file_save"))
+        QShortcut(QKeySequence("Ctrl+O"), self, lambda: self.editor_page._file_open())
+        QShortcut(QKeySequence("Ctrl+N"), self, lambda: self.editor_page._file_new())
 
-        self._apply_all_themes()
         QTimer.singleShot(50, self._startup)
 
+    @property
+    def detail_page(self):
+        if self._detail_page is None:
+            self._detail_page = self._add_page(LessonDetailPage(self._back, self._try_code))
+        return self._detail_page
+
+    @property
+    def editor_page(self):
+        if self._editor_page is None:
+            self._editor_page = self._add_page(EditorPage(self._set_status))
+        return self._editor_page
+
+    def _add_page(self, page):
+        self.stack.addWidget(page)
+        page.apply_theme()
+        return page
+
+    def _editor_key(self, slot):
+        if self._editor_page is not None:
+            getattr(self._editor_page, slot)()
+
+    def closeEvent(self, e):
+        if self._editor_page is not None:
+            self._editor_page.stop_all()
+        super().closeEvent(e)
+
     def _set_status(self, text):
         self._status_lbl.setText(text)
 
@@ -1303,14 +2236,12 @@ class MainWindow(QMainWindow):
                 ca.width() - self.sidebar.width(), ca.height())
 
     def _apply_all_themes(self):
-        self.central.setStyleSheet(f"background:{T['bg']};")
-        self.stack.setStyleSheet(f"background:{T['bg']};")
-        self.status.setStyleSheet(f"QStatusBar{{background:{T['bg2']};color:{T['dim']};border-top:1px solid {T['border']};}}")
-        self._status_lbl.setStyleSheet(f"color:{T['dim']};")
-        self.sidebar.apply_theme()
-        self.lessons_page.apply_theme()
-        self.detail_page.apply_theme()
-        self.editor_page.apply_theme()
+        """One stylesheet, then the colours stylesheets cannot reach
+        (palettes, shadows, editor selections) on the pages built so far."""
+        self.setStyleSheet(theme_stylesheet())
+        for page in (self.sidebar, self.lessons_page, self._detail_page, self._editor_page):
+            if page is not None:
+                page.apply_theme()
 
     def _startup(self):
         self.sidebar._pulse_logo()
@@ -1321,31 +2252,90 @@ class MainWindow(QMainWindow):
         self.sidebar.set_active_theme(name)
         self._apply_all_themes()
 
+    def _show_page(self, page):
+        self.stack.slide_to(self.stack.indexOf(page))
+
     def _navigate(self, name):
         if "Lessons" in name:
-            self.stack.slide_to(0)
+            self._show_page(self.lessons_page)
         elif "Code Editor" in name:
-            self.stack.slide_to(2)
+            self._show_page(self.editor_page)
 
     def _open_lesson(self, idx):
         self.detail_page.set_lesson(idx)
-        self.stack.slide_to(1)
+        self._show_page(self.detail_page)
 
     def _back(self):
-        self.stack.slide_to(0)
+        self._show_page(self.lessons_page)
         self.sidebar.set_active("📚 Lessons")
 
     def _try_code(self, code):
         self.editor_page.set_code(code)
-        self.stack.slide_to(2)
+        self._show_page(self.editor_page)
         self.sidebar.set_active("💻 Code Editor")
 
 
 
 # ─── Entry ───────────────────────────────────────────────────────────────────
 
+_profile = None   # [(step, time)] while --profile-startup is timing the start
+
+
+def profile_mark(step):
+    """Note the end of a startup step for --profile-startup."""
+    if _profile is not None:
+        _profile.append((step, time.perf_counter()))
+
+
+class StartupProfile(QObject):
+    """--profile-startup: print how long each startup step took up to the
+    window's first frame, then CPU use and timer wake-ups while the
+    lessons page sits idle, and quit."""
+    SETTLE_S = 2.0   # let the entrance animation finish first
+    IDLE_S = 3.0
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.painted = False
+        self.timers = 0
+        app.installEventFilter(self)
+
+    def eventFilter(self, obj, e):
+        t = e.type()
+        if t == QEvent.Type.Timer:
+            self.timers += 1
+        elif t == QEvent.Type.Paint and not self.painted:
+            self.painted = True
+            QTimer.singleShot(0, self._first_frame)   # after the whole frame is painted
+        return False
+
+    def _first_frame(self):
+        profile_mark("first frame")
+        print(f"{'startup':<16}{'step ms':>9}{'total ms':>10}")
+        for (_, prev), (step, t) in zip(_profile, _profile[1:]):
+            print(f"  {step:<14}{(t - prev) * 1000:9.1f}{(t - _START) * 1000:10.1f}")
+        QTimer.singleShot(int(self.SETTLE_S * 1000), self._idle_start)
+
+    def _idle_start(self):
+        self.timers = 0
+        self._cpu = time.process_time()
+        QTimer.singleShot(int(self.IDLE_S * 1000), self._idle_done)
+
+    def _idle_done(self):
+        cpu = (time.process_time() - self._cpu) / self.IDLE_S
+        print(f"idle {self.IDLE_S:.0f} s: {cpu * 100:.1f}% CPU, "
+              f"{self.timers / self.IDLE_S:.0f} timer wake-ups/s")
+        self.app.quit()
+
+
 def main():
+    global _profile
+    if "--profile-startup" in sys.argv:
+        _profile = [("start", _START)]
+        profile_mark("imports")
     app = QApplication(sys.argv)
+    profile_mark("QApplication")
     p = QPalette()
     p.setColor(QPalette.ColorRole.Window, QColor(T["bg"]))
     p.setColor(QPalette.ColorRole.WindowText, QColor(T["text"]))
@@ -1357,8 +2347,12 @@ def main():
     icon_path = resource_path("icon.ico")
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
+    if _profile is not None:
+        StartupProfile(app)
     w = MainWindow()
+    profile_mark("window")
     w.show()
+    profile_mark("show")
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""Fixed-capacity particle engine stored as a structure of arrays.
+
+    pool = ParticleEngine()
+    pool.add(k, x=xs, y=ys, vx=vxs, vy=vys, life=30, r=255, g=80, b=0)
+    pool.step()                        # move, age and compact one tick
+    cache = SpriteCache(2000)
+    blit_sprites(surface, codes, xs, ys, cache.get, build)
+
+Every attribute is its own column (a NumPy array, or array('d') when NumPy
+is missing). Live particles are packed into [0, n); dead ones are
+swap-removed, so stepping and drawing never rebuild Python lists. Adding
+into a full pool drops the overflow. Time is counted in ticks of 1/60 s:
+velocities are pixels per tick and life loses one per tick.
+
+Each game subclasses ParticleEngine with its own emitters and sprite keys,
+adding per-particle columns through EXTRA, and keeps its own build functions
+for the SpriteCache entries it draws. Used by MiniGamesArcade and
+NeonSnake; each adds this folder to sys.path.
+"""
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:  # columns fall back to array('d')
+    np = None
+
+PARTICLE_CAPACITY = 12000
+
+
+class ParticleEngine:
+    """Particle columns plus the update step shared by every particle type.
+
+    COLUMNS are the ones step() reads; subclasses list their own in EXTRA.
+    """
+    COLUMNS = ("x", "y", "vx", "vy", "life", "max_life", "size", "gravity",
+               "rot", "rotv", "r", "g", "b")
+    EXTRA = ()
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.n = 0
+        self.columns = self.COLUMNS + self.EXTRA
+        for name in self.columns:
+            if np is not None:
+                setattr(self, name, np.zeros(capacity))
+            else:
+                setattr(self, name, array("d", bytes(8 * capacity)))
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        self.n = 0
+
+    def room(self, count):
+        """How many of `count` new particles still fit."""
+        return max(0, min(count, self.capacity - self.n))
+
+    def add(self, count, **values):
+        """Append up to count particles; each value is a scalar or a sequence.
+
+        Columns that aren't given are zeroed; max_life defaults to life.
+        """
+        i = self.n
+        k = self.room(count)
+        if not k:
+            return
+        if "max_life" not in values and "life" in values:
+            values["max_life"] = values["life"]
+        for name in self.columns:
+            v = values.get(name, 0.0)
+            col = getattr(self, name)
+            seq = isinstance(v, (list, tuple)) or (np is not None and isinstance(v, np.ndarray))
+            if np is not None:
+                col[i:i + k] = v[:k] if seq else v
+            elif seq:
+                col[i:i + k] = array("d", v[:k])
+            else:
+                col[i:i + k] = array("d", [v]) * k
+        self.n = i + k
+
+    def step(self, ticks=1.0, drag=1.0):
+        """Advance every particle by `ticks`, slowing it by `drag` per tick,
+        then drop the ones whose life ran out."""
+        n = self.n
+        if not n:
+            return
+        slow = drag ** ticks
+        if np is not None:
+            x, y, vx, vy = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+            x += vx * ticks
+            y += vy * ticks
+            vy += self.gravity[:n] * ticks
+            if slow != 1.0:
+                vx *= slow
+                vy *= slow
+            self.rot[:n] += self.rotv[:n] * ticks
+            self.life[:n] -= ticks
+            alive = self.life[:n] > 0
+            m = int(np.count_nonzero(alive))
+            if m < n:
+                # Swap-remove: holes left by dead particles below m are filled
+                # with the live particles sitting at or above m.
+                holes = np.flatnonzero(~alive[:m])
+                movers = m + np.flatnonzero(alive[m:])
+                for name in self.columns:
+                    col = getattr(self, name)
+                    col[holes] = col[movers]
+            self.n = m
+            return
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        grav, rot, rotv = self.gravity, self.rot, self.rotv
+        cols = [getattr(self, name) for name in self.columns]
+        i = 0
+        while i < n:
+            life[i] -= ticks
+            if life[i] > 0:
+                x[i] += vx[i] * ticks
+                y[i] += vy[i] * ticks
+                vy[i] += grav[i] * ticks
+                vx[i] *= slow
+                vy[i] *= slow
+                rot[i] += rotv[i] * ticks
+                i += 1
+                continue
+            # Swap-remove; the particle moved into slot i is stepped next pass.
+            n -= 1
+            for col in cols:
+                col[i] = col[n]
+        self.n = n
+
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered sprites.
+
+    get(key, build) returns whatever build(key) produced on the first miss;
+    the least recently used entry is evicted once max_items is exceeded.
+    Particle sprites are (surface, ox, oy), see blit_sprites().
+    """
+    def __init__(self, max_items=2000):
+        self.items = OrderedDict()
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, build):
+        value = self.items.get(key)
+        if value is not None:
+            self.hits += 1
+            self.items.move_to_end(key)
+            return value
+        self.misses += 1
+        value = self.items[key] = build(key)
+        if len(self.items) > self.max_items:
+            self.items.popitem(last=False)
+        return value
+
+    def clear(self):
+        self.items.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "sprites": len(self.items)}
+
+
+def blit_sprites(surface, codes, xs, ys, get, build, rects=False):
+    """Blit the sprite of every code at its (x, y) in a single blits() call.
+
+    get(code, build) returns (sprite, ox, oy), the sprite and the offset of
+    its centre, e.g. a sprite cache's get(). With NumPy arrays each distinct
+    code is looked up once and fanned out with the inverse index. With
+    rects=True the touched rectangles are returned, for dirty-rect redraws.
+    """
+    if np is not None and isinstance(codes, np.ndarray):
+        uniq, inv = np.unique(codes, return_inverse=True)
+        entries = [get(c, build) for c in uniq.tolist()]
+        if not entries:
+            return []
+        surfs = np.empty(len(entries), object)
+        surfs[:] = [e[0] for e in entries]
+        ox = np.array([e[1] for e in entries])
+        oy = np.array([e[2] for e in entries])
+        dest = zip((xs - ox[inv]).tolist(), (ys - oy[inv]).tolist())
+        return surface.blits(zip(surfs[inv].tolist(), dest), rects)
+    seq = []
+    for code, x, y in zip(codes, xs, ys):
+        spr, ox, oy = get(code, build)
+        seq.append((spr, (x - ox, y - oy)))
+    return surface.blits(seq, rects)
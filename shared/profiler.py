@@ -0,0 +1,151 @@
+"""Per-frame phase timings behind the F3 overlay and the --profile export.
+
+    PROFILER = FrameProfiler(fps=60)
+    PROFILER.watch(TEXT_CACHE, SPRITES) # caches whose misses are Surface builds
+    PROFILER.start()                    # top of the frame
+    PROFILER.lap("event")               # after each phase ...
+    PROFILER.add("particles", seconds)  # ... or time measured inside another phase
+    PROFILER.frame(ticks, particles)    # after flip
+    PROFILER.draw(screen, font, (8, bottom))
+
+lap(phase) books the time since the previous lap to phase, less whatever
+add() booked in between, so work timed where it happens (input polling,
+particles) is not counted twice. Samples are kept only while the overlay is
+shown or a file is being written (.jsonl, otherwise CSV).
+
+surfaces_built counts the misses of the watched caches (text renders, sprite
+and panel builds), i.e. the Surfaces the apps' cached helpers had to make that
+frame. Surfaces made outside those helpers are not seen.
+
+Used by MiniGamesArcade and NeonSnake; each adds this folder to sys.path.
+"""
+import atexit
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+PHASES = ("event", "update", "particles", "draw", "flip")
+
+
+class FrameProfiler:
+    """Phase laps per frame, a short history for the overlay and an optional file."""
+    COLUMNS = ("frame", "ticks") + tuple(p + "_ms" for p in PHASES) + ("frame_ms", "particles", "surfaces_built")
+
+    def __init__(self, fps=60, history=300):
+        self.fps = fps
+        self.visible = False
+        self.history = deque(maxlen=history)
+        self.ph = dict.fromkeys(PHASES, 0.0)
+        self.t = time.perf_counter()
+        self.taken = 0.0
+        self.particles = 0
+        self.caches = []
+        self.misses = []
+        self.frames = 0
+        self.last = None
+        self.file = None
+        self.writer = None
+        self.panel = None
+
+    @property
+    def active(self):
+        return self.visible or self.file is not None
+
+    def watch(self, *caches):
+        """Count the misses of these caches (anything with a .misses counter) as Surface builds."""
+        for cache in caches:
+            self.caches.append(cache)
+            self.misses.append(cache.misses)
+
+    def _built(self):
+        """Watched-cache misses since the previous call; a cache that reset its counter counts from 0."""
+        built = 0
+        for i, cache in enumerate(self.caches):
+            m = cache.misses
+            built += m - self.misses[i] if m >= self.misses[i] else m
+            self.misses[i] = m
+        return built
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.panel = None
+
+    def open(self, path):
+        """Stream one sample per frame to path (.jsonl, otherwise CSV)."""
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        atexit.register(self.close)
+        if not path.endswith(".jsonl"):
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.COLUMNS)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = self.writer = None
+
+    def start(self):
+        self.t = time.perf_counter()
+        self.taken = 0.0
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.ph[phase] += max(0.0, now - self.t - self.taken)
+        self.t = now
+        self.taken = 0.0
+
+    def add(self, phase, seconds):
+        self.ph[phase] += seconds
+        self.taken += seconds
+
+    def frame(self, ticks=1, particles=None):
+        """Close a frame; particles defaults to the count added to .particles."""
+        now = time.perf_counter()
+        built = self._built()
+        if self.active:
+            self.frames += 1
+            frame_ms = (now - self.last) * 1000 if self.last is not None else 0.0
+            sample = (self.frames, ticks, *(round(self.ph[p] * 1000, 3) for p in PHASES), round(frame_ms, 3),
+                      self.particles if particles is None else particles, built)
+            self.history.append(sample)
+            if self.writer is not None:
+                self.writer.writerow(sample)
+            elif self.file is not None:
+                self.file.write(json.dumps(dict(zip(self.COLUMNS, sample))) + "\n")
+        self.last = now
+        for p in PHASES:
+            self.ph[p] = 0.0
+        self.particles = 0
+
+    def lines(self):
+        window = list(self.history)[-120:]
+        if not window:
+            return ["profiling..."]
+        n = len(window)
+        frame_ms = sorted(s[7] for s in window)
+        avg = sum(frame_ms) / n
+        low = frame_ms[min(n - 1, int(n * 0.99))]
+
+        def col(i):
+            return sum(s[i] for s in window) / n
+        return [
+            f"FPS {1000 / avg if avg else 0:5.0f}   frame {avg:5.2f} ms   1% low {low:5.2f} ms",
+            f"event {col(2):5.2f}  update {col(3):5.2f}  particles {col(4):5.2f}",
+            f"draw {col(5):5.2f}  flip {col(6):5.2f}  (ms, budget {1000 / self.fps:.1f})",
+            f"particles {window[-1][8]}   surfaces built/frame {col(9):.1f}",
+        ]
+
+    def draw(self, surface, font, bottomleft, color=(0, 255, 120)):
+        """Blit the overlay; its text is re-rendered four times a second."""
+        if self.panel is None or self.frames % (self.fps // 4) == 0:
+            lines = [font.render(line, True, color) for line in self.lines()]
+            step = font.get_linesize()
+            w = max(line.get_width() for line in lines) + 16
+            self.panel = pygame.Surface((w, len(lines) * step + 10), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 170))
+            for i, line in enumerate(lines):
+                self.panel.blit(line, (8, 6 + i * step))
+        x, bottom = bottomleft
+        surface.blit(self.panel, (x, bottom - self.panel.get_height()))
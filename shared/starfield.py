@@ -0,0 +1,155 @@
+"""Parallax star backgrounds pre-rendered into wrap-around textures.
+
+    stars = [(x, y, speed, radius, (r, g, b)), ...]
+    field = Starfield((800, 600), stars, layers=3, twinkle=0.4)
+    field.update(dt)                   # advances scroll by dt (speed is per unit)
+    field.draw(surface, t=seconds)     # two blits per layer, no per-star drawing
+
+Stars are grouped into layers by speed and each layer is drawn once into an
+8-bit palette surface. A layer scrolls by blitting its texture twice, above
+and below the wrap line. Twinkle is palette animation: every star gets one
+of PHASES phase groups, and each of the `frames` steps of a twinkle cycle
+only recolours the palette before converting to a colorkeyed RLE texture.
+Frames are built on first use and kept. SDL drops the pixel buffer of an
+RLE surface once it is encoded, so a sparse star frame costs a few KB.
+
+Used by MiniGamesArcade and NeonSnake; each adds this folder to sys.path.
+"""
+import math
+import random
+import sys
+import time
+
+import pygame
+
+PHASES = 4              # twinkle phase groups per layer
+KEY = (255, 0, 255)     # transparent colour of the converted textures
+
+
+class StarLayer:
+    """The stars of one speed band, with its twinkle frames."""
+
+    def __init__(self, size, stars, speed, twinkle=0.0, frames=1):
+        self.w, self.h = size
+        self.speed = speed
+        self.twinkle = twinkle
+        self.frames = [None] * (frames if twinkle else 1)
+        # Palette: index 0 is the colorkey, then one entry per (colour, phase) pair.
+        colors = sorted({c for _, _, _, _, c in stars})
+        step = 1
+        while len(colors) * PHASES > 255:
+            step *= 2
+            colors = sorted({tuple(v // step * step for v in c) for _, _, _, _, c in stars})
+        self.colors = colors
+        index = {c: i for i, c in enumerate(colors)}
+        self.master = pygame.Surface(size, 0, 8)
+        self.master.fill(0)
+        self.master.set_palette([KEY] * 256)
+        for i, (x, y, _, r, c) in enumerate(stars):
+            c = tuple(v // step * step for v in c)
+            idx = 1 + index[c] * PHASES + i % PHASES
+            for wy in (y - self.h, y, y + self.h):  # copies across the wrap line
+                if -r <= wy < self.h + r:
+                    pygame.draw.circle(self.master, idx, (int(x), int(wy)), r)
+
+    def palette(self, frame):
+        """Colours of palette entries for twinkle step `frame`."""
+        pal = [KEY]
+        n = len(self.frames)
+        for c in self.colors:
+            for p in range(PHASES):
+                k = 1 - self.twinkle + self.twinkle * math.sin(2 * math.pi * (frame / n + p / PHASES))
+                pal.append(tuple(min(255, max(0, int(v * k))) for v in c))
+        return pal
+
+    def texture(self, frame):
+        tex = self.frames[frame]
+        if tex is None:
+            self.master.set_palette(self.palette(frame))
+            tex = self.frames[frame] = self.master.convert()
+            tex.set_colorkey(KEY, pygame.RLEACCEL)
+        return tex
+
+    def draw(self, surface, scroll, frame, dest=(0, 0)):
+        tex = self.texture(frame)
+        x, y = dest
+        off = int(scroll * self.speed) % self.h
+        surface.blit(tex, (x, y + off))
+        if off:
+            surface.blit(tex, (x, y + off - self.h))
+
+
+class Starfield:
+    """Stars split into `layers` speed bands, each scrolled as one texture.
+
+    stars are (x, y, speed, radius, color). twinkle (0..1) is how far a
+    star dims over a cycle of `rate` radians per second; `frames` steps
+    make up the cycle.
+    """
+
+    def __init__(self, size, stars, layers=3, twinkle=0.0, rate=2.0, frames=12):
+        stars = sorted(stars, key=lambda s: s[2])
+        self.size = size
+        self.twinkle = twinkle
+        self.rate = rate
+        self.frames = frames if twinkle else 1
+        self.scroll = 0.0
+        self.layers = []
+        n = max(1, min(layers, len(stars)))
+        for i in range(n):
+            band = stars[len(stars) * i // n:len(stars) * (i + 1) // n]
+            if not band:
+                continue
+            speed = sum(s[2] for s in band) / len(band)
+            self.layers.append(StarLayer(size, band, speed, twinkle, self.frames))
+
+    def update(self, dt):
+        self.scroll += dt
+
+    def frame(self, t):
+        """Twinkle step for time t (seconds)."""
+        if not self.twinkle:
+            return 0
+        return int(t * self.rate / (2 * math.pi) * self.frames) % self.frames
+
+    def draw(self, surface, scroll=None, t=0.0, dest=(0, 0)):
+        """Blit every layer; scroll defaults to the total passed to update()."""
+        if scroll is None:
+            scroll = self.scroll
+        f = self.frame(t)
+        for layer in self.layers:
+            layer.draw(surface, scroll, f, dest)
+
+
+def random_stars(size, count, speed=(0.5, 2.0), radius=(1, 2), bright=(100, 220), seed=None):
+    """count (x, y, speed, radius, grey) stars spread over size."""
+    rng = random.Random(seed)
+    w, h = size
+    out = []
+    for _ in range(count):
+        v = rng.randint(*bright)
+        out.append((rng.uniform(0, w), rng.uniform(0, h), rng.uniform(*speed), rng.randint(*radius), (v, v, v)))
+    return out
+
+
+if __name__ == "__main__":
+    # python starfield.py [STARS] : per-star circles vs layered textures
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    size = (900, 700)
+    screen = pygame.display.set_mode(size)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    stars = random_stars(size, count, seed=1)
+    frames = 2000
+    t0 = time.perf_counter()
+    for i in range(frames):
+        for x, y, sp, r, c in stars:
+            pygame.draw.circle(screen, c, (int(x), int((y + i * sp) % size[1])), r)
+    t1 = time.perf_counter()
+    field = Starfield(size, stars, twinkle=0.4)
+    for i in range(frames):
+        field.draw(screen, i, t=i / 60)
+    t2 = time.perf_counter()
+    print(f"{count} stars: circles {(t1 - t0) * 1000 / frames:.3f} ms/frame, "
+          f"layers {(t2 - t1) * 1000 / frames:.3f} ms/frame")